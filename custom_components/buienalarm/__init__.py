@@ -1,33 +1,20 @@
-"""Buienalarm integration initialization."""
+"""Buienalarm integration initialization.
+
+Home Assistant is only imported inside the setup functions, so the
+HA-free modules (``core``, ``cli``) can be imported without it.
+"""
 # __init__.py
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
-import aiohttp
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.device_registry import DeviceEntryType
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from .api import BuienalarmApiClient
-from .const import (
-    API_CONF_URL,
-    API_TIMEOUT,
-    DOMAIN,
-    NAME,
-    PLATFORMS,
-    SCAN_INTERVAL,
-    VERSION,
-)
-from .coordinator import BuienalarmDataUpdateCoordinator
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
-_LOGGER.debug("[INIT] __init__.py loaded for Buienalarm integration")
-
 __all__: list[str] = [
     "async_setup",
     "async_setup_entry",
@@ -38,6 +25,8 @@ __all__: list[str] = [
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old Buienalarm entries to version 2 (add unique_id)."""
+    from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+
     old_version = entry.version
     _LOGGER.debug("[INIT] Migrating Buienalarm entry %s (v%s)", entry.entry_id, old_version)
 
@@ -73,12 +62,23 @@ async def async_setup(hass: HomeAssistant, _: dict[str, object]) -> bool:
     slechts dat Home Assistant een fout gooit wanneer er toch een
     YAML-entry zou bestaan.
     """
+    from .services import async_setup_services
+    from .views import DATA_FORECAST_VIEW, BuienalarmForecastView, BuienalarmMetricsView
+    from .websocket import async_setup_websocket_api
+
     _LOGGER.debug("[INIT_SETUP] async_setup called - YAML config unsupported")
+    async_setup_services(hass)
+    hass.http.register_view(BuienalarmMetricsView)
+    forecast_view = hass.data[DATA_FORECAST_VIEW] = BuienalarmForecastView()
+    hass.http.register_view(forecast_view)
+    async_setup_websocket_api(hass)
     return True
 
 
 def _has_duplicate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Return True if an identical entry already exists."""
+    from .const import DOMAIN
+
     dup = any(
         existing.entry_id != entry.entry_id and existing.data == entry.data
         for existing in hass.config_entries.async_entries(DOMAIN)
@@ -89,6 +89,28 @@ def _has_duplicate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Buienalarm integration from a config entry."""
+    import aiohttp
+    from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+    from homeassistant.exceptions import ConfigEntryNotReady
+    from homeassistant.helpers.aiohttp_client import async_get_clientsession
+    from homeassistant.helpers.device_registry import DeviceEntryType
+    from homeassistant.helpers.entity import DeviceInfo
+    from homeassistant.helpers.update_coordinator import UpdateFailed
+
+    from .api import BuienalarmApiClient
+    from .const import (
+        API_CONF_URL,
+        API_ENDPOINT,
+        API_TIMEOUT,
+        CONF_API_ENDPOINT,
+        DOMAIN,
+        NAME,
+        PLATFORMS,
+        SCAN_INTERVAL,
+        VERSION,
+    )
+    from .coordinator import BuienalarmDataUpdateCoordinator
+
     _LOGGER.debug("[INIT_SETUP_ENTRY] Starting setup for entry_id=%s, title=%s", entry.entry_id, entry.title)
 
     # Prevent duplicates
@@ -128,7 +150,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     # Initialize API client
-    api = BuienalarmApiClient(latitude, longitude, session, hass)
+    api = BuienalarmApiClient(
+        latitude,
+        longitude,
+        session,
+        hass,
+        endpoint=entry.data.get(CONF_API_ENDPOINT, API_ENDPOINT),
+    )
     _LOGGER.debug("[INIT_SETUP_ENTRY] BuienalarmApiClient created: %s", api)
 
     # Prepare device info
@@ -198,9 +226,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
+    from .const import DOMAIN, PLATFORMS
+    from .views import DATA_FORECAST_VIEW
+
     _LOGGER.debug("[INIT_UNLOAD_ENTRY] Unloading entry_id=%s", entry.entry_id)
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        if (forecast_view := hass.data.get(DATA_FORECAST_VIEW)) is not None:
+            forecast_view.evict(entry.entry_id)
         _LOGGER.debug("[INIT_UNLOAD_ENTRY] Config entry %s with ID %s unloaded", entry.title, entry.entry_id)
         _LOGGER.debug("[INIT_UNLOAD_ENTRY] Unloading platforms: %s", PLATFORMS)
         _LOGGER.debug("[INIT_UNLOAD_ENTRY] Unloading %s", unloaded)
@@ -214,6 +247,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle reload of a config entry."""
+    from .const import PLATFORMS
+
     _LOGGER.debug("[INIT_RELOAD_ENTRY] Reloading config entry %s with ID %s", entry.title, entry.entry_id)
     await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -12,6 +12,7 @@ import json
 import logging
 import random
 import socket
+import time
 from datetime import datetime, timezone
 from typing import Any, Final, cast
 
@@ -26,6 +27,8 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import API_ENDPOINT, API_TIMEOUT
 from .exceptions import ApiError
+from .metrics import EntryMetrics
+from .profiling import DISABLED_SPANS, SpanRecorder
 
 # -----------------------------------------------------------------------------
 #  Logger setup
@@ -90,6 +93,7 @@ class BuienalarmApiClient:
         entry_id: str | None = None,
         *,
         timeout: int = API_TIMEOUT,
+        endpoint: str = API_ENDPOINT,
     ) -> None:
         self.latitude: Final[float] = cast(float, latitude)
         self.longitude: Final[float] = cast(float, longitude)
@@ -98,9 +102,14 @@ class BuienalarmApiClient:
         )
         self._hass: Final[HomeAssistant] = hass
         self._entry_id: Final[str | None] = entry_id
-        self._url: Final[str] = API_ENDPOINT.format(self.latitude, self.longitude)
+        self._endpoint: Final[str] = endpoint
+        self._url: Final[str] = endpoint.format(self.latitude, self.longitude)
         self._timeout: Final[ClientTimeout] = ClientTimeout(total=timeout)
         self._notification_id: str | None = None
+        # Timing spans; de coordinator zet hier zijn eigen recorder
+        self.spans: SpanRecorder = DISABLED_SPANS
+        # Fetch-metrics; de coordinator deelt hier zijn eigen instantie
+        self.metrics: EntryMetrics = EntryMetrics()
 
         # Verbose diagnostics
         _LOGGER.debug("[API%s] Initialized BuienalarmApiClient", self._sfx)
@@ -119,7 +128,7 @@ class BuienalarmApiClient:
 
     @property
     def base_url(self) -> str:
-        return API_ENDPOINT.format(self.latitude, self.longitude)
+        return self._url
 
     async def async_get_initial_data(self) -> dict[str, object]:
         """
@@ -183,13 +192,19 @@ class BuienalarmApiClient:
         _LOGGER.debug("[API%s] → Using User-Agent: %s", self._sfx, user_agent)
         _LOGGER.debug("[API%s] → Request headers: %s", self._sfx, headers)
 
+        spans = self.spans
+        metrics = self.metrics
+        started = time.perf_counter()
         try:
             async with async_timeout.timeout(timeout.total):
-                async with self._session.get(
-                    self._url,
-                    timeout=timeout,
-                    headers=headers,
-                ) as resp:
+                # DNS, connect, TLS and server time until the headers are in
+                with spans.span("fetch.headers"):
+                    resp = await self._session.get(
+                        self._url,
+                        timeout=timeout,
+                        headers=headers,
+                    )
+                async with resp:
                     _LOGGER.debug("[API%s]   HTTP %s", self._sfx, resp.status)
                     
                     if resp.status != 200:
@@ -199,6 +214,7 @@ class BuienalarmApiClient:
                             resp.status,
                             resp.reason,
                         )
+                        metrics.fetch_failed(resp.status)
                         raise ApiError(f"HTTP error {resp.status}: {resp.reason}")
                     
                     _LOGGER.debug("[API%s]   Response received", self._sfx)
@@ -209,8 +225,14 @@ class BuienalarmApiClient:
                                 self._sfx, resp.headers.get("Content-Length", "?"))
                     
                     # Parse JSON response
-                    data = await resp.json(content_type=None)
+                    with spans.span("fetch.read"):
+                        body = await resp.read()
+                    received = time.perf_counter()
+                    with spans.span("fetch.decode"):
+                        data = json.loads(body)
+                    decoded = time.perf_counter()
                     age_header: int = int(resp.headers.get("Age", "0"))
+                    metrics.fetch_succeeded(received - started, decoded - received, len(body), age_header)
                     
                     _LOGGER.debug("[API%s]   Cache Age header: %s", self._sfx, age_header)
                     _LOGGER.debug("[API%s]   Status OK (200), processing response", self._sfx)
@@ -237,12 +259,15 @@ class BuienalarmApiClient:
                     
         except asyncio.TimeoutError as err:
             _LOGGER.error("[API%s]   TIMEOUT after %ss", self._sfx, timeout.total)
+            metrics.fetch_failed("timeout")
             raise ApiError("Timeout while requesting Buienalarm data") from err
         except (aiohttp.ClientError, socket.gaierror) as err:
             _LOGGER.error("[API%s]   HTTP error: %s", self._sfx, err)
+            metrics.fetch_failed("error")
             raise ApiError(str(err)) from err
         except ValueError as err:
             _LOGGER.error("[API%s]   JSON decode error: %s", self._sfx, err)
+            metrics.fetch_failed("invalid_json")
             raise ApiError("Invalid JSON") from err
 
     async def async_get_data(
@@ -0,0 +1,320 @@
+"""On-disk archive of fetched Buienalarm forecasts."""
+# archive.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Final, NamedTuple, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+from .core.forecast import BIN_SECONDS, ForecastIndex
+
+if TYPE_CHECKING:
+    import sqlite3
+
+_T = TypeVar("_T")
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+ARCHIVE_FILENAME: Final[str] = f"{DOMAIN}_archive.db"
+DATA_ARCHIVE: Final[str] = f"{DOMAIN}_archive"
+
+# Schrijven in batches: één transactie per ~uur aan fetches van één entry
+ARCHIVE_BATCH_SIZE: Final[int] = 12
+ARCHIVE_FLUSH_INTERVAL: Final[timedelta] = timedelta(minutes=15)
+ARCHIVE_MAINTENANCE_INTERVAL: Final[timedelta] = timedelta(hours=24)
+
+# Een nowcast beslaat enkele uren; begrenst de range-scan op valid_from
+MAX_FORECAST_SPAN: Final[int] = 24 * 3600
+
+_SCHEMA: Final[tuple[str, ...]] = (
+    # auto_vacuum moet gezet zijn voordat de eerste tabel bestaat
+    "PRAGMA auto_vacuum = INCREMENTAL",
+    """
+    CREATE TABLE IF NOT EXISTS forecast (
+        location   TEXT    NOT NULL,
+        issued     INTEGER NOT NULL,
+        valid_from INTEGER NOT NULL,
+        valid_to   INTEGER NOT NULL,
+        offsets    BLOB    NOT NULL,
+        rates      BLOB    NOT NULL,
+        type_names TEXT    NOT NULL,
+        type_codes BLOB    NOT NULL,
+        PRIMARY KEY (location, issued)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_forecast_valid ON forecast (location, valid_from)",
+)
+
+
+class ArchivedForecast(NamedTuple):
+    """One archived nowcast."""
+
+    location: str
+    issued: int
+    index: ForecastIndex
+
+
+def _to_blob(values: array) -> bytes:
+    """Serialise *values* little-endian, independent of the host."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_blob(typecode: str, blob: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(blob)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def encode(index: ForecastIndex) -> tuple[int, int, bytes, bytes, str, bytes]:
+    """Pack *index* column by column.
+
+    Times are stored as uint32 offsets from the first bin, rates as
+    float32 and the precipitation types dictionary-encoded as one byte
+    per bin.
+    """
+    valid_from = index.timestamps[0]
+    names: list[str] = []
+    codes = bytearray()
+    for ptype in index.types:
+        if ptype not in names:
+            names.append(ptype)
+        codes.append(names.index(ptype))
+    return (
+        valid_from,
+        index.timestamps[-1] + BIN_SECONDS,
+        _to_blob(array("I", (ts - valid_from for ts in index.timestamps))),
+        _to_blob(array("f", index.rates)),
+        "\x1f".join(names),
+        bytes(codes),
+    )
+
+
+def decode(
+    valid_from: int, offsets: bytes, rates: bytes, type_names: str, type_codes: bytes
+) -> ForecastIndex:
+    """Rebuild a :class:`ForecastIndex` from its packed columns."""
+    names = type_names.split("\x1f")
+    return ForecastIndex(
+        tuple(valid_from + offset for offset in _from_blob("I", offsets)),
+        # float32 terug naar de twee/drie decimalen van de API
+        tuple(round(rate, 3) for rate in _from_blob("f", rates)),
+        tuple(names[code] for code in type_codes),
+    )
+
+
+class ForecastArchive:
+    """SQLite store of forecasts keyed by (location, issue time).
+
+    Every method blocks and must run in the executor, one call at a time:
+    the connection is shared between executor threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: Final[str] = path
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            import sqlite3  # pas bij de eerste schrijfactie, in de executor
+
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+            _LOGGER.debug("[ARCHIVE] Opened %s", self.path)
+        return self._conn
+
+    def write_batch(self, records: Iterable[tuple[str, int, ForecastIndex]]) -> int:
+        """Store *records* in one transaction; a re-fetched issue time is replaced."""
+        rows = [(location, issued, *encode(index)) for location, issued, index in records if index]
+        if not rows:
+            return 0
+        conn = self._connection()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO forecast VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        _LOGGER.debug("[ARCHIVE] Wrote %d forecast(s)", len(rows))
+        return len(rows)
+
+    def query(self, location: str, start: float, end: float) -> list[ArchivedForecast]:
+        """Return the forecasts for *location* with bins in ``[start, end)``, oldest first."""
+        cursor = self._connection().execute(
+            """
+            SELECT issued, valid_from, offsets, rates, type_names, type_codes
+            FROM forecast
+            WHERE location = ? AND valid_from >= ? AND valid_from < ? AND valid_to > ?
+            ORDER BY issued
+            """,
+            (location, int(start) - MAX_FORECAST_SPAN, end, start),
+        )
+        return [
+            ArchivedForecast(location, issued, decode(valid_from, *columns))
+            for issued, valid_from, *columns in cursor
+        ]
+
+    def purge(self, cutoffs: Sequence[tuple[str, int]]) -> int:
+        """Delete forecasts issued before the cutoff of their location."""
+        conn = self._connection()
+        with conn:
+            cursor = conn.executemany("DELETE FROM forecast WHERE location = ? AND issued < ?", cutoffs)
+        _LOGGER.debug("[ARCHIVE] Purged %d forecast(s)", cursor.rowcount)
+        return cursor.rowcount
+
+    def compact(self) -> None:
+        """Return free pages to the file system and refresh the planner statistics."""
+        conn = self._connection()
+        conn.execute("PRAGMA incremental_vacuum")
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ArchiveRecorder:
+    """Buffer fetched forecasts and write them from the executor in batches.
+
+    One recorder is shared by all config entries.  Each entry registers
+    its location with its own retention; retention and compaction run
+    once a day.  All archive calls go through one lock, so a flush, a
+    query and the daily maintenance never use the connection at once.
+    """
+
+    def __init__(self, hass: HomeAssistant, archive: ForecastArchive) -> None:
+        self._hass: Final[HomeAssistant] = hass
+        self.archive: Final[ForecastArchive] = archive
+        self._pending: list[tuple[str, int, ForecastIndex]] = []
+        self._retention: dict[str, timedelta] = {}
+        self._lock: Final[asyncio.Lock] = asyncio.Lock()
+        self._closed = False
+        self._unsubs: list[CALLBACK_TYPE] = [
+            async_track_time_interval(hass, self._async_flush_interval, ARCHIVE_FLUSH_INTERVAL),
+            async_track_time_interval(hass, self._async_maintenance, ARCHIVE_MAINTENANCE_INTERVAL),
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write),
+        ]
+
+    @callback
+    def async_register(self, location: str, retention: timedelta) -> None:
+        """Start archiving *location*, keeping forecasts for *retention*."""
+        self._retention[location] = retention
+
+    @callback
+    def async_add(self, location: str, issued: datetime, index: ForecastIndex) -> None:
+        """Queue one forecast; flush once a batch is full."""
+        if location not in self._retention or not index:
+            return
+        self._pending.append((location, int(issued.timestamp()), index))
+        if len(self._pending) >= ARCHIVE_BATCH_SIZE:
+            self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write all queued forecasts."""
+        if not self._pending:
+            return
+        async with self._lock:
+            await self._async_write_pending()
+
+    async def _async_write_pending(self) -> None:
+        """Write the queue; the caller holds the lock."""
+        import sqlite3  # pas nodig met een archief; niet bij het laden van de integratie
+
+        batch, self._pending = self._pending, []
+        if not batch or self._closed:
+            return
+        try:
+            await self._hass.async_add_executor_job(self.archive.write_batch, batch)
+        except sqlite3.Error:
+            _LOGGER.exception("[ARCHIVE] Writing %d forecast(s) failed", len(batch))
+
+    async def async_query(self, location: str, start: datetime, end: datetime) -> list[ArchivedForecast]:
+        """Return the archived forecasts for *location* valid between *start* and *end*."""
+        await self.async_flush()
+        return await self._async_run(self.archive.query, location, start.timestamp(), end.timestamp())
+
+    async def async_release(self, location: str) -> None:
+        """Stop archiving *location*; close the archive when no location is left."""
+        import sqlite3
+
+        self._retention.pop(location, None)
+        if self._retention:
+            await self.async_flush()
+            return
+        while self._unsubs:
+            self._unsubs.pop()()
+        # Een nieuwe entry krijgt een nieuwe recorder; deze wordt hieronder gesloten
+        if self._hass.data.get(DATA_ARCHIVE) is self:
+            self._hass.data.pop(DATA_ARCHIVE)
+        # Laatste flush en sluiten onder het lock: geen executor-call loopt nog of start daarna
+        async with self._lock:
+            await self._async_write_pending()
+            self._closed = True
+            try:
+                await self._hass.async_add_executor_job(self.archive.close)
+            except sqlite3.Error:
+                _LOGGER.exception("[ARCHIVE] Closing %s failed", self.archive.path)
+        _LOGGER.debug("[ARCHIVE] Closed %s", self.archive.path)
+
+    async def _async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run one archive call in the executor, after any call still running."""
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Archive {self.archive.path} is closed")
+            return await self._hass.async_add_executor_job(func, *args)
+
+    async def _async_flush_interval(self, _now: datetime) -> None:
+        await self.async_flush()
+
+    async def _async_maintenance(self, now: datetime) -> None:
+        """Apply retention and compact the database."""
+        import sqlite3
+
+        await self.async_flush()
+        cutoffs = [
+            (location, int((now - retention).timestamp()))
+            for location, retention in self._retention.items()
+        ]
+        async with self._lock:
+            if self._closed:
+                return
+            try:
+                await self._hass.async_add_executor_job(self.archive.purge, cutoffs)
+                await self._hass.async_add_executor_job(self.archive.compact)
+            except sqlite3.Error:
+                _LOGGER.exception("[ARCHIVE] Maintenance failed")
+
+    async def _async_final_write(self, _event: Event) -> None:
+        await self.async_flush()
+
+
+@callback
+def async_get_recorder(hass: HomeAssistant) -> ArchiveRecorder:
+    """Return the shared archive recorder, creating it on first use."""
+    if (recorder := hass.data.get(DATA_ARCHIVE)) is None:
+        archive = ForecastArchive(hass.config.path(ARCHIVE_FILENAME))
+        recorder = hass.data[DATA_ARCHIVE] = ArchiveRecorder(hass, archive)
+    return recorder
+
+
+def issued_at(retrieved_at: datetime, cache_age: int | None) -> datetime:
+    """Return the issue time of a forecast: retrieval time minus the HTTP ``Age``."""
+    return retrieved_at.astimezone(timezone.utc) - timedelta(seconds=cache_age or 0)
@@ -0,0 +1,115 @@
+"""Binary sensors for Buienalarm: "rain within N minutes"."""
+# binary_sensor.py
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_RAIN_THRESHOLD,
+    CONF_RAIN_WINDOWS,
+    DEFAULT_RAIN_THRESHOLD,
+    DEFAULT_RAIN_WINDOWS,
+    DOMAIN,
+)
+from .coordinator import BuienalarmDataUpdateCoordinator
+from .entity import BuienalarmEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_windows(value: object) -> list[int]:
+    """Return the sorted, unique look-ahead windows (minutes) from ``"15,30,60"``."""
+    windows: set[int] = set()
+    for part in str(value).replace(";", ",").split(","):
+        try:
+            minutes = int(part.strip())
+        except ValueError:
+            continue
+        if 0 < minutes <= 24 * 60:
+            windows.add(minutes)
+    return sorted(windows)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Buienalarm binary sensors from a config entry."""
+    coordinator: BuienalarmDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    windows = parse_windows(config_entry.options.get(CONF_RAIN_WINDOWS, DEFAULT_RAIN_WINDOWS))
+    if not windows:
+        windows = parse_windows(DEFAULT_RAIN_WINDOWS)
+    threshold = float(config_entry.options.get(CONF_RAIN_THRESHOLD, DEFAULT_RAIN_THRESHOLD))
+
+    _LOGGER.debug("[BINARY SENSOR SETUP] Windows %s min, threshold %s mm/h", windows, threshold)
+    async_add_entities(
+        BuienalarmRainSoonBinarySensor(coordinator, config_entry, minutes, threshold)
+        for minutes in windows
+    )
+
+
+class BuienalarmRainSoonBinarySensor(BuienalarmEntity, BinarySensorEntity):
+    """On when the forecast exceeds the threshold within the next N minutes."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = BinarySensorDeviceClass.MOISTURE
+    _attr_icon = "mdi:weather-pouring"
+    _attr_translation_key = "rain_within"
+
+    def __init__(
+        self,
+        coordinator: BuienalarmDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        minutes: int,
+        threshold: float,
+    ) -> None:
+        super().__init__(coordinator, config_entry, f"rain_within_{minutes}")
+        self._minutes = minutes
+        self._threshold = threshold
+        self._attr_translation_placeholders = {"minutes": str(minutes)}
+        self._attr_extra_state_attributes = {"window": minutes, "threshold": threshold}
+        self._attr_is_on = self._compute_is_on()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, object]:
+        """Return the window and threshold, not the full forecast."""
+        return self._attr_extra_state_attributes
+
+    def _compute_is_on(self) -> bool | None:
+        """Answer "rain within the window" with one peak lookup on the index."""
+        if not self.coordinator.last_update_success or self.coordinator.data is None:
+            return None
+        index = self.coordinator.snapshot.index
+        now = self._now()
+        lo = index.bin_at(now)
+        if lo is None:
+            lo = bisect_left(index.timestamps, now)
+        hi = bisect_left(index.timestamps, now + self._minutes * 60)
+        return index.max_rate(lo, hi) > self._threshold
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the boolean or the availability flips."""
+        is_on = self._compute_is_on()
+        if is_on == self._attr_is_on:
+            self.coordinator.metrics.skipped_writes += 1
+            return
+        self._attr_is_on = is_on
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True once the window can be evaluated."""
+        return self._attr_is_on is not None
@@ -0,0 +1,81 @@
+"""Calendar with the forecast rain periods of Buienalarm."""
+# calendar.py
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import BuienalarmDataUpdateCoordinator
+from .core.analytics import RainPeriod
+from .core.forecast import BIN_SECONDS
+from .core.i18n import text
+from .entity import BuienalarmEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Buienalarm calendar from a config entry."""
+    coordinator: BuienalarmDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities([BuienalarmCalendar(coordinator, config_entry)])
+
+
+class BuienalarmCalendar(BuienalarmEntity, CalendarEntity):
+    """One event per forecast rain period."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_icon = "mdi:calendar-weather"
+    _attr_translation_key = "rain_calendar"
+
+    def __init__(
+        self,
+        coordinator: BuienalarmDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, config_entry, "rain_calendar")
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """The periods are served as events, not as attributes."""
+        return None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next rain period."""
+        periods = self.coordinator.snapshot.periods_between(self._now(), float("inf"))
+        return self._to_event(periods[0]) if periods else None
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return the rain periods between *start_date* and *end_date*."""
+        periods = self.coordinator.snapshot.periods_between(start_date.timestamp(), end_date.timestamp())
+        return [self._to_event(period) for period in periods]
+
+    def _to_event(self, period: RainPeriod) -> CalendarEvent:
+        """Convert a rain period to a calendar event."""
+        # Een bui die pas in de laatste bin begint heeft nog geen lengte
+        stop = max(period.stop, period.start + BIN_SECONDS)
+        language = self.coordinator.snapshot.language
+        return CalendarEvent(
+            start=datetime.fromtimestamp(period.start, tz=timezone.utc),
+            end=datetime.fromtimestamp(stop, tz=timezone.utc),
+            summary=text("period_summary", language, rate=period.precipitationrate),
+            description=text(
+                "period_description", language, duration=period.duration_minutes, rate=period.precipitationrate
+            ),
+        )
@@ -0,0 +1,319 @@
+"""Batch tools for Buienalarm forecasts outside Home Assistant.
+
+    python -m custom_components.buienalarm.cli fetch locations.txt -o payloads/
+    python -m custom_components.buienalarm.cli process payloads/ -o summaries.ndjson
+    python -m custom_components.buienalarm.cli export summaries.ndjson -o summaries.csv
+
+``fetch`` downloads one nowcast per location (``lat,lon`` per line) with
+bounded concurrency.  ``process`` summarises directories of recorded
+payloads in a process pool with the same parsing and analytics code the
+sensors use.  ``export`` turns the NDJSON summaries into CSV.
+"""
+# cli.py
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Final
+
+from .core.analytics import average_precipitation_rate, minutes_until
+from .core.snapshot import NEXT_PRECIPITATION_AT, ForecastSnapshot
+
+DEFAULT_WINDOWS: Final[tuple[int, ...]] = (30, 60, 120)  # minuten
+DEFAULT_CONCURRENCY: Final[int] = 8
+
+# Zelfde als const.API_ENDPOINT; const importeert Home Assistant, de CLI niet
+NOWCAST_ENDPOINT: Final[str] = "https://imn-rust-lb.infoplaza.io/v4/nowcast/ba/timeseries/{}/{}"
+FETCH_HEADERS: Final[dict[str, str]] = {
+    "Accept": "application/json, text/plain, */*",
+    "Referer": "https://www.buienalarm.nl/",
+    "Origin": "https://www.buienalarm.nl",
+}
+
+# Vaste CSV-kolommen; de gemiddelden per venster komen erachter
+CSV_FIELDS: Final[tuple[str, ...]] = (
+    "source",
+    "now",
+    "bins",
+    "horizon",
+    "next_precipitation",
+    "minutes_until_precipitation",
+    "precipitation_duration",
+    "peak_rate",
+    "periods",
+    "first_period_start",
+    "first_period_stop",
+)
+
+
+# ---------------------------------------------------------------------------
+# process
+# ---------------------------------------------------------------------------
+
+
+def summarise(
+    payload: object,
+    source: str,
+    now: float | None = None,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+) -> dict[str, object]:
+    """Return the summary of one payload at *now* (default: its first bin).
+
+    The values come from ``ForecastSnapshot.state_at``, so they match what
+    the sensors show at that moment.
+    """
+    snapshot = ForecastSnapshot.from_payload(payload)
+    index = snapshot.index
+    if now is None:
+        now = float(index.start or 0)
+    at = snapshot.evaluated_at(now)
+    state = snapshot.state_at(now)
+    next_at = state[NEXT_PRECIPITATION_AT]
+    if next_at == at:
+        next_at = now  # het regent al
+    summary: dict[str, object] = {
+        "source": source,
+        "now": int(now),
+        "bins": len(index),
+        "horizon": index.end,
+        "next_precipitation": int(next_at) if next_at is not None else None,
+        "minutes_until_precipitation": minutes_until(next_at, now),
+        "precipitation_duration": state["precipitation_duration"],
+        "peak_rate": index.max_rate(0, len(index)),
+    }
+    for minutes in windows:
+        summary[f"avg_{minutes}min"] = average_precipitation_rate(index, at, minutes * 60)
+    summary["periods"] = state["precipitation_periods"]
+    return summary
+
+
+def summarise_file(
+    path: str,
+    now: float | None = None,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+) -> dict[str, object]:
+    """Summarise one recorded payload file; runs in a worker process."""
+    try:
+        payload = json.loads(Path(path).read_bytes())
+    except (OSError, ValueError) as err:
+        return {"source": Path(path).stem, "error": str(err)}
+    return summarise(payload, Path(path).stem, now, windows)
+
+
+def _payload_files(paths: Iterable[str]) -> list[str]:
+    files: list[str] = []
+    for name in paths:
+        path = Path(name)
+        if path.is_dir():
+            files.extend(str(item) for item in sorted(path.glob("*.json")))
+        else:
+            files.append(str(path))
+    return files
+
+
+def _process(args: argparse.Namespace) -> int:
+    files = _payload_files(args.paths)
+    if not files:
+        print("No payload files found", file=sys.stderr)
+        return 1
+    windows = _parse_windows(args.windows)
+    started = time.perf_counter()
+    failed = 0
+    with _open_output(args.output) as out, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        chunksize = max(1, len(files) // ((args.workers or 4) * 8))
+        for summary in pool.map(
+            summarise_file, files, [args.at] * len(files), [windows] * len(files), chunksize=chunksize
+        ):
+            failed += "error" in summary
+            out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    print(
+        f"{len(files)} payload(s) in {time.perf_counter() - started:.2f} s, {failed} failed",
+        file=sys.stderr,
+    )
+    return 0 if not failed else 1
+
+
+# ---------------------------------------------------------------------------
+# export
+# ---------------------------------------------------------------------------
+
+
+def _read_ndjson(paths: Iterable[str]) -> Iterator[dict[str, object]]:
+    for name in paths:
+        with _open_input(name) as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _csv_row(summary: dict[str, object]) -> dict[str, object]:
+    periods = summary.get("periods") or []
+    first = periods[0] if periods else {}
+    return {
+        **{key: value for key, value in summary.items() if key != "periods"},
+        "periods": len(periods),
+        "first_period_start": first.get("start"),
+        "first_period_stop": first.get("stop"),
+    }
+
+
+def _export(args: argparse.Namespace) -> int:
+    summaries = _read_ndjson(args.paths)
+    with _open_output(args.output) as out:
+        if args.format == "ndjson":
+            for summary in summaries:
+                out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            return 0
+        rows = [_csv_row(summary) for summary in summaries]
+        # Mislukte payloads hebben geen gemiddelden; neem de kolommen van alle rijen
+        averages = sorted(
+            {key for row in rows for key in row if key.startswith("avg_")},
+            key=lambda key: int(key[4:-3]),
+        )
+        writer = csv.DictWriter(out, [*CSV_FIELDS, *averages, "error"], extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# fetch
+# ---------------------------------------------------------------------------
+
+
+def _read_locations(path: str) -> list[tuple[float, float]]:
+    """Return the ``lat,lon`` pairs in *path*; malformed lines are reported and skipped."""
+    locations: list[tuple[float, float]] = []
+    with _open_input(path) as lines:
+        for number, line in enumerate(lines, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                lat, lon = (float(part) for part in line.replace(";", ",").split(",")[:2])
+            except ValueError:
+                print(f"{path}:{number}: skipping malformed location {line!r}", file=sys.stderr)
+                continue
+            locations.append((lat, lon))
+    return locations
+
+
+async def _async_fetch(args: argparse.Namespace) -> int:
+    import aiohttp  # alleen voor fetch nodig
+
+    endpoint: str = args.endpoint or NOWCAST_ENDPOINT
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    locations = _read_locations(args.locations)
+    out_dir = Path(args.output)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failed = 0
+
+    async def _fetch(session: aiohttp.ClientSession, lat: float, lon: float) -> None:
+        nonlocal failed
+        # Gewone GET, zonder de API-client: die hoort bij Home Assistant
+        async with semaphore:
+            retrieved = datetime.now(timezone.utc)
+            try:
+                async with session.get(
+                    endpoint.format(lat, lon), timeout=timeout, headers=FETCH_HEADERS
+                ) as resp:
+                    resp.raise_for_status()
+                    payload = json.loads(await resp.read())
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                failed += 1
+                print(f"{lat},{lon}: {str(err) or type(err).__name__}", file=sys.stderr)
+                return
+        path = out_dir / f"{lat:.4f}_{lon:.4f}_{int(retrieved.timestamp())}.json"
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    started = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(_fetch(session, lat, lon) for lat, lon in locations))
+    print(
+        f"{len(locations)} location(s) in {time.perf_counter() - started:.2f} s, {failed} failed",
+        file=sys.stderr,
+    )
+    return 0 if not failed else 1
+
+
+# ---------------------------------------------------------------------------
+# helpers
+# ---------------------------------------------------------------------------
+
+
+def _parse_windows(value: str) -> tuple[int, ...]:
+    return tuple(sorted({int(part) for part in value.split(",") if part.strip()}))
+
+
+@contextmanager
+def _open_input(name: str) -> Iterator[IO[str]]:
+    """Open *name* for reading, or use stdin for ``-``; stdin is left open."""
+    if name == "-":
+        yield sys.stdin
+        return
+    with open(name, encoding="utf-8") as file:
+        yield file
+
+
+@contextmanager
+def _open_output(name: str) -> Iterator[IO[str]]:
+    """Open *name* for writing, or use stdout for ``-``."""
+    if name == "-":
+        yield sys.stdout
+        return
+    with open(name, "w", encoding="utf-8", newline="") as file:
+        yield file
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser of the CLI."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.buienalarm.cli",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="download one nowcast per location")
+    fetch.add_argument("locations", help="file with 'lat,lon' per line ('-' for stdin)")
+    fetch.add_argument("-o", "--output", required=True, help="directory for the payload files")
+    fetch.add_argument("--endpoint", help="URL template with {} placeholders for lat and lon")
+    fetch.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="parallel requests")
+    fetch.add_argument("--timeout", type=int, default=10, help="timeout per request in seconds")
+
+    process = commands.add_parser("process", help="summarise recorded payloads in parallel")
+    process.add_argument("paths", nargs="+", help="payload files or directories of *.json")
+    process.add_argument("-o", "--output", default="-", help="NDJSON output file ('-' for stdout)")
+    process.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    process.add_argument("--at", type=float, default=None, help="evaluate at this epoch time instead of the first bin")
+    process.add_argument("--windows", default=",".join(map(str, DEFAULT_WINDOWS)), help="average windows in minutes")
+
+    export = commands.add_parser("export", help="convert NDJSON summaries")
+    export.add_argument("paths", nargs="+", help="NDJSON summary files ('-' for stdin)")
+    export.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    export.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the CLI and return its exit code."""
+    args = build_parser().parse_args(argv)
+    if args.command == "fetch":
+        return asyncio.run(_async_fetch(args))
+    if args.command == "process":
+        return _process(args)
+    return _export(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,7 +27,24 @@ from homeassistant.const import (
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, NAME
+from .const import (
+    CONF_ARCHIVE_RETENTION,
+    CONF_EXPECTED_LEAD,
+    CONF_INTENSITY_THRESHOLDS,
+    CONF_MINUTE_TICKS,
+    CONF_RAIN_THRESHOLD,
+    CONF_RAIN_WINDOWS,
+    CONF_TIMING_SPANS,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_EXPECTED_LEAD,
+    DEFAULT_INTENSITY_THRESHOLDS,
+    DEFAULT_NOTIFICATION_LIMIT,
+    DEFAULT_RAIN_THRESHOLD,
+    DEFAULT_RAIN_WINDOWS,
+    DOMAIN,
+    NAME,
+)
+from .core.classify import validate_thresholds
 
 _LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
 
@@ -37,7 +54,6 @@ _LOGGER: Final[logging.Logger] = logging.getLogger(__name__)
 DEFAULT_LATITUDE: Final[float] = 52.7875
 DEFAULT_LONGITUDE: Final[float] = 4.79861
 DEFAULT_REFRESH_INTERVAL: Final[int] = 300  # seconds (5 min)
-DEFAULT_NOTIFICATION_LIMIT: Final[int] = 0   # mm/h – notify on any value
 
 
 def _is_valid_coordinates(latitude: float | str, longitude: float | str) -> bool:
@@ -159,21 +175,32 @@ class BuienalarmOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the Buienalarm options."""
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            _LOGGER.debug(
-                "Updating options for entry %s: %s", self._entry.entry_id, user_input
-            )
-            return self.async_create_entry(title="", data=user_input)
+            try:
+                validate_thresholds(
+                    user_input.get(CONF_INTENSITY_THRESHOLDS, DEFAULT_INTENSITY_THRESHOLDS)
+                )
+            except ValueError as err:
+                _LOGGER.debug("Rejected options for entry %s: %s", self._entry.entry_id, err)
+                errors[CONF_INTENSITY_THRESHOLDS] = "invalid_thresholds"
+            else:
+                _LOGGER.debug(
+                    "Updating options for entry %s: %s", self._entry.entry_id, user_input
+                )
+                return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
-            data_schema=self._options_schema(),
+            data_schema=self._options_schema(user_input),
+            errors=errors,
         )
 
     # --------------------------------------------------------------
-    def _options_schema(self) -> vol.Schema:  # noqa: D401
-        """Return schema for the options form."""
-        existing = self._entry.options
+    def _options_schema(self, user_input: dict[str, Any] | None = None) -> vol.Schema:  # noqa: D401
+        """Return schema for the options form; a rejected input stays filled in."""
+        existing = user_input if user_input is not None else self._entry.options
         return vol.Schema(
             {
                 vol.Required(
@@ -198,6 +225,34 @@ class BuienalarmOptionsFlow(config_entries.OptionsFlow):
                     "refresh_interval",
                     default=existing.get("refresh_interval", DEFAULT_REFRESH_INTERVAL),
                 ): int,
+                vol.Optional(
+                    CONF_MINUTE_TICKS,
+                    default=existing.get(CONF_MINUTE_TICKS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_EXPECTED_LEAD,
+                    default=existing.get(CONF_EXPECTED_LEAD, DEFAULT_EXPECTED_LEAD),
+                ): vol.All(int, vol.Range(min=0, max=120)),
+                vol.Optional(
+                    CONF_RAIN_WINDOWS,
+                    default=existing.get(CONF_RAIN_WINDOWS, DEFAULT_RAIN_WINDOWS),
+                ): str,
+                vol.Optional(
+                    CONF_RAIN_THRESHOLD,
+                    default=existing.get(CONF_RAIN_THRESHOLD, DEFAULT_RAIN_THRESHOLD),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_INTENSITY_THRESHOLDS,
+                    default=existing.get(CONF_INTENSITY_THRESHOLDS, DEFAULT_INTENSITY_THRESHOLDS),
+                ): str,
+                vol.Optional(
+                    CONF_ARCHIVE_RETENTION,
+                    default=existing.get(CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION),
+                ): vol.All(int, vol.Range(min=0, max=365)),
+                vol.Optional(
+                    CONF_TIMING_SPANS,
+                    default=existing.get(CONF_TIMING_SPANS, False),
+                ): bool,
             }
         )
 
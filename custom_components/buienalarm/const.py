@@ -11,6 +11,8 @@ from homeassistant.const import UnitOfTime, UnitOfVolumetricFlux
 # API Configuration
 API_ENDPOINT: Final[str] = "https://imn-rust-lb.infoplaza.io/v4/nowcast/ba/timeseries/{}/{}"
 API_TIMEOUT: Final[int] = 30
+# Alternatief endpoint in de entry-data, bv. een lokale stub voor tests
+CONF_API_ENDPOINT: Final[str] = "api_endpoint"
 API_TIMEZONE: Final[str] = "Europe/Amsterdam"
 API_CONF_URL: Final[str] = "https://buienalarm.nl"
 DATA_KEY: Final[str] = "data"
@@ -29,11 +31,43 @@ SCAN_INTERVAL: Final[timedelta] = timedelta(minutes=5)
 DATA_REFRESH_INTERVAL: Final[int] = 300
 DEFAULT_UPDATE_INTERVAL: Final[timedelta] = timedelta(minutes=5)
 
+# Options
+CONF_NOTIFICATION_LIMIT: Final[str] = "notification_limit"
+DEFAULT_NOTIFICATION_LIMIT: Final[int] = 0  # mm/h, 0 = geen meldingen
+CONF_MINUTE_TICKS: Final[str] = "minute_ticks"
+CONF_EXPECTED_LEAD: Final[str] = "rain_expected_lead"
+DEFAULT_EXPECTED_LEAD: Final[int] = 10  # minuten
+CONF_RAIN_WINDOWS: Final[str] = "rain_windows"
+DEFAULT_RAIN_WINDOWS: Final[str] = "15,30,60"  # minuten, kommagescheiden
+CONF_RAIN_THRESHOLD: Final[str] = "rain_threshold"
+DEFAULT_RAIN_THRESHOLD: Final[float] = 0.0  # mm/h
+CONF_ARCHIVE_RETENTION: Final[str] = "archive_retention"
+DEFAULT_ARCHIVE_RETENTION: Final[int] = 0  # dagen, 0 = geen archief
+CONF_TIMING_SPANS: Final[str] = "timing_spans"
+CONF_INTENSITY_THRESHOLDS: Final[str] = "intensity_thresholds"
+DEFAULT_INTENSITY_THRESHOLDS: Final[str] = "1.0,2.0,7.5,15.0"  # mm/h: licht, matig, zwaar, heel zwaar
+
+# Services
+SERVICE_GET_VERIFICATION: Final[str] = "get_verification"
+SERVICE_PROFILE: Final[str] = "profile"
+ATTR_UPDATES: Final[str] = "updates"
+ATTR_ENTRY_ID: Final[str] = "entry_id"
+ATTR_DAYS: Final[str] = "days"
+
+# Websocket API
+WS_SUBSCRIBE_FORECAST: Final[str] = f"{DOMAIN}/subscribe_forecast"
+WS_PUSH_COOLDOWN: Final[float] = 2.0  # seconden tussen twee diffs per abonnement
+
+# Events fired on the Home Assistant bus
+EVENT_RAIN_EXPECTED: Final[str] = f"{DOMAIN}_rain_expected"
+EVENT_RAIN_STARTED: Final[str] = f"{DOMAIN}_rain_started"
+EVENT_RAIN_STOPPED: Final[str] = f"{DOMAIN}_rain_stopped"
+
 # Supported platforms
-# BINARY_SENSOR: Final[str] = "binary_sensor"
+BINARY_SENSOR: Final[str] = "binary_sensor"
+CALENDAR: Final[str] = "calendar"
 SENSOR: Final[str] = "sensor"
-# PLATFORMS: Final[list[str]] = [BINARY_SENSOR, SENSOR]
-PLATFORMS: Final[list[str]] = [SENSOR]
+PLATFORMS: Final[list[str]] = [BINARY_SENSOR, CALENDAR, SENSOR]
 
 # Icon templates (not in use)
 ICON_TEMPLATE: Final[str] = "mdi:weather-{}"
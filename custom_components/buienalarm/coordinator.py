@@ -1,27 +1,51 @@
 # coordinator.py
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Callable
 
 import aiohttp
 import async_timeout
-import requests
 from aiohttp import ClientSession, ClientTimeout
 from aiohttp.client_exceptions import ClientResponseError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import BuienalarmApiClient
-from .const import API_ENDPOINT, API_TIMEOUT, DEFAULT_UPDATE_INTERVAL
+from .archive import ArchiveRecorder, async_get_recorder, issued_at
+from .const import (
+    API_ENDPOINT,
+    API_TIMEOUT,
+    CONF_ARCHIVE_RETENTION,
+    CONF_EXPECTED_LEAD,
+    CONF_INTENSITY_THRESHOLDS,
+    CONF_MINUTE_TICKS,
+    CONF_NOTIFICATION_LIMIT,
+    CONF_RAIN_THRESHOLD,
+    CONF_TIMING_SPANS,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_EXPECTED_LEAD,
+    DEFAULT_INTENSITY_THRESHOLDS,
+    DEFAULT_NOTIFICATION_LIMIT,
+    DEFAULT_RAIN_THRESHOLD,
+    DEFAULT_UPDATE_INTERVAL,
+)
+from .core.classify import PrecipitationClassifier, parse_thresholds
+from .core.snapshot import ForecastSnapshot
+from .events import RainEventScheduler
+from .metrics import REGISTRY
+from .notification import NotificationEngine
+from .profiling import SpanRecorder, UpdateProfiler
+from .verification import ForecastVerifier
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
-_LOGGER.debug("[COORD] coordinator loaded")
-
 _API_TIMEOUT = ClientTimeout(
     total=30,       # hard‑stop; moet < HA default (15 s) blijven
     connect=5,      # connectie‑timeout
@@ -31,7 +55,6 @@ _API_TIMEOUT = ClientTimeout(
 
 
 class BuienalarmDataUpdateCoordinator(DataUpdateCoordinator):
-    _LOGGER.debug("[COORD] coordinator: class BuienalarmDataUpdateCoordinator loaded")
     """Class to manage fetching data from the API."""
     options: dict = None
 
@@ -56,12 +79,60 @@ class BuienalarmDataUpdateCoordinator(DataUpdateCoordinator):
         self.api = api
         self.device_info = device_info
         self.config_entry = config_entry
-        self.url = API_ENDPOINT.format(api.latitude, api.longitude)
+        self.url = api.base_url
         _LOGGER.debug("[COORD INIT] Using API URL: %s", self.url)
         self.entities = []  # Create an empty list to store associated entities
         self.api_last_updated: datetime | None = None
+        self.cache_age: int | None = None
+        # Uitgiftetijd van de nowcast (fetch-tijd min de cache-leeftijd)
+        self.issued: datetime | None = None
         # self.last_update_success = False
 
+        # Snapshot (index + state timeline) of the last fetch, reused by every local tick
+        self.snapshot: ForecastSnapshot = ForecastSnapshot.empty()
+        self.classifier = PrecipitationClassifier(
+            parse_thresholds(config_entry.options.get(CONF_INTENSITY_THRESHOLDS, DEFAULT_INTENSITY_THRESHOLDS))
+        )
+        self.minute_ticks: bool = bool(config_entry.options.get(CONF_MINUTE_TICKS, False))
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self.events = RainEventScheduler(
+            hass,
+            config_entry.entry_id,
+            config_entry.title,
+            timedelta(minutes=config_entry.options.get(CONF_EXPECTED_LEAD, DEFAULT_EXPECTED_LEAD)),
+        )
+        # Meldingen alleen als er een limiet is ingesteld; 0 = uit
+        self.notifications: NotificationEngine | None = None
+        limit = float(
+            config_entry.options.get(
+                CONF_NOTIFICATION_LIMIT,
+                config_entry.data.get(CONF_NOTIFICATION_LIMIT, DEFAULT_NOTIFICATION_LIMIT),
+            )
+            or 0
+        )
+        if limit > 0:
+            self.notifications = NotificationEngine(hass, config_entry.entry_id, config_entry.title, limit)
+
+        # Opt-in timing spans, gedeeld met de API-client; profiler via buienalarm.profile
+        self.spans = SpanRecorder(enabled=bool(config_entry.options.get(CONF_TIMING_SPANS, False)))
+        api.spans = self.spans
+        self.profiler = UpdateProfiler(hass, config_entry.entry_id)
+        # Altijd-aan metrics (diagnostics, /api/buienalarm/metrics), gedeeld met de API-client
+        self.metrics = REGISTRY.register(config_entry.entry_id)
+        api.metrics = self.metrics
+
+        self.verifier = ForecastVerifier(
+            threshold=float(config_entry.options.get(CONF_RAIN_THRESHOLD, DEFAULT_RAIN_THRESHOLD))
+        )
+
+        # Archief van alle fetches, gedeeld door alle entries
+        self.archive_location: str = f"{api.latitude:.4f},{api.longitude:.4f}"
+        self.archive: ArchiveRecorder | None = None
+        retention = int(config_entry.options.get(CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION))
+        if retention > 0:
+            self.archive = async_get_recorder(hass)
+            self.archive.async_register(self.archive_location, timedelta(days=retention))
+
         super().__init__(
             hass=hass,
             logger=_LOGGER,
@@ -73,11 +144,6 @@ class BuienalarmDataUpdateCoordinator(DataUpdateCoordinator):
         )
         _LOGGER.debug("[COORD INIT] DataUpdateCoordinator initialized")
 
-    async def async_add_listener(self, listener, update_supported=True):
-        # Implement the logic to add a listener here
-        # This method allows entities to register themselves as listeners to receive updates
-        pass
-
     async def fetch_data(self):
         """Fetch data from the Buienalarm API asynchronously.
         Wordt nioet uitegevoerd
@@ -108,29 +174,105 @@ class BuienalarmDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         _LOGGER.debug("[COORD UPDATE] Starting _async_update_data for URL: %s with timeout: %s", self.url, _API_TIMEOUT)
+        self.profiler.begin()
         try:
             async with async_timeout.timeout(30):
-                data = await self.api.async_get_data()
+                with self.spans.span("update.fetch"):
+                    result = await self.api.async_get_data()
                 self.api_last_updated = datetime.now(timezone.utc)
+                self.cache_age = result.get("cache_age")
+                data = result.get("timeseries")
+                processing_started = time.perf_counter()
+                with self.spans.span("snapshot.build"):
+                    self.snapshot = ForecastSnapshot.from_payload(
+                        data,
+                        dt_util.get_default_time_zone(),
+                        self.api_last_updated,
+                        self.hass.config.language,
+                        self.classifier,
+                    )
+                self.metrics.snapshot_build.observe(time.perf_counter() - processing_started)
+                self.events.async_schedule(self.snapshot)
+                if self.notifications is not None:
+                    self.notifications.async_evaluate(self.snapshot)
+                issued = self.issued = issued_at(self.api_last_updated, self.cache_age)
+                self.verifier.update(self.snapshot.index, issued.timestamp(), self.api_last_updated.timestamp())
+                if self.archive is not None:
+                    self.archive.async_add(self.archive_location, issued, self.snapshot.index)
+                self._async_schedule_tick()
+                self.metrics.processing_time.observe(time.perf_counter() - processing_started)
                 return data
-                response = await self.hass.async_add_executor_job(
-                    requests.get, self.url
-                )
-                _LOGGER.debug(
-                    "[COORD] HTTP status: %s, headers: %s",
-                    response.status_code,
-                    response.headers,
-                )
-                response.raise_for_status()
-                data = response.json()
-                _LOGGER.debug("[COORD] JSON data: %s", data)
-                return data
-        except (requests.RequestException, ValueError) as error:
+        except ValueError as error:
             _LOGGER.error("[COORD] Error updating data: %s", error)
             raise UpdateFailed(f"Error updating data: {error}") from error
         except Exception as err:
             _LOGGER.error("[COORD] Error updating Buienalarm data: %s", err)
             raise UpdateFailed("Error fetching Buienalarm data") from err
+        finally:
+            # Ook bij CancelledError; ticks sluiten nooit een geprofileerde update
+            self.profiler.end()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Write the entity states; timed as one span."""
+        # Alleen echte writes tellen; websocket- en andere listeners schrijven geen state
+        writes = self.metrics.entity_writes
+        with self.spans.span("entity.writes"):
+            super().async_update_listeners()
+        self.metrics.state_writes.observe(self.metrics.entity_writes - writes)
+        if self.update_interval is not None:
+            self.metrics.poll_interval = self.update_interval.total_seconds()
+
+    @callback
+    def _async_schedule_tick(self) -> None:
+        """Schedule a local re-evaluation at the next bin boundary.
+
+        Values such as ``next_precipitation`` depend on the current time, so
+        the listeners are updated at every 5-minute bin boundary (or every
+        minute when ``minute_ticks`` is enabled) without touching the API.
+        """
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+        now = datetime.now(timezone.utc)
+        boundary = self.snapshot.index.next_boundary(now.timestamp())
+        if boundary is None:
+            _LOGGER.debug("[COORD TICK] Forecast exhausted, waiting for next fetch")
+            return
+
+        point = datetime.fromtimestamp(boundary, tz=timezone.utc)
+        if self.minute_ticks:
+            next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            point = min(point, next_minute)
+
+        self._unsub_tick = async_track_point_in_utc_time(self.hass, self._async_handle_tick, point)
+
+    @callback
+    def _async_handle_tick(self, now: datetime) -> None:
+        """Push the cached data to all listeners again; no network I/O."""
+        self._unsub_tick = None
+        _LOGGER.debug("[COORD TICK] Local re-evaluation at %s", now.isoformat())
+        self.async_update_listeners()
+        self._async_schedule_tick()
+
+    async def async_shutdown(self) -> None:
+        """Cancel timers, release the archive and shut down the coordinator.
+
+        Called on unload and on Home Assistant stop, so it must be safe to
+        call more than once.
+        """
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        self.events.async_cancel()
+        if self.notifications is not None:
+            self.notifications.async_dismiss()
+        if self.archive is not None:
+            archive, self.archive = self.archive, None
+            await archive.async_release(self.archive_location)
+        REGISTRY.unregister(self.config_entry.entry_id, self.metrics)
+        await super().async_shutdown()
 
     async def old_async_update_data(self) -> dict[str, object]:
         """Query de Buienalarm‑API (1 retry)."""
@@ -0,0 +1,26 @@
+"""Home Assistant independent forecast core of the Buienalarm integration.
+
+Parsing, segmentation, aggregation and message rendering of nowcast
+payloads.  Nothing in this package imports ``homeassistant``, so it can
+be used from batch tools and benchmarks without a running instance; the
+entities are thin adapters over a ``ForecastSnapshot``.
+"""
+# core/__init__.py
+from .analytics import RainPeriod, precipitation_periods, rain_periods, render_nowcastmessage
+from .classify import PrecipitationClassifier
+from .forecast import BIN_SECONDS, ForecastIndex
+from .snapshot import NEXT_PRECIPITATION_AT, ForecastSnapshot, compact_diff, compute_state
+
+__all__: list[str] = [
+    "BIN_SECONDS",
+    "NEXT_PRECIPITATION_AT",
+    "ForecastIndex",
+    "ForecastSnapshot",
+    "PrecipitationClassifier",
+    "RainPeriod",
+    "compact_diff",
+    "compute_state",
+    "precipitation_periods",
+    "rain_periods",
+    "render_nowcastmessage",
+]
@@ -0,0 +1,275 @@
+"""Pure forecast analytics for Buienalarm.
+
+Every function takes the ForecastIndex of one fetch and an explicit
+``now`` (epoch seconds), so the same code can be evaluated for any
+future bin when the state timeline is built.  Nothing here reads the
+clock or touches Home Assistant.
+"""
+# core/analytics.py
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Final, NamedTuple
+
+from .classify import DEFAULT_CLASSIFIER, describe, is_dry, type_name
+from .forecast import ForecastIndex
+from .i18n import DEFAULT_LANGUAGE, text
+
+MAX_DURATION_MINUTES: Final[int] = 120
+RAIN_INTERVAL_MINUTES: Final[int] = 5
+
+_PLACEHOLDER: Final[re.Pattern[str]] = re.compile(r"\{(\d+)\}")
+
+
+def format_time(ts: float, tz: tzinfo) -> str:
+    """Geef lokale tijd als 'H:MM' (zonder voorloop-0)."""
+    local = datetime.fromtimestamp(ts, tz=tz)
+    return f"{local.hour}:{local.minute:02d}"
+
+
+@lru_cache(maxsize=64)
+def compile_nowcastmessage(template: str) -> tuple[str | int, ...]:
+    """Split an API message into literal text and ``{<epoch>}`` placeholders (epochs as int)."""
+    segments: list[str | int] = []
+    pos = 0
+    for match in _PLACEHOLDER.finditer(template):
+        if match.start() > pos:
+            segments.append(template[pos:match.start()])
+        segments.append(int(match.group(1)))
+        pos = match.end()
+    if pos < len(template):
+        segments.append(template[pos:])
+    return tuple(segments)
+
+
+@lru_cache(maxsize=256)
+def _render_compiled(template: str, tz: tzinfo) -> str:
+    return "".join(
+        segment if isinstance(segment, str) else format_time(segment, tz)
+        for segment in compile_nowcastmessage(template)
+    )
+
+
+def render_nowcastmessage(template: str | None, tz: tzinfo) -> str | None:
+    """Replace ``{<epoch>}`` placeholders in an API message with local 'H:MM'.
+
+    The placeholders are absolute times, so the result only depends on the
+    message and the time zone and is cached on exactly that.
+    """
+    if not template:
+        return None
+    return _render_compiled(template, tz)
+
+
+def current_bin(index: ForecastIndex, now: float) -> int | None:
+    """Return the bin containing *now* (``t <= now < t + 5 min``)."""
+    return index.bin_at(now)
+
+
+def current_precipitation(index: ForecastIndex, now: float) -> float:
+    """Return the precipitation rate of the current bin in mm/h."""
+    i = current_bin(index, now)
+    return index.rates[i] if i is not None else 0.0
+
+
+def _code(index: ForecastIndex, i: int, codes: Sequence[int] | None) -> int:
+    return codes[i] if codes is not None else DEFAULT_CLASSIFIER.code(index.rates[i], index.types[i])
+
+
+def current_precipitation_rate_desc(
+    index: ForecastIndex,
+    now: float,
+    codes: Sequence[int] | None = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> str:
+    """Return the description of the current precipitation rate.
+
+    *codes* are the precomputed class codes of the bins; without them the
+    current bin is classified with the default thresholds.
+    """
+    i = current_bin(index, now)
+    if i is None:
+        return text("no_precipitation", language)
+    return describe(_code(index, i, codes), language)
+
+
+def current_precipitation_type(
+    index: ForecastIndex,
+    now: float,
+    codes: Sequence[int] | None = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> str:
+    """Return the name of the current precipitation type."""
+    i = current_bin(index, now)
+    if i is None or is_dry(_code(index, i, codes)):
+        return text("no_precipitation", language)
+    return type_name(index.types[i], language)
+
+
+def next_precipitation_at(index: ForecastIndex, now: float) -> float | None:
+    """Return the start of the next wet bin, *now* if it is raining, else None."""
+    if current_precipitation(index, now) > 0:
+        return now
+    for i in range(bisect_left(index.timestamps, now), len(index)):
+        if index.rates[i] > 0:
+            return index.timestamps[i]
+    return None
+
+
+def minutes_until(target: float | None, now: float) -> int | None:
+    """Return whole minutes from *now* until *target* (never negative)."""
+    if target is None:
+        return None
+    return max(int(round((target - now) / 60)), 0)
+
+
+def precipitation_duration(index: ForecastIndex, now: float) -> int | None:
+    """Return the duration in minutes of the next precipitation event."""
+    if not index:
+        return None
+
+    start: int | None = None
+    last: int | None = None
+    for i in range(bisect_right(index.timestamps, now), len(index)):
+        last = index.timestamps[i]
+        if index.rates[i] > 0:
+            if start is None:
+                start = last
+        elif start is not None:
+            return min(MAX_DURATION_MINUTES, int(round((last - start) / 60)))
+        else:
+            return 0
+
+    if start is not None and last is not None:
+        return min(MAX_DURATION_MINUTES, int(round((last - start) / 60)))
+    return 0
+
+
+def average_precipitation_rate(index: ForecastIndex, now: float, seconds: int) -> float:
+    """Return the summed rate of the bins in ``[now, now + seconds]`` per hour."""
+    if seconds <= 0:
+        return 0.0
+    lo = bisect_left(index.timestamps, now)
+    hi = bisect_right(index.timestamps, now + seconds)
+    if hi <= lo:
+        return 0.0
+    return round(index.rate_sum(lo, hi) / (seconds / 3600), 1)
+
+
+def rain_start_time_and_duration(
+    index: ForecastIndex, now: float
+) -> tuple[int | None, int | None, int | None, int, bool]:
+    """Return start, stop, restart (epoch), duration (min) and stopped flag."""
+    start: int | None = None
+    stop: int | None = None
+    restart: int | None = None
+    duration: int = 0
+    stopped: bool = True
+
+    for i in range(bisect_left(index.timestamps, now), len(index)):
+        ts = index.timestamps[i]
+        if index.rates[i] > 0:
+            stopped = False
+            if start is None:
+                start = ts
+            if stop is None:
+                duration += RAIN_INTERVAL_MINUTES
+            if restart is None and stop is not None:
+                restart = ts
+        elif start is not None and stop is None:
+            stop = ts
+            stopped = True
+
+    if start is not None:
+        end = stop if stop is not None else index.timestamps[-1]
+        duration = int((end - start) / 60)
+
+    return start, stop, restart, duration, stopped
+
+
+def mycastmessage(index: ForecastIndex, now: float, tz: tzinfo, language: str = DEFAULT_LANGUAGE) -> str:
+    """Generate a user-friendly message for the precipitation forecast."""
+    if not index:
+        return text("no_data", language)
+
+    start, stop, restart, duration, _stopped = rain_start_time_and_duration(index, now)
+    if start is None:
+        return text("no_precipitation", language)
+
+    if current_precipitation(index, now) > 0:
+        message_parts = [text("continues", language, duration=duration)]
+        if stop:
+            message_parts.append(text("stops", language, time=format_time(stop, tz)))
+        if restart:
+            message_parts.append(text("restarts", language, time=format_time(restart, tz)))
+        return " ".join(message_parts)
+
+    if start > now:
+        if stop is None:
+            return text("starts_prolonged", language, time=format_time(start, tz))
+        return text("starts", language, time=format_time(start, tz), duration=duration)
+    return text("expected", language, time=format_time(start, tz), duration=duration)
+
+
+class RainPeriod(NamedTuple):
+    """One contiguous run of wet bins (epoch seconds, mm/h)."""
+
+    start: int
+    stop: int
+    precipitationrate: float
+
+    @property
+    def duration_minutes(self) -> int:
+        """Return the length of the period in whole minutes."""
+        return int((self.stop - self.start) // 60)
+
+
+def rain_periods(index: ForecastIndex, now: float) -> list[RainPeriod]:
+    """Segment the bins from *now* onwards into precipitation periods.
+
+    A period stops at the first dry bin; an event still running at the
+    end of the forecast stops at the last data point.
+    """
+    periods: list[RainPeriod] = []
+    start: int | None = None
+    total = 0.0
+    count = 0
+
+    for i in range(bisect_left(index.timestamps, now), len(index)):
+        rate = index.rates[i]
+        if rate > 0:
+            if start is None:
+                start = index.timestamps[i]
+            total += rate
+            count += 1
+        elif start is not None:
+            periods.append(RainPeriod(start, index.timestamps[i], round(total / count, 2)))
+            start, total, count = None, 0.0, 0
+
+    if start is not None:
+        periods.append(RainPeriod(start, index.timestamps[-1], round(total / count, 2)))
+
+    return periods
+
+
+def precipitation_periods(
+    index: ForecastIndex, now: float, tz: tzinfo
+) -> list[dict[str, str | int | float | None]]:
+    """Return future precipitation periods with ISO 8601 local timestamps.
+
+    Each dict holds ``start``, ``stop``, ``duration`` (minutes) and the
+    average ``precipitationrate`` in mm/h.
+    """
+    return [
+        {
+            "start": datetime.fromtimestamp(period.start, tz=tz).isoformat(),
+            "stop": datetime.fromtimestamp(period.stop, tz=tz).isoformat(),
+            "duration": period.duration_minutes,
+            "precipitationrate": period.precipitationrate,
+        }
+        for period in rain_periods(index, now)
+    ]
@@ -0,0 +1,170 @@
+"""Table-driven classification of precipitation bins.
+
+A bin's class code combines its phase (rain, snow, mix) with its
+intensity, found by bisecting the rate into a threshold table.  The
+codes of a whole forecast are computed once per fetch; descriptions and
+type names are plain lookups per language.
+"""
+# core/classify.py
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from math import isfinite
+from typing import Final
+
+from .forecast import ForecastIndex
+from .i18n import DEFAULT_LANGUAGE
+
+# Ondergrenzen (exclusief) van motregen t/m heel zwaar zijn 0 en deze vier waarden, in mm/h
+DEFAULT_THRESHOLDS: Final[tuple[float, ...]] = (1.0, 2.0, 7.5, 15.0)
+
+INTENSITIES: Final[tuple[str, ...]] = ("none", "drizzle", "light", "moderate", "heavy", "very_heavy")
+PHASES: Final[tuple[str, ...]] = ("rain", "snow", "mix")
+
+# API-type -> fase; al het andere telt als regen
+_PHASE_BY_TYPE: Final[dict[str, int]] = {"snow": 1, "mix of rain and snow": 2}
+
+# Omschrijving per taal en fase, op volgorde van INTENSITIES
+_DESCRIPTIONS: Final[dict[str, dict[str, tuple[str, ...]]]] = {
+    "nl": {
+        "rain": ("Geen neerslag", "Motregen", "Lichte regen", "Matige regen", "Zware regen", "Heel zware regen"),
+        "snow": ("Geen neerslag", "Motsneeuw", "Lichte sneeuw", "Matige sneeuw", "Zware sneeuw", "Heel zware sneeuw"),
+        "mix": (
+            "Geen neerslag",
+            "Natte sneeuw",
+            "Lichte regen en sneeuw",
+            "Matige regen en sneeuw",
+            "Zware regen en sneeuw",
+            "Heel zware regen en sneeuw",
+        ),
+    },
+    "en": {
+        "rain": ("No precipitation", "Drizzle", "Light rain", "Moderate rain", "Heavy rain", "Very heavy rain"),
+        "snow": ("No precipitation", "Snow flurries", "Light snow", "Moderate snow", "Heavy snow", "Very heavy snow"),
+        "mix": (
+            "No precipitation",
+            "Sleet",
+            "Light rain and snow",
+            "Moderate rain and snow",
+            "Heavy rain and snow",
+            "Very heavy rain and snow",
+        ),
+    },
+    "de": {
+        "rain": ("Kein Niederschlag", "Nieselregen", "Leichter Regen", "Mäßiger Regen", "Starker Regen", "Sehr starker Regen"),
+        "snow": (
+            "Kein Niederschlag",
+            "Schneegriesel",
+            "Leichter Schneefall",
+            "Mäßiger Schneefall",
+            "Starker Schneefall",
+            "Sehr starker Schneefall",
+        ),
+        "mix": (
+            "Kein Niederschlag",
+            "Schneeregen",
+            "Leichter Regen und Schnee",
+            "Mäßiger Regen und Schnee",
+            "Starker Regen und Schnee",
+            "Sehr starker Regen und Schnee",
+        ),
+    },
+}
+
+# Plat per taal, geïndexeerd op class code
+DESCRIPTIONS: Final[dict[str, tuple[str, ...]]] = {
+    language: tuple(label for phase in PHASES for label in table[phase])
+    for language, table in _DESCRIPTIONS.items()
+}
+
+TYPE_NAMES: Final[dict[str, Mapping[str, str]]] = {
+    "nl": {
+        "rain": "Regen",
+        "freezing rain": "Ijzel",
+        "snow": "Sneeuw",
+        "mix": "Mix van regen en sneeuw",
+        "mix of rain and snow": "Mix van regen en sneeuw",
+    },
+    "en": {
+        "rain": "Rain",
+        "freezing rain": "Freezing rain",
+        "snow": "Snow",
+        "mix": "Mix of rain and snow",
+        "mix of rain and snow": "Mix of rain and snow",
+    },
+    "de": {
+        "rain": "Regen",
+        "freezing rain": "Eisregen",
+        "snow": "Schnee",
+        "mix": "Schneeregen",
+        "mix of rain and snow": "Schneeregen",
+    },
+}
+
+
+def validate_thresholds(value: object) -> tuple[float, ...]:
+    """Return four strictly increasing positive thresholds from ``"1,2,7.5,15"``.
+
+    Raises ValueError for anything else; the options flow shows it as a form error.
+    """
+    thresholds = tuple(float(part) for part in str(value).replace(";", ",").split(","))
+    if (
+        len(thresholds) != len(DEFAULT_THRESHOLDS)
+        or not all(isfinite(threshold) for threshold in thresholds)
+        or thresholds[0] <= 0
+        or any(a >= b for a, b in zip(thresholds, thresholds[1:]))
+    ):
+        raise ValueError(f"Expected {len(DEFAULT_THRESHOLDS)} ascending positive values, got {value!r}")
+    return thresholds
+
+
+def parse_thresholds(value: object) -> tuple[float, ...]:
+    """Return four ascending thresholds from ``"1,2,7.5,15"``, else the defaults."""
+    try:
+        return validate_thresholds(value)
+    except ValueError:
+        return DEFAULT_THRESHOLDS
+
+
+class PrecipitationClassifier:
+    """Map rates and API types to class codes with one bisect per bin."""
+
+    __slots__ = ("thresholds", "_bounds")
+
+    def __init__(self, thresholds: Sequence[float] = DEFAULT_THRESHOLDS) -> None:
+        self.thresholds: Final[tuple[float, ...]] = tuple(thresholds)
+        # rate > bounds[k - 1] geeft intensiteit k; 0 mm/h en minder is droog
+        self._bounds: Final[tuple[float, ...]] = (0.0, *self.thresholds)
+
+    def code(self, rate: float, ptype: str) -> int:
+        """Return the class code of one bin."""
+        return _PHASE_BY_TYPE.get(ptype, 0) * len(INTENSITIES) + bisect_left(self._bounds, rate)
+
+    def classify(self, index: ForecastIndex) -> tuple[int, ...]:
+        """Return the class code of every bin of *index*."""
+        bounds = self._bounds
+        stride = len(INTENSITIES)
+        return tuple(
+            _PHASE_BY_TYPE.get(ptype, 0) * stride + bisect_left(bounds, rate)
+            for rate, ptype in zip(index.rates, index.types)
+        )
+
+
+DEFAULT_CLASSIFIER: Final[PrecipitationClassifier] = PrecipitationClassifier()
+
+
+def is_dry(code: int) -> bool:
+    """Return True for the code of a bin without precipitation."""
+    return code % len(INTENSITIES) == 0
+
+
+def describe(code: int, language: str = DEFAULT_LANGUAGE) -> str:
+    """Return the intensity description of a class code."""
+    return DESCRIPTIONS.get(language, DESCRIPTIONS[DEFAULT_LANGUAGE])[code]
+
+
+def type_name(ptype: str, language: str = DEFAULT_LANGUAGE) -> str:
+    """Return the name of an API precipitation type; unknown types are kept."""
+    ptype = ptype or "-"
+    return TYPE_NAMES.get(language, TYPE_NAMES[DEFAULT_LANGUAGE]).get(ptype, ptype)
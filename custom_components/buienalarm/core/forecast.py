@@ -0,0 +1,196 @@
+"""Forecast index for Buienalarm nowcast payloads."""
+# core/forecast.py
+from __future__ import annotations
+
+import logging
+from bisect import bisect_right
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Final
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# De API levert neerslag in bins van 5 minuten
+BIN_SECONDS: Final[int] = 300
+
+_EPOCH: Final[datetime] = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class ForecastIndex:
+    """Sorted, immutable view on the ``data`` list of one nowcast payload.
+
+    The index is built once per fetch by the coordinator.  Every lookup
+    afterwards is a bisect over the bin start times, so code that needs
+    "the bin at time T" or "the next bin boundary" never rescans the raw
+    payload.
+    """
+
+    __slots__ = ("timestamps", "rates", "types", "_peak_table")
+
+    def __init__(
+        self,
+        timestamps: tuple[int, ...],
+        rates: tuple[float, ...],
+        types: tuple[str, ...],
+    ) -> None:
+        self.timestamps: Final[tuple[int, ...]] = timestamps
+        self.rates: Final[tuple[float, ...]] = rates
+        self.types: Final[tuple[str, ...]] = types
+        self._peak_table: Final[tuple[tuple[int, ...], ...]] = self._build_peak_table(rates)
+
+    @staticmethod
+    def _build_peak_table(rates: tuple[float, ...]) -> tuple[tuple[int, ...], ...]:
+        """Build a sparse table: ``table[k][i]`` is the wettest bin in ``[i, i + 2**k)``."""
+        table: list[tuple[int, ...]] = [tuple(range(len(rates)))]
+        k = 1
+        while (1 << k) <= len(rates):
+            prev = table[-1]
+            half = 1 << (k - 1)
+            table.append(
+                tuple(
+                    a if rates[a] >= rates[b] else b
+                    for a, b in ((prev[i], prev[i + half]) for i in range(len(rates) - (1 << k) + 1))
+                )
+            )
+            k += 1
+        return tuple(table)
+
+    @classmethod
+    def from_payload(cls, payload: object) -> ForecastIndex:
+        """Build an index from the raw API payload.
+
+        Data points without a numeric ``timestamp`` are skipped, an
+        unparsable ``precipitationrate`` counts as 0.0 mm/h.
+        """
+        raw = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(raw, list):
+            _LOGGER.debug("[FORECAST] No usable 'data' list in payload (type: %s)", type(raw).__name__)
+            return cls((), (), ())
+
+        points: list[tuple[int, float, str]] = []
+        for item in raw:
+            if not isinstance(item, dict):
+                continue
+            ts = item.get("timestamp")
+            if not isinstance(ts, (int, float)) or isinstance(ts, bool):
+                continue
+            try:
+                rate = float(item.get("precipitationrate", 0.0))
+            except (TypeError, ValueError):
+                rate = 0.0
+            ptype = item.get("precipitationtype")
+            points.append((int(ts), rate, ptype if isinstance(ptype, str) else ""))
+
+        # De API levert oplopende tijden; alleen sorteren als dat niet zo is
+        if any(points[i][0] > points[i + 1][0] for i in range(len(points) - 1)):
+            points.sort(key=lambda point: point[0])
+
+        if not points:
+            return cls((), (), ())
+
+        timestamps, rates, types = zip(*points)
+        return cls(tuple(timestamps), tuple(rates), tuple(types))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return bool(self.timestamps)
+
+    @property
+    def start(self) -> int | None:
+        """Return the start of the first bin (epoch seconds)."""
+        return self.timestamps[0] if self.timestamps else None
+
+    @property
+    def end(self) -> int | None:
+        """Return the end of the last bin (epoch seconds)."""
+        return self.timestamps[-1] + BIN_SECONDS if self.timestamps else None
+
+    def bin_at(self, ts: float) -> int | None:
+        """Return the index of the bin covering *ts*, or None outside the forecast.
+
+        Bins are half-open, ``[t, t + 5 min)``: a time exactly on a boundary
+        belongs to the bin that starts there.  Analytics, the state timeline
+        and the entities all use this lookup.
+        """
+        i = bisect_right(self.timestamps, ts) - 1
+        if i < 0 or ts >= self.timestamps[i] + BIN_SECONDS:
+            return None
+        return i
+
+    def rate_sum(self, lo: int, hi: int) -> float:
+        """Return the sum of the rates of bins ``lo`` up to (excluding) ``hi``."""
+        # Gewone som in volgorde: dezelfde afronding als de oude sensorwaarden
+        return sum(self.rates[lo:hi])
+
+    def peak(self, lo: int, hi: int) -> int | None:
+        """Return the index of the wettest bin in ``[lo, hi)`` in O(1).
+
+        Ties resolve to the earliest bin; an empty range returns None.
+        """
+        lo = max(lo, 0)
+        hi = min(hi, len(self.rates))
+        if hi <= lo:
+            return None
+        k = (hi - lo).bit_length() - 1
+        a = self._peak_table[k][lo]
+        b = self._peak_table[k][hi - (1 << k)]
+        return a if self.rates[a] >= self.rates[b] else b
+
+    def max_rate(self, lo: int, hi: int) -> float:
+        """Return the highest rate in bins ``[lo, hi)``, 0.0 for an empty range."""
+        i = self.peak(lo, hi)
+        return self.rates[i] if i is not None else 0.0
+
+    def next_boundary(self, ts: float) -> int | None:
+        """Return the first bin boundary strictly after *ts*.
+
+        Boundaries are the bin start times plus the end of the last bin.
+        Returns None once the forecast horizon has passed.
+        """
+        i = bisect_right(self.timestamps, ts)
+        if i < len(self.timestamps):
+            return self.timestamps[i]
+        end = self.end
+        if end is not None and end > ts:
+            return end
+        return None
+
+
+def data_points(payload: object) -> list[dict[str, object]]:
+    """Return the raw data points with their ``time`` parsed as an aware datetime.
+
+    Each dict holds ``precipitationrate``, ``precipitationtype``,
+    ``timestamp`` and ``time`` (UTC when the API omits the offset; the
+    epoch when it is missing or invalid).  Items without ``get`` are
+    skipped.
+    """
+    raw = payload.get("data") if isinstance(payload, Mapping) else None
+    if not raw:
+        return []
+
+    results: list[dict[str, object]] = []
+    for item in raw:
+        if not isinstance(item, Mapping) and not hasattr(item, "get"):
+            _LOGGER.debug("[FORECAST] Skipping data point without 'get': %s", item)
+            continue
+        iso_time = item.get("time")
+        parsed = _EPOCH
+        if isinstance(iso_time, str):
+            try:
+                parsed = datetime.fromisoformat(iso_time)
+            except ValueError as exc:
+                _LOGGER.debug("[FORECAST] Invalid ISO time '%s': %s", iso_time, exc)
+            else:
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+        results.append(
+            {
+                "precipitationrate": item.get("precipitationrate"),
+                "precipitationtype": item.get("precipitationtype"),
+                "timestamp": item.get("timestamp"),
+                "time": parsed,
+            }
+        )
+    return results
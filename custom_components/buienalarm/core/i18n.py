@@ -0,0 +1,68 @@
+"""Translation tables for the user-facing texts of Buienalarm.
+
+The texts are rendered once per snapshot (for the state timeline) in
+the language of the Home Assistant instance, so a state read never
+builds strings.  The API itself only speaks Dutch, English and German.
+"""
+# core/i18n.py
+from __future__ import annotations
+
+from typing import Final
+
+LANGUAGES: Final[tuple[str, ...]] = ("nl", "en", "de")
+# Terugval voor talen die de API niet kent
+DEFAULT_LANGUAGE: Final[str] = LANGUAGES[0]
+
+MESSAGES: Final[dict[str, dict[str, str]]] = {
+    "nl": {
+        "no_data": "Geen data",
+        "no_precipitation": "Geen neerslag",
+        "continues": "Neerslag duurt nog {duration} minuten",
+        "stops": "en stopt rond {time}",
+        "restarts": "en begint weer om {time}",
+        "starts_prolonged": "Neerslag voor langere tijd begint om {time}",
+        "starts": "Neerslag begint om {time} en duurt {duration} minuten",
+        "expected": "Er wordt regen verwacht om {time} en duurt {duration} minuten",
+        "notification": "Neerslag tot {rate:.1f} mm/u verwacht rond {time} (limiet {limit:g} mm/u).",
+        "period_summary": "Regen ({rate:g} mm/u)",
+        "period_description": "{duration} minuten neerslag, gemiddeld {rate:g} mm/u",
+    },
+    "en": {
+        "no_data": "No data",
+        "no_precipitation": "No precipitation",
+        "continues": "Precipitation continues for {duration} minutes",
+        "stops": "and stops around {time}",
+        "restarts": "and starts again at {time}",
+        "starts_prolonged": "Prolonged precipitation starts at {time}",
+        "starts": "Precipitation starts at {time} and lasts {duration} minutes",
+        "expected": "Rain is expected at {time} and lasts {duration} minutes",
+        "notification": "Precipitation up to {rate:.1f} mm/h expected around {time} (limit {limit:g} mm/h).",
+        "period_summary": "Rain ({rate:g} mm/h)",
+        "period_description": "{duration} minutes of precipitation, {rate:g} mm/h on average",
+    },
+    "de": {
+        "no_data": "Keine Daten",
+        "no_precipitation": "Kein Niederschlag",
+        "continues": "Niederschlag dauert noch {duration} Minuten",
+        "stops": "und endet gegen {time}",
+        "restarts": "und beginnt wieder um {time}",
+        "starts_prolonged": "Länger anhaltender Niederschlag beginnt um {time}",
+        "starts": "Niederschlag beginnt um {time} und dauert {duration} Minuten",
+        "expected": "Regen wird um {time} erwartet und dauert {duration} Minuten",
+        "notification": "Niederschlag bis {rate:.1f} mm/h gegen {time} erwartet (Grenze {limit:g} mm/h).",
+        "period_summary": "Regen ({rate:g} mm/h)",
+        "period_description": "{duration} Minuten Niederschlag, durchschnittlich {rate:g} mm/h",
+    },
+}
+
+
+def resolve_language(language: str | None) -> str:
+    """Map a Home Assistant language ('en-GB', 'de') to a supported language."""
+    code = (language or "").split("-")[0].lower()
+    return code if code in LANGUAGES else DEFAULT_LANGUAGE
+
+
+def text(key: str, language: str = DEFAULT_LANGUAGE, **values: object) -> str:
+    """Return the text *key* in *language*, formatted with *values*."""
+    template = MESSAGES.get(language, MESSAGES[DEFAULT_LANGUAGE])[key]
+    return template.format(**values) if values else template
@@ -0,0 +1,201 @@
+"""Forecast snapshot with a precomputed state timeline."""
+# core/snapshot.py
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone, tzinfo
+from typing import Final
+
+from . import analytics
+from .classify import DEFAULT_CLASSIFIER, PrecipitationClassifier
+from .forecast import ForecastIndex
+from .i18n import DEFAULT_LANGUAGE, resolve_language
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# Waarde van een tijdlijn-state; minuten worden pas bij het lezen berekend
+NEXT_PRECIPITATION_AT: Final[str] = "next_precipitation_at"
+
+
+def compute_state(
+    index: ForecastIndex,
+    nowcastmessage: str | None,
+    now: float,
+    tz: tzinfo,
+    codes: Sequence[int] | None = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> dict[str, object]:
+    """Evaluate every sensor value for one moment *now* (epoch seconds).
+
+    *codes* are the class codes of the bins (see ``classify``); the texts
+    are rendered in *language*.
+    """
+    periods = analytics.precipitation_periods(index, now, tz)
+    return {
+        "nowcastmessage": nowcastmessage,
+        "mycastmessage": analytics.mycastmessage(index, now, tz, language),
+        "precipitation_duration": analytics.precipitation_duration(index, now),
+        "precipitationrate_total": analytics.average_precipitation_rate(index, now, 7200),
+        "precipitationrate_hour": analytics.average_precipitation_rate(index, now, 3600),
+        "precipitationrate_now": analytics.current_precipitation(index, now),
+        "precipitationrate_now_desc": analytics.current_precipitation_rate_desc(index, now, codes, language),
+        "precipitationtype_now": analytics.current_precipitation_type(index, now, codes, language),
+        NEXT_PRECIPITATION_AT: analytics.next_precipitation_at(index, now),
+        "precipitation_periods": periods,
+    }
+
+
+class ForecastSnapshot:
+    """Everything the entities need from one fetch, computed in one pass.
+
+    Between fetches the forecast is fixed, so the state of every sensor
+    only changes at bin boundaries.  ``timeline[i]`` holds all values for
+    the interval ``[t_i, t_i + 5 min)`` and a state read is a bisect into
+    that list.  Times outside the forecast are evaluated on demand.
+    ``periods`` is the segmentation of the whole forecast into rain periods;
+    the periods do not overlap, so sorted start and stop columns form an
+    interval index for ``periods_between``.
+    """
+
+    __slots__ = (
+        "index",
+        "nowcast",
+        "language",
+        "nowcastmessages",
+        "nowcastmessage",
+        "tz",
+        "retrieved_at",
+        "codes",
+        "periods",
+        "timeline",
+        "_period_starts",
+        "_period_stops",
+    )
+
+    def __init__(
+        self,
+        index: ForecastIndex,
+        nowcast: Mapping[str, str],
+        tz: tzinfo,
+        retrieved_at: datetime | None = None,
+        language: str | None = None,
+        classifier: PrecipitationClassifier = DEFAULT_CLASSIFIER,
+    ) -> None:
+        self.index: Final[ForecastIndex] = index
+        self.nowcast: Final[Mapping[str, str]] = nowcast
+        self.tz: Final[tzinfo] = tz
+        self.retrieved_at: Final[datetime | None] = retrieved_at
+        self.language: Final[str] = resolve_language(language)
+        # Alle talen uit de API, elk één keer gerenderd
+        self.nowcastmessages: Final[Mapping[str, str | None]] = {
+            lang: analytics.render_nowcastmessage(message, tz) for lang, message in nowcast.items()
+        }
+        # Melding in de HA-taal, anders de Nederlandse
+        self.nowcastmessage: Final[str | None] = (
+            self.nowcastmessages.get(self.language) or self.nowcastmessages.get(DEFAULT_LANGUAGE)
+        )
+        # Eén class code per bin; omschrijving en type zijn daarna opzoekingen
+        self.codes: Final[tuple[int, ...]] = classifier.classify(index)
+        # Segmentatie van de hele verwachting, gedeeld door events en andere platforms
+        self.periods: Final[tuple[analytics.RainPeriod, ...]] = tuple(
+            analytics.rain_periods(index, index.start) if index else ()
+        )
+        self._period_starts: Final[tuple[int, ...]] = tuple(period.start for period in self.periods)
+        self._period_stops: Final[tuple[int, ...]] = tuple(period.stop for period in self.periods)
+        # Evalueer binnen de bin (t + 1), niet op de grens: daar tellen de vensters een bin extra.
+        # state_at geeft ook op de grens zelf deze state, zoals bin_at.
+        self.timeline: Final[tuple[dict[str, object], ...]] = tuple(
+            compute_state(index, self.nowcastmessage, ts + 1, tz, self.codes, self.language)
+            for ts in index.timestamps
+        )
+
+    @classmethod
+    def from_payload(
+        cls,
+        payload: object,
+        tz: tzinfo = timezone.utc,
+        retrieved_at: datetime | None = None,
+        language: str | None = None,
+        classifier: PrecipitationClassifier = DEFAULT_CLASSIFIER,
+    ) -> ForecastSnapshot:
+        """Build index and timeline from the raw API payload."""
+        nowcast: dict[str, str] = {}
+        raw = payload.get("nowcastmessage") if isinstance(payload, dict) else None
+        if isinstance(raw, dict):
+            nowcast = {lang: msg for lang, msg in raw.items() if isinstance(msg, str)}
+        snapshot = cls(ForecastIndex.from_payload(payload), nowcast, tz, retrieved_at, language, classifier)
+        _LOGGER.debug("[SNAPSHOT] Timeline built for %d bins", len(snapshot.timeline))
+        return snapshot
+
+    @classmethod
+    def empty(cls) -> ForecastSnapshot:
+        """Return a snapshot without forecast data."""
+        return cls(ForecastIndex((), (), ()), {}, timezone.utc)
+
+    def state_at(self, ts: float) -> Mapping[str, object]:
+        """Return all sensor values at *ts*; an index lookup inside the forecast."""
+        i = self.index.bin_at(ts)
+        if i is not None:
+            return self.timeline[i]
+        return compute_state(self.index, self.nowcastmessage, ts, self.tz, self.codes, self.language)
+
+    def evaluated_at(self, ts: float) -> float:
+        """Return the moment ``state_at(ts)`` is evaluated: ``t + 1`` inside bin ``t``, else *ts*."""
+        i = self.index.bin_at(ts)
+        return self.index.timestamps[i] + 1 if i is not None else ts
+
+    def periods_between(self, start: float, end: float) -> tuple[analytics.RainPeriod, ...]:
+        """Return the rain periods overlapping ``[start, end)`` with two bisects."""
+        lo = bisect_right(self._period_stops, start)
+        hi = bisect_left(self._period_starts, end)
+        return self.periods[lo:hi]
+
+    def as_compact(self) -> dict[str, object]:
+        """Return the forecast as plain data with one ``[t, rate, type]`` row per bin."""
+        return {
+            "retrieved_at": self.retrieved_at.isoformat() if self.retrieved_at else None,
+            "horizon": self.index.end,
+            "nowcast": dict(self.nowcast),
+            "bins": _bins(self.index, range(len(self.index))),
+        }
+
+    def value_at(self, key: str, ts: float) -> object:
+        """Return the value of one sensor *key* at *ts*."""
+        state = self.state_at(ts)
+        if key == "next_precipitation":
+            return analytics.minutes_until(state[NEXT_PRECIPITATION_AT], ts)
+        if key == "precipitation_periods":
+            return len(state["precipitation_periods"])
+        return state.get(key)
+
+
+def _bins(index: ForecastIndex, positions: range | list[int]) -> list[list[object]]:
+    return [[index.timestamps[i], index.rates[i], index.types[i]] for i in positions]
+
+
+def compact_diff(old: ForecastSnapshot, new: ForecastSnapshot) -> dict[str, object]:
+    """Return what changed between two compact snapshots.
+
+    ``bins`` holds only the new or changed rows, keyed by their time;
+    rows before ``start`` or at/after ``horizon`` are dropped by the
+    receiver.  ``nowcast`` is only present when the messages changed.
+    """
+    previous = {ts: i for i, ts in enumerate(old.index.timestamps)}
+    changed = [
+        i
+        for i, ts in enumerate(new.index.timestamps)
+        if (j := previous.get(ts)) is None
+        or old.index.rates[j] != new.index.rates[i]
+        or old.index.types[j] != new.index.types[i]
+    ]
+    diff: dict[str, object] = {
+        "retrieved_at": new.retrieved_at.isoformat() if new.retrieved_at else None,
+        "start": new.index.start,
+        "horizon": new.index.end,
+        "bins": _bins(new.index, changed),
+    }
+    if new.nowcast != old.nowcast:
+        diff["nowcast"] = dict(new.nowcast)
+    return diff
@@ -0,0 +1,38 @@
+"""Diagnostics support for the Buienalarm integration."""
+# diagnostics.py
+from __future__ import annotations
+
+from typing import Final
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import BuienalarmDataUpdateCoordinator
+
+TO_REDACT: Final[set[str]] = {CONF_LATITUDE, CONF_LONGITUDE, "location_name", "place"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, object]:
+    """Return the diagnostics of one config entry."""
+    coordinator: BuienalarmDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    index = coordinator.snapshot.index
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_fetch": coordinator.api_last_updated.isoformat() if coordinator.api_last_updated else None,
+            "cache_age": coordinator.cache_age,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "forecast_bins": len(index),
+            "forecast_periods": len(coordinator.snapshot.periods),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "spans": coordinator.spans.summary(),
+    }
@@ -2,13 +2,13 @@
 # entity.py
 
 import logging
-import re
 from collections.abc import Mapping
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Callable, Final
 
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -18,13 +18,12 @@ from homeassistant.util import dt
 
 from .const import API_CONF_URL, DOMAIN, NAME
 from .coordinator import BuienalarmDataUpdateCoordinator
-
-MAX_DURATION_MINUTES = 120
+from .core.analytics import minutes_until
+from .core.forecast import data_points
+from .core.snapshot import NEXT_PRECIPITATION_AT
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
-_LOGGER.debug("[ENTITY] Start entity.py")
-
 
 class BuienalarmEntity(CoordinatorEntity):
     """A Home Assistant entity that provides current
@@ -42,13 +41,20 @@ class BuienalarmEntity(CoordinatorEntity):
         self._location_name: str = config_entry.data.get("location_name", "Unknown")
 
         # ========== Entity & unique‑id ==========
-        # -> sensor.<prefix>_<key>
-        self._attr_name = f"{NAME} {sensor_key}"
+        # -> sensor.<prefix>_<key>; vertaalde namen komen uit translations/*.json
+        if self.translation_key is None:
+            self._attr_name = f"{NAME} {sensor_key}"
         # -> <config_entry.unique_id>_<key>   (falls back to entry‑id)
         base = config_entry.unique_id or config_entry.entry_id
         self._attr_unique_id = f"{base}_{sensor_key}"
         # =======================================
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and count it in the metrics of the entry."""
+        self.coordinator.metrics.entity_writes += 1
+        super().async_write_ha_state()
+
     @property
     def data(self) -> dict[str, object]:
         """Convenience property to access coordinator data."""
@@ -83,9 +89,7 @@ class BuienalarmEntity(CoordinatorEntity):
             'precipitationrate_now_desc': self.get_current_precipitation_rate_desc,
             'precipitationtype_now': self.get_current_precipitation_type,
             'next_precipitation': self.get_next_precipitation,
-            # TODO: implement periods in atrributes
-            "precipitation_periods": lambda: len(self.get_precipitation_periods_as_dict())
-            if self.get_precipitation_periods_as_dict() else 0,
+            "precipitation_periods": lambda: len(self.get_precipitation_periods_as_dict()),
             # 'precipitation_periods_as_list': self.get_precipitation_periods_as_list,
         }
 
@@ -114,13 +118,6 @@ class BuienalarmEntity(CoordinatorEntity):
         _LOGGER.warning("[BUIENALARM ENTITY] Key '%s' not found in data or methods", key)
         return None
 
-    def _ensure_precip_data(self) -> list[dict[str, object]]:
-        """Return precip list or raise ValueError for empty data."""
-        data = self.coordinator.data.get("data", [])
-        if not isinstance(data, list) or not data:
-            raise ValueError("Precipitation data missing or empty")
-        return data
-
     @property
     def unique_id(self) -> str:
         """Return a unique ID to use for this entity."""
@@ -149,27 +146,22 @@ class BuienalarmEntity(CoordinatorEntity):
         if not self.coordinator.data:
             return attributes
 
-        try:
-            attributes.update({
-                "location": self._location_name,
-                # "updated_at": self.coordinator.data.get("updated_at", "Unknown"),
-                "next_precipitation": self.get_next_precipitation(),
-                "precipitationrate_now": self.get_current_precipitation(),
-                "precipitationrate_now_desc": self.get_current_precipitation_rate_desc(),
-                "precipitationrate_hour": self.get_total_precipitation_rate_for_next_hour(),
-                "precipitationrate_total": self.get_total_precipitation_rate(),
-                "precipitation_duration": self.get_precipitation_duration(),
-                "precipitationtype_now": self.get_current_precipitation_type(),
-                "nowcastmessage": self.get_nowcastmessage(),
-                "mycastmessage": self.get_mycastmessage(),
-                "precipitation_periods": self.get_precipitation_periods_as_dict(),
-            })
-        except (KeyError, ValueError, TypeError) as err:
-            _LOGGER.error(
-                "[BUIENALARM ENTITY] Failed to build attributes for '%s': %s",
-                self.name,
-                err,
-            )
+        now = self._now()
+        state = self.coordinator.snapshot.state_at(now)
+        attributes.update({
+            "location": self._location_name,
+            # "updated_at": self.coordinator.data.get("updated_at", "Unknown"),
+            "next_precipitation": minutes_until(state[NEXT_PRECIPITATION_AT], now),
+            "precipitationrate_now": state["precipitationrate_now"],
+            "precipitationrate_now_desc": state["precipitationrate_now_desc"],
+            "precipitationrate_hour": state["precipitationrate_hour"],
+            "precipitationrate_total": state["precipitationrate_total"],
+            "precipitation_duration": state["precipitation_duration"],
+            "precipitationtype_now": state["precipitationtype_now"],
+            "nowcastmessage": state["nowcastmessage"],
+            "mycastmessage": state["mycastmessage"],
+            "precipitation_periods": state["precipitation_periods"],
+        })
 
         return attributes
 
@@ -184,85 +176,22 @@ class BuienalarmEntity(CoordinatorEntity):
         * ``timestamp`` – UNIX seconds since epoch (int | float | None)
         * ``time`` – *local* `datetime`
         """
-        raw_data: list[object] = []
-
-        if isinstance(self.coordinator.data, Mapping):
-            raw_data = self.coordinator.data.get("data") or []
-        else:
-            _LOGGER.debug(
-                "coordinator.data is not a mapping (type=%s): %s",
-                type(self.coordinator.data),
-                self.coordinator.data,
-            )
-
-        results: list[dict[str, str | int | float | None]] = []
-
-        for data_point in raw_data:
-            # ── verify we can safely call .get() ────────────────────────────────
-            if not isinstance(data_point, Mapping) and not hasattr(data_point, "get"):
-                _LOGGER.debug(
-                    "Skipping data point without 'get' attribute: %s",
-                    data_point,
-                )
-                continue
-            # -------------------------------------------------------------------
-
-            rate = data_point.get("precipitationrate")
-            ptype = data_point.get("precipitationtype")
-            ts = data_point.get("timestamp")
-            iso_time: str | None = data_point.get("time")
-
-            # Parse ISO time string defensively
-            parsed_time: datetime
-            if isinstance(iso_time, str):
-                try:
-                    parsed_time = datetime.fromisoformat(iso_time)
-                    if parsed_time.tzinfo is None:  # normalise to aware
-                        parsed_time = parsed_time.replace(tzinfo=timezone.utc)
-                except ValueError as exc:
-                    _LOGGER.debug("Invalid ISO time '%s': %s", iso_time, exc)
-                    parsed_time = datetime(1970, 1, 1, tzinfo=timezone.utc)
-            else:
-                parsed_time = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return [
+            {**point, "time": dt.as_local(point["time"])}
+            for point in data_points(self.coordinator.data)
+        ]
 
-            results.append(
-                {
-                    "precipitationrate": rate,
-                    "precipitationtype": ptype,
-                    "timestamp": ts,
-                    "time": dt.as_local(parsed_time),
-                }
-            )
+    def _now(self) -> float:
+        """Return the current time as epoch seconds (UTC)."""
+        return datetime.now(timezone.utc).timestamp()
 
-        return results
+    def _state(self) -> Mapping[str, object]:
+        """Return the precomputed sensor values for the current bin."""
+        return self.coordinator.snapshot.state_at(self._now())
 
     def get_nowcastmessage(self) -> str | None:
-        """Generate a user-friendly message for the current weather forecast."""
-        nowcastmessage = self.coordinator.data.get('nowcastmessage')
-        if nowcastmessage is None:
-            return None
-
-        if nowcastmessage is not None:
-            nowcastmessage_data = nowcastmessage["nl"]
-            if nowcastmessage_data:
-                # Define a regular expression pattern to match timestamps within curly braces
-                pattern = r'\{(\d+)\}'
-
-                # Find all matches in the input string
-                matches = re.findall(pattern, nowcastmessage_data)
-
-                # Convert the found timestamps to datetime in local time
-                datetimes_local = [
-                    dt.as_local(dt.utc_from_timestamp(int(timestamp)))
-                    for timestamp in matches
-                ]
-
-                # Replace the timestamp placeholders with formatted datetime strings
-                for timestamp, local_dt in zip(matches, datetimes_local):
-                    formatted_time = f"{local_dt.hour}:{local_dt.minute:02d}"  # Remove leading zero
-                    nowcastmessage_data = nowcastmessage_data.replace(f"{{{timestamp}}}", formatted_time)
-
-                return nowcastmessage_data
+        """Return the API message with its timestamps rendered as local time."""
+        return self._state()["nowcastmessage"]
 
     def timestamp_to_local(self, timestamp: float) -> datetime:
         """ Convert a Unix timestamp to local time."""
@@ -281,575 +210,52 @@ class BuienalarmEntity(CoordinatorEntity):
         return f"{local.hour}:{local.minute:02d}"
 
     def get_mycastmessage(self) -> str | None:
-        """Generate a user-friendly message for the precipitation forecast."""
-        rain_data: list[dict[str, int | float | datetime | None]] | None = self.coordinator.data.get('data')
-
-        if not rain_data:
-            return "Geen data"
-
-        rain_start_time, rain_stop_time, rain_restart_time, rain_duration, rain_stopped = self.get_rain_start_time_and_duration(
-            rain_data)
-
-        if rain_start_time is None:
-            _LOGGER.debug("[BUIENALARM ENTITY] rain_start_time is None")
-            return "Geen neerslag"
-
-        if rain_duration is None:
-            _LOGGER.debug("[BUIENALARM ENTITY] rain_duration is None")
-            return "Ongeldige rain_duration tijd"
-
-        _LOGGER.debug("[BUIENALARM ENTITY] Neerslag start om: %s",
-                      self.format_time(rain_start_time))
-        if rain_stop_time:
-            _LOGGER.debug("[BUIENALARM ENTITY] Neerslag stopt om: %s",
-                          self.format_time(rain_stop_time))
-        _LOGGER.debug("[BUIENALARM ENTITY] Neerslag duurt: %s minuten", rain_duration)
-        _LOGGER.debug("[BUIENALARM ENTITY] Neerslag gestopt: %s", rain_stopped)
-
-        # current_precipitation_rate, current_precipitation_type = self.get_current_precipitation()
-        current_precipitation_rate = self.get_current_precipitation()
-
-        if current_precipitation_rate > 0:
-            message_parts = [f"Neerslag duurt nog {rain_duration} minuten"]
-            if rain_stop_time:
-                message_parts.append(
-                    f"en stopt rond {self.format_time(rain_stop_time)}")
-            if rain_restart_time:
-                message_parts.append(
-                    f"en begint weer om {self.format_time(rain_restart_time)}")
-            return " ".join(message_parts)
-
-        now_utc = datetime.now(timezone.utc)
-
-        if rain_start_time > now_utc:
-            if rain_stop_time is None:
-                return f"Neerslag voor langere tijd begint om {self.format_time(rain_start_time)}"
-            return f"Neerslag begint om {self.format_time(rain_start_time)} en duurt {rain_duration} minuten"
-        return f"Er wordt regen verwacht om {self.format_time(rain_start_time)} en duurt {rain_duration} minuten"
-
-    def old_get_precipitation_duration(self) -> int:
-        """ Get the duration of the current precipitation event in minutes. """
-        precip_data = self._ensure_precip_data()
-
-        # Check if the data is not empty and is in the expected format
-        if not precip_data or not all(isinstance(entry, dict) for entry in precip_data):
-            _LOGGER.error("[BUIENALARM ENTITY] Invalid or missing precipitation data")
-            return 0
-            # raise ValueError("Invalid or missing precipitation data")
-
-        current_time: datetime = datetime.now(timezone.utc)
-        precip_started: bool = False
-        start_time: datetime | None = None
-
-        for data_point in precip_data:
-            timestamp = data_point.get("timestamp")
-            if timestamp is None:
-                _LOGGER.debug("Skipping precipitation entry without timestamp")
-                continue
-                # raise ValueError("Missing timestamp in precipitation data")
-            data_point_time: datetime = datetime.fromtimestamp(
-                timestamp, tz=timezone.utc)
-            precip_rate = float(data_point.get("precipitationrate", 0))
-
-            # Check if the current time is within the data point
-            if data_point_time > current_time:
-                if precip_rate > 0:
-                    # Precipitation has started or ongoing
-                    precip_started = True
-                    if start_time is None:
-                        start_time = data_point_time
-                elif precip_started:
-                    # Precipitation has reached 0
-                    if start_time is None:
-                        raise ValueError(
-                            "Precipitation start time is not set.")
-                    precip_duration: float = (
-                        data_point_time - start_time).total_seconds() / 60
-                    return min(MAX_DURATION_MINUTES, int(round(precip_duration)))
-                else:
-                    return 0
-
-        # If we reach here, there is no ongoing precipitation
-        return 0
-
-    def get_precipitation_duration(self) -> int:
-        """Return the duration of the current precipitation event in minutes."""
-        precip_data: list[dict[str, float]] = self._ensure_precip_data()
-
-        if not precip_data:
-            _LOGGER.debug("No precipitation data available")
-            return 0
-
-        current_time: datetime = datetime.now(timezone.utc)
-        start_time: datetime | None = None
-        last_time: datetime | None = None  # Track last processed forecast point
-
-        for entry in precip_data:
-            timestamp = entry.get("timestamp")
-            if timestamp is None:
-                _LOGGER.debug("Skipping precipitation entry without timestamp")
-                continue
-
-            data_point_time = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-            precip_rate = float(entry.get("precipitationrate", 0))
-
-            if data_point_time <= current_time:
-                continue
+        """Return a user-friendly message for the precipitation forecast."""
+        return self._state()["mycastmessage"]
 
-            last_time = data_point_time  # Update on every valid future point
-
-            if precip_rate > 0:
-                if start_time is None:
-                    start_time = data_point_time
-            else:
-                if start_time is not None:
-                    duration = (data_point_time - start_time).total_seconds() / 60
-                    return min(MAX_DURATION_MINUTES, int(round(duration)))
-                return 0
-
-        # Precipitation continued through all forecast points
-        if start_time is not None and last_time is not None:
-            duration = (last_time - start_time).total_seconds() / 60
-            return min(MAX_DURATION_MINUTES, int(round(duration)))
-
-        return 0
-
-    def _validate_timestamps(self, start_time: datetime, end_time: datetime) -> None:
-        """Validate that *start_time* and *end_time* are timezone‑aware and in order.
-
-        Raises
-        ------
-        ValueError
-            If either datetime lacks *tzinfo* or if *start_time* > *end_time*.
-        """
-        if start_time.tzinfo is None or end_time.tzinfo is None:
-            raise ValueError(
-                "start_time and end_time must be timezone‑aware datetime objects."
-            )
-        if start_time > end_time:
-            raise ValueError("start_time must be earlier than or equal to end_time.")
-
-    def _filter_data_by_time(
-        self,
-        data: list[dict[str, object]],
-        start_time: datetime,
-        end_time: datetime,
-    ) -> list[dict[str, object]]:
-        """
-        Return data points whose UNIX ``timestamp`` is between *start_time*
-        and *end_time* (both inclusive).
-
-        Parameters
-        ----------
-        data
-            Sequence of dicts containing a numeric ``timestamp`` key (seconds since epoch).
-        start_time, end_time
-            Inclusive time bounds. **Must** be timezone‑aware.
-
-        Raises
-        ------
-        ValueError
-            If inputs fail validation.
-
-        Returns
-        -------
-        list[dict[str, object]]
-            Filtered list, preserving the original ordering.
-        """
-        self._validate_timestamps(start_time, end_time)
-        start_utc: datetime = start_time.astimezone(timezone.utc)
-        end_utc: datetime = end_time.astimezone(timezone.utc)
-
-        filtered: list[dict[str, object]] = []
-        for data_point in data:
-            # ── NEW: verify the object is dict‑like ───────────────────────────────
-            if not isinstance(data_point, Mapping) and not hasattr(data_point, "get"):
-                _LOGGER.debug(
-                    "Skipping non‑mapping data point (no 'get' attribute): %s",
-                    data_point,
-                )
-                continue
-            # ---------------------------------------------------------------------
-
-            ts = data_point.get("timestamp")
-            if ts is None:
-                _LOGGER.debug(
-                    "Skipping data point without 'timestamp': %s", data_point
-                )
-                continue
-            if not isinstance(ts, (int, float)):
-                _LOGGER.debug(
-                    "Skipping data point with non‑numeric 'timestamp': %s", data_point
-                )
-                continue
-
-            point_time: datetime = datetime.fromtimestamp(ts, tz=timezone.utc)
-            if start_utc <= point_time <= end_utc:
-                # mypy: safe because we've validated Mapping presence
-                filtered.append(data_point)
-
-        return filtered
-
-    def calculate_total_precipitation_rate(
-        self,
-        data: list[dict[str, object]],
-        start_time: datetime,
-        end_time: datetime
-    ) -> float:
-        filtered_data = self._filter_data_by_time(data, start_time, end_time)
-
-        if not filtered_data:
-            return 0.0
-
-        total_precipitation_rates = [
-            data_point.get("precipitationrate", 0) for data_point in filtered_data
-        ]
-
-        total_time_seconds = (end_time - start_time).total_seconds()
-        if total_time_seconds <= 0:
-            return 0.0
-
-        # Gemiddelde per uur
-        average_precipitation_rate = sum(
-            total_precipitation_rates) / (total_time_seconds / 3600)
-        return round(average_precipitation_rate, 1)
+    def get_precipitation_duration(self) -> int | None:
+        """Return the duration of the next precipitation event in minutes."""
+        return self._state()["precipitation_duration"]
 
     def get_total_precipitation_rate(self) -> float:
-        """ Get total precipitation rate rounded to one decimal place for the next 2 hours """
-        data: list[dict[str, object]] = self.coordinator.data.get('data', [])
-        current_time: datetime = datetime.now(timezone.utc)
-        end_time: datetime = current_time + timedelta(hours=2)
-        return self.calculate_total_precipitation_rate(data, current_time, end_time)
+        """Return the precipitation rate in mm/h for the next 2 hours."""
+        return self._state()["precipitationrate_total"]
 
     def get_total_precipitation_rate_for_next_hour(self) -> float:
-        """Calculate the total precipitation rate in mm/h for the upcoming hour."""
-        # Fetch the precipitation data; expecting a list of dictionaries
-        data: list[dict[str, object]] = self.coordinator.data.get('data', [])
-        current_time: datetime = datetime.now(timezone.utc)  # Use UTC time
-        end_time: datetime = current_time + timedelta(hours=1)
-
-        _LOGGER.debug(
-            "[BUIENALARM ENTITY] Calculating total precipitation rate from %s to %s", current_time, end_time)
-
-        # Call the method to calculate the total precipitation rate
-        total_precipitation = self.calculate_total_precipitation_rate(
-            data, current_time, end_time)
-
-        _LOGGER.debug(
-            "[BUIENALARM ENTITY] Total precipitation rate for the next hour: %s mm/h", total_precipitation)
-        return total_precipitation
+        """Return the precipitation rate in mm/h for the upcoming hour."""
+        return self._state()["precipitationrate_hour"]
 
     def get_current_precipitation(self) -> float:
-        """Get the current precipitation rate."""
-        data: list[dict[str, object]] = self.coordinator.data.get('data', [])
-        current_time: datetime = datetime.now(timezone.utc)
-        current_precipitation_rate: float = 0.0
-        current_precipitation_type: str = '-'
-
-        if data is not None:
-            for data_point in data:
-                timestamp = data_point.get("timestamp")
-                precipitation_rate = data_point.get("precipitationrate")
-                precipitation_type = data_point.get("precipitationtype")
-
-                if timestamp is not None and precipitation_rate is not None and precipitation_type is not None:
-                    if isinstance(data_point, dict):
-                        data_point_timestamp = datetime.fromtimestamp(
-                            timestamp, tz=timezone.utc)
-                        _LOGGER.debug(
-                            "[BUIENALARM ENTITY] Checking data point at %s with precipitation rate %s and type %s",
-                            data_point_timestamp, precipitation_rate, precipitation_type
-                        )
-                    else:
-                        _LOGGER.error(
-                            "[BUIENALARM ENTITY] Data point is not a dictionary: %s", data_point)
-                        continue
-
-                    # Check if the current time is within the data point and the next 5 minutes
-                    if data_point_timestamp < current_time < data_point_timestamp + timedelta(minutes=5):
-                        current_precipitation_rate = float(precipitation_rate)
-                        current_precipitation_type = str(precipitation_type)
-
-                        return current_precipitation_rate  # , current_precipitation_type
-        return current_precipitation_rate
-
-    NO_PRECIPITATION = "Geen neerslag"
-
-    PRECIPITATION_RAIN_CATEGORIES: Final[list[tuple[float, str]]] = [
-        (15.0, "Heel zware regen"),
-        (7.5, "Zware regen"),
-        (2.0, "Matige regen"),
-        (1.0, "Lichte regen"),
-        (0.0, "Motregen"),
-    ]
-
-    PRECIPITATION_SNOW_CATEGORIES: Final[list[tuple[float, str]]] = [
-        (15.0, "Heel zware sneeuw"),
-        (7.5, "Zware sneeuw"),
-        (2.0, "Matige sneeuw"),
-        (1.0, "Lichte sneeuw"),
-        (0.0, "Motsneeuw"),
-    ]
-
-    PRECIPITATION_RAIN_SNOW_CATEGORIES: Final[list[tuple[float, str]]] = [
-        (15.0, "Heel zware regen en sneeuw"),
-        (7.5, "Zware regen en sneeuw"),
-        (2.0, "Matige regen en sneeuw"),
-        (1.0, "Lichte regen en sneeuw"),
-        (0.0, "Natte sneeuw"),
-    ]
+        """Return the current precipitation rate."""
+        return self._state()["precipitationrate_now"]
 
     def get_current_precipitation_rate_desc(self) -> str:
-        """Get the description of the current precipitation rate."""
-        data: list[dict[str, object]] = self.coordinator.data.get('data', [])
-        current_time: datetime = datetime.now(timezone.utc)
-        current_precipitation_rate_desc: str = self.NO_PRECIPITATION
-
-        # Log the current time for debugging
-        _LOGGER.debug("[BUIENALARM ENTITY] Current time for precipitation check: %s", current_time)
-
-        for data_point in data:
-            data_point_timestamp = datetime.fromtimestamp(
-                data_point.get("timestamp", 0), tz=timezone.utc)
-            five_minutes_later = data_point_timestamp + timedelta(minutes=5)
-
-            # Check if the current time is within the range of this data point
-            if data_point_timestamp < current_time < five_minutes_later:
-                current_precipitation_rate: float = data_point.get(
-                    "precipitationrate", 0.0)
-                current_precipitation_type: str = data_point.get(
-                    "precipitationtype", self.NO_PRECIPITATION)
-
-                categories = self.PRECIPITATION_RAIN_CATEGORIES
-                if current_precipitation_type == "snow":
-                    categories = self.PRECIPITATION_SNOW_CATEGORIES
-                elif current_precipitation_type == "mix of rain and snow":
-                    categories = self.PRECIPITATION_RAIN_SNOW_CATEGORIES
-
-                # Log the found precipitation type and rate for debugging
-                _LOGGER.debug(
-                    "[BUIENALARM ENTITY] Found precipitation type: %s with rate: %s",
-                    current_precipitation_type, current_precipitation_rate
-                )
-
-                for threshold, category in categories:
-                    if current_precipitation_rate > threshold:
-                        current_precipitation_rate_desc = category
-                        _LOGGER.debug(
-                            "[BUIENALARM ENTITY] Current precipitation rate description: %s",
-                            current_precipitation_rate_desc
-                        )
-                        return current_precipitation_rate_desc  # Early return if found
-
-        return current_precipitation_rate_desc
+        """Return the description of the current precipitation rate."""
+        return self._state()["precipitationrate_now_desc"]
 
     def get_current_precipitation_type(self) -> str:
-        """Get the type of current precipitation (rain, snow, etc.)."""
-        precipitation_data: list[dict[str, object]] = self.coordinator.data.get("data", [])
-        current_time: datetime = datetime.now(timezone.utc)
-        current_type: str = self.NO_PRECIPITATION
-
-        for data_point in precipitation_data:
-            timestamp = data_point.get("timestamp", 0.0)
-            data_point_timestamp: datetime = datetime.fromtimestamp(
-                timestamp, tz=timezone.utc)
-            five_minutes_later: datetime = data_point_timestamp + \
-                timedelta(minutes=5)
-
-            if data_point_timestamp < current_time < five_minutes_later:
-                current_rate: float = data_point.get("precipitationrate", 0)
-                if current_rate > 0:
-                    current_type = data_point.get("precipitationtype", "-")
-                    if current_type == "rain":
-                        return "Regen"
-                    elif current_type == "freezing rain":
-                        return "Ijzel"
-                    elif current_type == "snow":
-                        return "Sneeuw"
-                    elif current_type == "mix" or current_type == "mix of rain and snow":
-                        return "Mix van regen en sneeuw"
-
-        return current_type
+        """Return the type of current precipitation (rain, snow, etc.)."""
+        return self._state()["precipitationtype_now"]
 
     def get_next_precipitation(self) -> int | None:
         """
         Return the number of **minutes from now** until the next precipitation event.
 
         Returns:
-            int | None: 
+            int | None:
                 - Returns 0 if precipitation is occurring now.
                 - Returns the number of minutes until the next precipitation bin.
                 - Returns None if no data is available or no precipitation is expected.
         """
-        current_precipitation_rate = self.get_current_precipitation()
-        if current_precipitation_rate > 0:
-            _LOGGER.debug(
-                "[BUIENALARM ENTITY] Precipitation is currently occurring for %s",
-                self.name,
-            )
-            return 0
-
-        precip_data: list[dict[str, object]] = self.coordinator.data.get("data", [])
-
-        # ── quick sanity‑check ────────────────────────────────────────────────
-        if not precip_data:
-            _LOGGER.warning(
-                "[BUIENALARM ENTITY] No precipitation data available for %s",
-                self.name,
-            )
-            return None
-        # ---------------------------------------------------------------------
-
-        now_utc: datetime = datetime.now(timezone.utc)
-
-        for data_point in precip_data:
-            # Forecast points are 5‑minute bins.
-            ts_raw: object = data_point.get("timestamp")
-
-            # Skip if timestamp is missing or malformed
-            if not isinstance(ts_raw, (int, float)):
-                _LOGGER.debug(
-                    "[BUIENALARM ENTITY] Skipping invalid timestamp (type=%s) for %s: %s",
-                    type(ts_raw).__name__,
-                    self.name,
-                    ts_raw,
-                )
-                continue
-
-            try:
-                ts: float = float(ts_raw)
-            except (TypeError, ValueError):
-                _LOGGER.debug(
-                    "[BUIENALARM ENTITY] Skipping unparsable timestamp for %s: %s",
-                    self.name,
-                    ts_raw,
-                )
-                continue
-
-            # Extract and validate precipitation rate
-            raw_rate: object = data_point.get("precipitationrate", 0.0)
-
-            if not isinstance(raw_rate, (int, float, str)):
-                _LOGGER.debug(
-                    "[BUIENALARM ENTITY] Skipping invalid precipitation rate (type=%s) for %s: %s",
-                    type(raw_rate).__name__,
-                    self.name,
-                    raw_rate,
-                )
-                rate: float = 0.0
-            else:
-                try:
-                    rate: float = float(raw_rate)
-                except (TypeError, ValueError):
-                    _LOGGER.debug(
-                        "[BUIENALARM ENTITY] Failed to parse precipitation rate for %s: %s",
-                        self.name,
-                        raw_rate,
-                    )
-                    rate = 0.0
-
-            point_time: datetime = datetime.fromtimestamp(ts, tz=timezone.utc)
-            _LOGGER.debug(
-                "[BUIENALARM ENTITY] Parsed timestamp for %s: %s",
-                self.name,
-                point_time.isoformat(),
-            )
-
-            # Ignore any point that lies in the past
-            if point_time < now_utc:
-                continue
-
-            if rate > 0:
-                # Found the first future bin with precipitation
-                delta_minutes: int = int(round((point_time - now_utc).total_seconds() / 60))
-                _LOGGER.debug(
-                    "[BUIENALARM ENTITY] Next precipitation for %s in %d min (rate=%.2f mm/h)",
-                    self.name,
-                    delta_minutes,
-                    rate,
-                )
-                # Avoid returning negative minutes due to clock skew or rounding
-                return max(delta_minutes, 0)
-
-        # No future precipitation found in dataset
-        _LOGGER.debug(
-            "[BUIENALARM ENTITY] No precipitation expected in current forecast for %s (%d forecast bins checked)",
-            self.name,
-            len(precip_data),
-        )
-        return None
+        return self.coordinator.snapshot.value_at("next_precipitation", self._now())
 
     def check_rain_data_validity(self) -> bool:
         """Check if the precipitation data is valid and non-empty."""
-        precipitation_data = self.coordinator.data.get('data')
-
-        # Log the retrieved precipitation data for debugging purposes
-        _LOGGER.debug("[BUIENALARM ENTITY] Retrieved precipitation data: %s", precipitation_data)
-
-        if not precipitation_data:
+        if not self.coordinator.snapshot.index:
             _LOGGER.warning("[BUIENALARM ENTITY] Precipitation data is invalid or empty.")
             return False
-
-        _LOGGER.info("[BUIENALARM ENTITY] Precipitation data is valid.")
         return True
 
-    RAIN_INTERVAL_MINUTES = 5
-
-    def get_rain_start_time_and_duration(
-        self, precipitation_data: list[dict[str, object]]
-    ) -> tuple[datetime | None, datetime | None, datetime | None, int, bool]:
-        """Calculate the start time and duration of rain from the precipitation data."""
-        current_time_utc: datetime = datetime.now(timezone.utc)
-        rain_start_time_utc: datetime | None = None
-        rain_stop_time_utc: datetime | None = None
-        rain_restart_time_utc: datetime | None = None
-        rain_duration: int = 0
-        rain_stopped: bool = True
-
-        for data_point in precipitation_data:
-            timestamp = data_point.get("timestamp")
-            precipitation_rate = data_point.get("precipitationrate", 0.0)
-
-            if timestamp is None:
-                continue  # Skip invalid entries
-
-            data_point_timestamp = datetime.fromtimestamp(timestamp,
-                                                          tz=timezone.utc)
-
-            # Check if there's precipitation at this data point and it's later than the current time
-            if data_point_timestamp >= current_time_utc:
-                if precipitation_rate > 0:
-                    rain_stopped = False
-                    if rain_start_time_utc is None:
-                        rain_start_time_utc = data_point_timestamp
-                    if rain_stop_time_utc is None:
-                        rain_duration += 5
-                        rain_stopped = False
-                    if rain_restart_time_utc is None and rain_stop_time_utc is not None:
-                        rain_restart_time_utc = data_point_timestamp
-                # Check if there's a gap in precipitation
-                elif rain_start_time_utc is not None and rain_stop_time_utc is None:
-                    rain_stop_time_utc = data_point_timestamp
-                    rain_stopped = True
-
-        # Calculate rain duration if precipitation has started
-        if rain_start_time_utc is not None:
-            if rain_stop_time_utc is not None:
-                rain_duration = int((rain_stop_time_utc -
-                                     rain_start_time_utc).total_seconds() / 60)
-            else:
-                # Rain has started but no explicit stop time, use end of data time
-                end_of_data_timestamp = precipitation_data[-1].get("timestamp")
-                if end_of_data_timestamp is not None:
-                    end_of_data_time = datetime.fromtimestamp(
-                        end_of_data_timestamp, tz=timezone.utc)
-                    rain_duration = int((end_of_data_time -
-                                         rain_start_time_utc).total_seconds()
-                                        / 60)
-            rain_duration = int(rain_duration)
-
-        return rain_start_time_utc, rain_stop_time_utc, rain_restart_time_utc, rain_duration, rain_stopped
-
     def get_precipitation_periods_as_dict(self) -> list[dict[str, str | int | float | None]]:
         """
         Geef toekomstige neerslagperiodes terug als een lijst van dicts met ISO 8601 timestamps.
@@ -861,149 +267,7 @@ class BuienalarmEntity(CoordinatorEntity):
                 - duration (int|None): duur van de periode in minuten
                 - precipitationrate (float|None): gemiddelde neerslagsnelheid in mm/u
         """
-        precipitation_data: object = self.coordinator.data.get("data")
-        periods_list: list[dict[str, str | int | float | None]] = []
-
-        if not isinstance(precipitation_data, list):
-            _LOGGER.warning("[BUIENALARM ENTITY] 'data' ontbreekt of is geen lijst voor '%s'", self.name)
-            return periods_list
-
-        try:
-            precipitation_periods = self._get_precipitation_periods()
-        except Exception as err:
-            _LOGGER.error(
-                "[BUIENALARM ENTITY] Fout bij ophalen van neerslagperiodes voor '%s': %s",
-                self.name,
-                err,
-            )
-            return periods_list
-
-        if not precipitation_periods:
-            return periods_list
-
-        for period in precipitation_periods:
-            periods_list.append(
-                {
-                    "start": period["start"].isoformat() if period.get("start") else None,
-                    "stop": period["stop"].isoformat() if period.get("stop") else None,
-                    "duration": period.get("duration_minutes"),
-                    "precipitationrate": period.get("precipitationrate"),
-                }
-            )
-
-        return periods_list
-
-    def _get_precipitation_periods(self) -> list[dict[str, object]]:
-        """
-        Bepaal toekomstige neerslagperiodes op basis van neerslagdata.
-
-        De coordinator bevat ruwe API-data als een lijst van dicts met de keys:
-            - 'timestamp' (int|float): UNIX epoch in seconden
-            - 'precipitationrate' (float): neerslagsnelheid in mm/u
-
-        Alleen toekomstige datapunten worden meegenomen.
-
-        Returns:
-            list[dict[str, object]]: Een lijst met dicts per neerslagperiode:
-                - start (datetime): starttijd in lokale tijd
-                - stop (datetime): stoptijd in lokale tijd
-                - duration_minutes (int): duur van de periode in minuten
-                - precipitationrate (float): gemiddelde neerslagsnelheid in mm/u
-        """
-        precipitation_data: list[object] = self.coordinator.data.get("data", [])
-        now_utc = datetime.now(timezone.utc)
-
-        if not isinstance(precipitation_data, list):
-            _LOGGER.warning("[BUIENALARM ENTITY] 'data' is geen lijst voor '%s'", self.name)
-            return []
-
-        _LOGGER.debug("[BUIENALARM ENTITY] Verwerken van %d datapunt(en) voor neerslagperiodes", len(precipitation_data))
-        _LOGGER.debug("[BUIENALARM ENTITY] Ruwe neerslagdata: %s", precipitation_data)
-
-        precipitation_periods_internal: list[tuple[datetime, datetime, list[float]]] = []
-        in_precipitation = False
-        precipitation_start: datetime | None = None
-        current_rates: list[float] = []
-
-        for i, item in enumerate(precipitation_data):
-            if not isinstance(item, dict):
-                _LOGGER.warning("[BUIENALARM ENTITY] Ongeldig datapunt op index %d: geen dict", i)
-                continue
-
-            raw_timestamp = item.get("timestamp")
-            raw_precipitation = item.get("precipitationrate")
-
-            if raw_timestamp is None or raw_precipitation is None:
-                _LOGGER.warning(
-                    "[BUIENALARM ENTITY] Ontbrekende keys of None-waarde op index %d: %s",
-                    i,
-                    list(item.keys()),
-                )
-                continue
-
-            if not isinstance(raw_timestamp, (int, float)):
-                _LOGGER.warning("[BUIENALARM ENTITY] Ongeldige timestamp op index %d: %s", i, raw_timestamp)
-                continue
-
-            try:
-                precipitation_rate = float(raw_precipitation)
-            except (TypeError, ValueError):
-                _LOGGER.warning(
-                    "[BUIENALARM ENTITY] Ongeldige neerslagwaarde op index %d: %s",
-                    i,
-                    raw_precipitation,
-                )
-                continue
-
-            data_time = datetime.fromtimestamp(raw_timestamp, tz=timezone.utc)
-            if data_time < now_utc:
-                continue  # negeer historische data
-
-            if precipitation_rate > 0:
-                current_rates.append(precipitation_rate)
-                if not in_precipitation:
-                    precipitation_start = data_time
-                    in_precipitation = True
-            else:
-                if in_precipitation and precipitation_start is not None and current_rates:
-                    precipitation_periods_internal.append((precipitation_start, data_time, current_rates.copy()))
-                    current_rates.clear()
-                    precipitation_start = None
-                    in_precipitation = False
-
-        # sluit eventueel laatste lopende bui af
-        if in_precipitation and precipitation_start is not None and current_rates:
-            last_valid = next(
-                (
-                    d
-                    for d in reversed(precipitation_data)
-                    if isinstance(d, dict) and isinstance(d.get("timestamp"), (int, float))
-                ),
-                None,
-            )
-            if last_valid:
-                last_time = datetime.fromtimestamp(last_valid["timestamp"], tz=timezone.utc)
-                precipitation_periods_internal.append((precipitation_start, last_time, current_rates.copy()))
-            current_rates.clear()
-
-        # omzetten naar HA-formaat met lokale tijd en gemiddelde neerslagsnelheid
-        precipitation_periods_ha: list[dict[str, object]] = []
-        for start_utc, stop_utc, rates in precipitation_periods_internal:
-            local_start = dt.as_local(start_utc)
-            local_stop = dt.as_local(stop_utc)
-            avg_rate = round(sum(rates) / len(rates), 2)
-            duration_minutes = int((stop_utc - start_utc).total_seconds() // 60)
-
-            precipitation_periods_ha.append(
-                {
-                    "start": local_start,
-                    "stop": local_stop,
-                    "duration_minutes": duration_minutes,
-                    "precipitationrate": avg_rate,
-                }
-            )
-
-        return precipitation_periods_ha
+        return self._state()["precipitation_periods"]
 
 
 class BuienalarmSensorEntity(CoordinatorEntity, SensorEntity):
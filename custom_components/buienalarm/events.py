@@ -0,0 +1,134 @@
+"""Rain onset/stop events scheduled from the Buienalarm forecast."""
+# events.py
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+
+from .const import EVENT_RAIN_EXPECTED, EVENT_RAIN_STARTED, EVENT_RAIN_STOPPED
+from .core.analytics import RainPeriod
+from .core.snapshot import ForecastSnapshot
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# Een verschuiving van de starttijd binnen deze marge is dezelfde bui
+_SAME_PERIOD_TOLERANCE: Final[int] = 15 * 60
+
+
+class RainEventScheduler:
+    """Fire ``buienalarm_rain_*`` events at the forecast times.
+
+    Every new snapshot cancels the pending timers and schedules new ones
+    from the rain periods of that snapshot.  A small state machine
+    (dry -> expected -> raining -> dry) makes sure that a stable or
+    slightly shifting forecast does not fire the same event twice.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        name: str,
+        lead: timedelta,
+    ) -> None:
+        self._hass: Final[HomeAssistant] = hass
+        self._entry_id: Final[str] = entry_id
+        self._name: Final[str] = name
+        self._lead: Final[timedelta] = lead
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._raining: bool = False
+        self._expected_start: int | None = None
+
+    @callback
+    def async_schedule(self, snapshot: ForecastSnapshot) -> None:
+        """Replace all pending timers with those of *snapshot*."""
+        self.async_cancel()
+        now = datetime.now(timezone.utc).timestamp()
+        index = snapshot.index
+
+        upcoming = [period for period in snapshot.periods if period.stop > now]
+        active = upcoming[0] if upcoming and upcoming[0].start <= now else None
+
+        if active is None and self._raining:
+            # De nieuwe verwachting is nu droog: de bui is voorbij
+            self._async_fire(EVENT_RAIN_STOPPED, None)
+        elif active is not None and not self._raining:
+            # Bij opstarten midden in een bui geen "started" achteraf
+            self._raining = True
+
+        if not upcoming:
+            self._expected_start = None
+
+        for period in upcoming:
+            open_ended = period.stop == index.timestamps[-1] and index.rates[-1] > 0
+            if period.start > now:
+                self._async_track(period.start - self._lead.total_seconds(), EVENT_RAIN_EXPECTED, period)
+                self._async_track(period.start, EVENT_RAIN_STARTED, period)
+            if not open_ended:
+                self._async_track(period.stop, EVENT_RAIN_STOPPED, period)
+
+        _LOGGER.debug(
+            "[EVENTS] %d rain period(s) scheduled for %s (raining=%s)",
+            len(upcoming),
+            self._name,
+            self._raining,
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel all pending timers."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def _async_track(self, ts: float, event_type: str, period: RainPeriod) -> None:
+        """Fire *event_type* at *ts*, or right away if that moment has passed."""
+        point = datetime.fromtimestamp(ts, tz=timezone.utc)
+        if point <= datetime.now(timezone.utc):
+            self._async_fire(event_type, period)
+            return
+
+        @callback
+        def _fire(_now: datetime) -> None:
+            self._async_fire(event_type, period)
+
+        self._unsubs.append(async_track_point_in_utc_time(self._hass, _fire, point))
+
+    @callback
+    def _async_fire(self, event_type: str, period: RainPeriod | None) -> None:
+        """Fire *event_type* unless the state machine says it already happened."""
+        if event_type == EVENT_RAIN_EXPECTED:
+            if self._raining or period is None:
+                return
+            if (
+                self._expected_start is not None
+                and abs(period.start - self._expected_start) <= _SAME_PERIOD_TOLERANCE
+            ):
+                return
+            self._expected_start = period.start
+        elif event_type == EVENT_RAIN_STARTED:
+            if self._raining:
+                return
+            self._raining = True
+            self._expected_start = None
+        elif event_type == EVENT_RAIN_STOPPED:
+            if not self._raining:
+                return
+            self._raining = False
+
+        data: dict[str, object] = {"entry_id": self._entry_id, "name": self._name}
+        if period is not None:
+            data.update(
+                {
+                    "start": datetime.fromtimestamp(period.start, tz=timezone.utc).isoformat(),
+                    "stop": datetime.fromtimestamp(period.stop, tz=timezone.utc).isoformat(),
+                    "duration": period.duration_minutes,
+                    "precipitationrate": period.precipitationrate,
+                }
+            )
+        _LOGGER.debug("[EVENTS] Firing %s for %s: %s", event_type, self._name, data)
+        self._hass.bus.async_fire(event_type, data)
@@ -0,0 +1,253 @@
+"""Bounded in-memory metrics of the Buienalarm fetch and update pipeline."""
+# metrics.py
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from typing import Final
+
+# Aantal recente samples per histogram voor de percentielen
+HISTOGRAM_WINDOW: Final[int] = 128
+
+# Bucketgrenzen (inclusief bovengrens), oplopend
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # s
+CPU_BUCKETS: Final[tuple[float, ...]] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)  # s
+COUNT_BUCKETS: Final[tuple[float, ...]] = (0, 1, 2, 5, 10, 20, 50)
+SIZE_BUCKETS: Final[tuple[float, ...]] = (1024, 4096, 8192, 16384, 32768, 65536, 131072)  # bytes
+AGE_BUCKETS: Final[tuple[float, ...]] = (0, 15, 30, 60, 120, 300, 600)  # s
+
+
+class Histogram:
+    """Fixed-bucket histogram plus a ring buffer of the most recent samples.
+
+    All storage is allocated up front; ``observe`` only increments
+    counters and overwrites one slot of the ring buffer.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "last", "_window", "_next")
+
+    def __init__(self, bounds: Sequence[float], window: int = HISTOGRAM_WINDOW) -> None:
+        self.bounds: Final[tuple[float, ...]] = tuple(bounds)
+        # Laatste bucket is +Inf
+        self.counts: Final[list[int]] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.last: float | None = None
+        self._window: Final[array] = array("d", bytes(8 * window))
+        self._next = 0
+
+    def observe(self, value: float) -> None:
+        """Add one sample."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.last = value
+        self._window[self._next % len(self._window)] = value
+        self._next += 1
+
+    def recent(self) -> list[float]:
+        """Return the samples still in the ring buffer, oldest first."""
+        size = len(self._window)
+        if self._next <= size:
+            return self._window[: self._next].tolist()
+        split = self._next % size
+        return (self._window[split:] + self._window[:split]).tolist()
+
+    def as_dict(self) -> dict[str, object]:
+        """Return bucket counts, totals and percentiles of the recent samples."""
+        recent = sorted(self.recent())
+        result: dict[str, object] = {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {
+                **{f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+        if recent:
+            result.update(
+                p50=recent[len(recent) // 2],
+                p95=recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+                max=recent[-1],
+            )
+        return result
+
+
+class EntryMetrics:
+    """Metrics of one config entry, shared by its API client and coordinator."""
+
+    __slots__ = (
+        "fetch_latency",
+        "decode_time",
+        "processing_time",
+        "snapshot_build",
+        "state_writes",
+        "payload_size",
+        "cache_age",
+        "fetches",
+        "failures",
+        "statuses",
+        "failure_streak",
+        "upstream_cache_hits",
+        "skipped_writes",
+        "entity_writes",
+        "poll_interval",
+    )
+
+    def __init__(self) -> None:
+        self.fetch_latency: Final[Histogram] = Histogram(LATENCY_BUCKETS)
+        self.decode_time: Final[Histogram] = Histogram(CPU_BUCKETS)
+        self.processing_time: Final[Histogram] = Histogram(CPU_BUCKETS)
+        self.snapshot_build: Final[Histogram] = Histogram(CPU_BUCKETS)
+        self.state_writes: Final[Histogram] = Histogram(COUNT_BUCKETS)
+        self.payload_size: Final[Histogram] = Histogram(SIZE_BUCKETS)
+        self.cache_age: Final[Histogram] = Histogram(AGE_BUCKETS)
+        self.fetches = 0
+        self.failures = 0
+        # HTTP-status of "timeout"/"error"/"invalid_json" -> aantal
+        self.statuses: Final[dict[int | str, int]] = {}
+        self.failure_streak = 0
+        # Antwoorden met Age > 0 kwamen uit de cache van de upstream CDN
+        self.upstream_cache_hits = 0
+        self.skipped_writes = 0
+        # Alle async_write_ha_state-aanroepen van de entities van deze entry
+        self.entity_writes = 0
+        self.poll_interval = 0.0
+
+    def fetch_succeeded(self, latency: float, decode: float, size: int, cache_age: int) -> None:
+        """Record one successful fetch."""
+        self.fetches += 1
+        self.failure_streak = 0
+        self.statuses[200] = self.statuses.get(200, 0) + 1
+        self.fetch_latency.observe(latency)
+        self.decode_time.observe(decode)
+        self.payload_size.observe(size)
+        self.cache_age.observe(cache_age)
+        if cache_age > 0:
+            self.upstream_cache_hits += 1
+
+    def fetch_failed(self, status: int | str) -> None:
+        """Record one failed fetch with its HTTP status or failure kind."""
+        self.fetches += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.failures += 1
+        self.failure_streak += 1
+
+    def as_dict(self) -> dict[str, object]:
+        """Return all metrics as plain data."""
+        successes = self.fetches - self.failures
+        return {
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "failure_streak": self.failure_streak,
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "upstream_cache_hit_ratio": round(self.upstream_cache_hits / successes, 3) if successes else None,
+            "skipped_writes": self.skipped_writes,
+            "poll_interval": self.poll_interval,
+            "fetch_latency_s": self.fetch_latency.as_dict(),
+            "decode_time_s": self.decode_time.as_dict(),
+            "processing_time_s": self.processing_time.as_dict(),
+            "snapshot_build_s": self.snapshot_build.as_dict(),
+            "state_writes": self.state_writes.as_dict(),
+            "payload_size_bytes": self.payload_size.as_dict(),
+            "cache_age_s": self.cache_age.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """In-process registry of the metrics of all loaded entries.
+
+    Only touched from the event loop, so no locking is needed: the API
+    clients and coordinators write, the metrics view reads.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Final[dict[str, EntryMetrics]] = {}
+
+    def register(self, entry_id: str) -> EntryMetrics:
+        """Return fresh metrics for *entry_id*, replacing any earlier ones."""
+        metrics = self._entries[entry_id] = EntryMetrics()
+        return metrics
+
+    def unregister(self, entry_id: str, metrics: EntryMetrics) -> None:
+        """Drop the metrics of an unloaded entry (if they are still current)."""
+        if self._entries.get(entry_id) is metrics:
+            del self._entries[entry_id]
+
+    def __iter__(self) -> Iterator[tuple[str, EntryMetrics]]:
+        return iter(list(self._entries.items()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+REGISTRY: Final[MetricsRegistry] = MetricsRegistry()
+
+_PREFIX: Final[str] = "buienalarm"
+
+# (naam, attribuut, help) per histogram
+_HISTOGRAMS: Final[tuple[tuple[str, str, str], ...]] = (
+    ("fetch_duration_seconds", "fetch_latency", "Time until the response body was read."),
+    ("decode_duration_seconds", "decode_time", "Time spent decoding the JSON body."),
+    ("processing_duration_seconds", "processing_time", "Time spent processing one fetch."),
+    ("snapshot_build_duration_seconds", "snapshot_build", "Time spent building the forecast snapshot."),
+    ("state_writes", "state_writes", "Entity state writes per listener update."),
+    ("payload_bytes", "payload_size", "Size of the response body."),
+    ("cache_age_seconds", "cache_age", "Upstream cache age (Age header) of the response."),
+)
+
+
+def _labels(entry_id: str, **extra: object) -> str:
+    labels = {"entry_id": entry_id, **extra}
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(registry: MetricsRegistry = REGISTRY) -> str:
+    """Render the registry in the Prometheus text exposition format (0.0.4)."""
+    entries = list(registry)
+    lines: list[str] = []
+
+    def _header(name: str, kind: str, text: str) -> str:
+        lines.append(f"# HELP {_PREFIX}_{name} {text}")
+        lines.append(f"# TYPE {_PREFIX}_{name} {kind}")
+        return f"{_PREFIX}_{name}"
+
+    metric = _header("requests_total", "counter", "Fetches by HTTP status or failure kind.")
+    for entry_id, metrics in entries:
+        for status, count in metrics.statuses.items():
+            lines.append(f"{metric}{_labels(entry_id, status=status)} {count}")
+
+    metric = _header("response_bytes_total", "counter", "Bytes received in response bodies.")
+    for entry_id, metrics in entries:
+        lines.append(f"{metric}{_labels(entry_id)} {metrics.payload_size.sum:g}")
+
+    metric = _header("upstream_cache_hits_total", "counter", "Responses served from the upstream cache.")
+    for entry_id, metrics in entries:
+        lines.append(f"{metric}{_labels(entry_id)} {metrics.upstream_cache_hits}")
+
+    metric = _header("skipped_writes_total", "counter", "Entity updates that skipped an unchanged state write.")
+    for entry_id, metrics in entries:
+        lines.append(f"{metric}{_labels(entry_id)} {metrics.skipped_writes}")
+
+    metric = _header("consecutive_failures", "gauge", "Failed fetches since the last success.")
+    for entry_id, metrics in entries:
+        lines.append(f"{metric}{_labels(entry_id)} {metrics.failure_streak}")
+
+    metric = _header("poll_interval_seconds", "gauge", "Configured update interval.")
+    for entry_id, metrics in entries:
+        lines.append(f"{metric}{_labels(entry_id)} {metrics.poll_interval:g}")
+
+    for name, attr, text in _HISTOGRAMS:
+        metric = _header(name, "histogram", text)
+        for entry_id, metrics in entries:
+            histogram: Histogram = getattr(metrics, attr)
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(entry_id, le=f'{bound:g}')} {cumulative}")
+            lines.append(f"{metric}_bucket{_labels(entry_id, le='+Inf')} {histogram.count}")
+            lines.append(f"{metric}_sum{_labels(entry_id)} {histogram.sum:g}")
+            lines.append(f"{metric}_count{_labels(entry_id)} {histogram.count}")
+
+    return "\n".join(lines) + "\n"
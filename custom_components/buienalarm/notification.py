@@ -0,0 +1,99 @@
+"""Threshold notifications for the Buienalarm integration."""
+# notification.py
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, NAME
+from .core.analytics import format_time
+from .core.i18n import text
+from .core.snapshot import ForecastSnapshot
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# Melding gaat pas weg als de piek onder deze fractie van de limiet zakt
+HYSTERESIS_RATIO: Final[float] = 0.75
+NOTIFICATION_COOLDOWN: Final[timedelta] = timedelta(minutes=30)
+
+
+class NotificationEngine:
+    """Maintain one persistent notification per config entry.
+
+    The coordinator only creates an engine for a positive limit; an unset
+    or zero limit means no notifications at all.
+
+    The engine is evaluated once per snapshot.  It compares the peak rate
+    of the remaining forecast (one sparse-table lookup on the forecast
+    index) against ``notification_limit``:
+
+    * above the limit the notification is created, or updated when its
+      text changed;
+    * it is dismissed only once the peak drops to ``HYSTERESIS_RATIO`` of
+      the limit, so a forecast hovering around the limit does not flap;
+    * after a dismissal no new notification is created for
+      ``NOTIFICATION_COOLDOWN``.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str, limit: float) -> None:
+        self._hass: Final[HomeAssistant] = hass
+        self._title: Final[str] = f"{NAME} {title}"
+        self._limit: Final[float] = float(limit)
+        self.notification_id: Final[str] = f"{DOMAIN}_{entry_id}"
+        self._message: str | None = None
+        self._dismissed_at: datetime | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while the notification is shown."""
+        return self._message is not None
+
+    @callback
+    def async_evaluate(self, snapshot: ForecastSnapshot, now: datetime | None = None) -> None:
+        """Create, update or dismiss the notification for *snapshot*."""
+        now = now or datetime.now(timezone.utc)
+        index = snapshot.index
+        current = index.bin_at(now.timestamp())
+        if current is None:
+            current = 0 if index and now.timestamp() < index.timestamps[0] else len(index)
+        peak = index.peak(current, len(index))
+        peak_rate = index.rates[peak] if peak is not None else 0.0
+
+        if not self.active:
+            if peak is None or peak_rate <= self._limit:
+                return
+            if self._dismissed_at is not None and now - self._dismissed_at < NOTIFICATION_COOLDOWN:
+                _LOGGER.debug("[NOTIFY] %s above limit but in cooldown", self.notification_id)
+                return
+        elif peak is None or peak_rate <= self._limit * HYSTERESIS_RATIO:
+            self.async_dismiss(now)
+            return
+
+        message = text(
+            "notification",
+            snapshot.language,
+            rate=peak_rate,
+            time=format_time(index.timestamps[peak], snapshot.tz),
+            limit=self._limit,
+        )
+        if message == self._message:
+            return
+        persistent_notification.async_create(
+            self._hass, message, title=self._title, notification_id=self.notification_id
+        )
+        _LOGGER.debug("[NOTIFY] %s %s: %s", "Updated" if self.active else "Created", self.notification_id, message)
+        self._message = message
+
+    @callback
+    def async_dismiss(self, now: datetime | None = None) -> None:
+        """Dismiss the notification if it is shown."""
+        if not self.active:
+            return
+        persistent_notification.async_dismiss(self._hass, self.notification_id)
+        _LOGGER.debug("[NOTIFY] Dismissed %s", self.notification_id)
+        self._message = None
+        self._dismissed_at = now or datetime.now(timezone.utc)
@@ -0,0 +1,149 @@
+"""Timing spans and on-demand profiling of the Buienalarm update pipeline."""
+# profiling.py
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    import cProfile
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+SPAN_BUFFER_SIZE: Final[int] = 256
+
+
+class _NullSpan:
+    """Span that does nothing; returned while recording is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+
+_NULL_SPAN: Final[_NullSpan] = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_recorder", "_name", "_start")
+
+    def __init__(self, recorder: SpanRecorder, name: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._recorder.record(self._name, self._start, time.perf_counter_ns())
+
+
+class SpanRecorder:
+    """Ring buffer of ``(name, start_ns, duration_ns)`` timing spans.
+
+    Times come from the monotonic ``perf_counter_ns`` clock.  While the
+    recorder is disabled ``span()`` returns a shared no-op object, so the
+    instrumented code pays one attribute check per stage.
+    """
+
+    __slots__ = ("enabled", "_buffer", "_next")
+
+    def __init__(self, size: int = SPAN_BUFFER_SIZE, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self._buffer: list[tuple[str, int, int] | None] = [None] * size
+        self._next = 0
+
+    def span(self, name: str) -> _Span | _NullSpan:
+        """Return a context manager that times the enclosed block as *name*."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        """Store one span, overwriting the oldest when the buffer is full."""
+        self._buffer[self._next] = (name, start_ns, end_ns - start_ns)
+        self._next = (self._next + 1) % len(self._buffer)
+
+    def spans(self) -> list[tuple[str, int, int]]:
+        """Return the buffered spans, oldest first."""
+        ordered = self._buffer[self._next:] + self._buffer[:self._next]
+        return [span for span in ordered if span is not None]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return count, mean and max duration (ms) per span name."""
+        totals: dict[str, list[float]] = {}
+        for name, _start, duration in self.spans():
+            totals.setdefault(name, []).append(duration / 1e6)
+        return {
+            name: {
+                "count": len(durations),
+                "mean_ms": round(sum(durations) / len(durations), 3),
+                "max_ms": round(max(durations), 3),
+            }
+            for name, durations in totals.items()
+        }
+
+
+# Gedeeld door API-clients zonder eigen recorder
+DISABLED_SPANS: Final[SpanRecorder] = SpanRecorder(size=1)
+
+
+class UpdateProfiler:
+    """cProfile the next N coordinator updates and write the stats to a file."""
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        self._hass: Final[HomeAssistant] = hass
+        self._name: Final[str] = name
+        self._profile: cProfile.Profile | None = None
+        self._remaining = 0
+        self._measuring = False
+        self.path: str | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while updates are being profiled."""
+        return self._profile is not None
+
+    def start(self, updates: int) -> str:
+        """Profile the next *updates* updates; return the output path."""
+        import cProfile  # alleen nodig als er echt geprofileerd wordt
+
+        self._profile = cProfile.Profile()
+        self._remaining = updates
+        self.path = self._hass.config.path(f"buienalarm_profile_{self._name}_{int(time.time())}.prof")
+        _LOGGER.info("[PROFILE] Profiling the next %d update(s) to %s", updates, self.path)
+        return self.path
+
+    def begin(self) -> None:
+        """Start measuring one update; skip it while another profiler is active."""
+        if self._profile is None:
+            return
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            # cProfile weigert als er al een andere profiler actief is
+            _LOGGER.warning("[PROFILE] Skipping update of %s: %s", self._name, err)
+            return
+        self._measuring = True
+
+    def end(self) -> None:
+        """Stop measuring one update; write the file after the last one."""
+        if (profile := self._profile) is None or not self._measuring:
+            return
+        profile.disable()
+        self._measuring = False
+        self._remaining -= 1
+        if self._remaining > 0:
+            return
+        self._profile = None
+        self._hass.async_add_executor_job(profile.dump_stats, self.path)
+        _LOGGER.info("[PROFILE] Writing %s", self.path)
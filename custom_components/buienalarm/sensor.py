@@ -1,10 +1,10 @@
 # sensor.py
 import logging
-import random
-from datetime import datetime, timedelta, timezone
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Final
 
-import requests
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -12,175 +12,17 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, UnitOfTime, UnitOfVolumetricFlux
+from homeassistant.const import CONF_NAME, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
 
-from .const import API_ENDPOINT, ATTR_ATTRIBUTION, DOMAIN, SENSORS
+from .const import ATTR_ATTRIBUTION, DOMAIN, SENSORS
 from .coordinator import BuienalarmDataUpdateCoordinator
-from .entity import BuienalarmEntity, BuienalarmSensorEntity
-from .sensor_types import SENSOR_DESCRIPTIONS
+from .entity import BuienalarmEntity
 
 _LOGGER = logging.getLogger(__name__)
 
-# -----------------------------------------------------------------------------
-#  User Agent rotation to avoid 403 errors
-# -----------------------------------------------------------------------------
-_USER_AGENT_LIST: Final[list[str]] = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36',
-    'Mozilla/5.0 (iPhone; CPU iPhone OS 14_4_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1',
-    'Mozilla/4.0 (compatible; MSIE 9.0; Windows NT 6.1)',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.141 Safari/537.36 Edg/87.0.664.75',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/70.0.3538.102 Safari/537.36 Edge/18.18363',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
-]
-
-
-def _get_random_user_agent() -> str:
-    """Return a random user agent from the list."""
-    return random.choice(_USER_AGENT_LIST)
-
-
-def _get_browser_headers() -> dict[str, str]:
-    """Return headers that mimic a real browser request."""
-    return {
-        "User-Agent": _get_random_user_agent(),
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Referer": "https://www.buienalarm.nl/",
-        "Origin": "https://www.buienalarm.nl",
-        "DNT": "1",
-        "Connection": "keep-alive",
-        "Sec-Fetch-Dest": "empty",
-        "Sec-Fetch-Mode": "cors",
-        "Sec-Fetch-Site": "same-site",
-    }
-
-
-old_SENSOR_DESCRIPTIONS: Final[list[SensorEntityDescription]] = [
-    SensorEntityDescription(
-        key="nowcastmessage",
-        name="Buienalarm",
-        icon="mdi:weather-pouring",
-    ),
-    SensorEntityDescription(
-        key="mycastmessage",
-        name="My Buienalarm",
-        icon="mdi:weather-pouring",
-    ),
-    SensorEntityDescription(
-        key="precipitationrate_now_description",
-        name="Neerslag omschrijving",
-        icon="mdi:weather-rainy",
-    ),
-    SensorEntityDescription(
-        key="precipitationtype_now",
-        name="Soort neerslag",
-        icon="mdi:weather-pouring",
-    ),
-    SensorEntityDescription(
-        key="next_precipitation",
-        name="Next precipitation",
-        icon="mdi:clock-outline",
-        native_unit_of_measurement=UnitOfTime.MINUTES,
-        device_class=SensorDeviceClass.DURATION,
-    ),
-    SensorEntityDescription(
-        key="precipitation_duration",
-        name="Duur neerslag",
-        icon="mdi:clock-outline",
-        native_unit_of_measurement=UnitOfTime.MINUTES,
-        device_class=SensorDeviceClass.DURATION,
-    ),
-    SensorEntityDescription(
-        key="precipitationrate_now",
-        name="Neerslag",
-        icon="mdi:weather-rainy",
-        native_unit_of_measurement=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
-        device_class=SensorDeviceClass.PRECIPITATION_INTENSITY,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="precipitationrate_hour",
-        name="Neerslag komend uur",
-        icon="mdi:weather-rainy",
-        native_unit_of_measurement=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
-        device_class=SensorDeviceClass.PRECIPITATION_INTENSITY,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    SensorEntityDescription(
-        key="precipitationrate_total",
-        name="Neerslag verwacht",
-        icon="mdi:weather-rainy",
-        native_unit_of_measurement=UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
-        device_class=SensorDeviceClass.PRECIPITATION_INTENSITY,
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-]
-
-# Sensor data update coordinator for Buienalarm
-# This coordinator fetches data from the Buienalarm API and provides it to sensor entities.
-
-
-class BuienalarmDataUpdateCoordinator(DataUpdateCoordinator[dict[str, object]]):
-    _LOGGER.debug("[SENSOR COORD] Initializing sync coordinator in sensor.py")
-
-    def __init__(self,
-                 hass: HomeAssistant,
-                 latitude: float,
-                 longitude: float,
-                 config_entry: ConfigEntry
-                 ) -> None:
-        self.latitude = latitude
-        self.longitude = longitude
-        self.url = API_ENDPOINT.format(latitude, longitude)
-        _LOGGER.debug("[SENSOR COORD] URL set to %s", self.url)
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=5),  # set update interval
-            always_update=True,  # of False indien __eq__ kan vergelijken
-            config_entry=config_entry,
-        )
-        _LOGGER.debug("[SENSOR COORD] Initialized with URL: %s", self.url)
-
-    async def _async_update_data(self) -> dict[str, object]:
-        """
-            Fetch the latest data from Buienalarm.
-            Called automatically by the DataUpdateCoordinator on schedule.
-        """
-        _LOGGER.debug("[SENSOR COORD] _async_update_data called")
-        try:
-            # Get browser-like headers with random user agent
-            headers = _get_browser_headers()
-            _LOGGER.debug("[SENSOR COORD] Using User-Agent: %s", headers["User-Agent"])
-            
-            # Use lambda to properly pass headers to requests.get
-            response = await self.hass.async_add_executor_job(
-                lambda: requests.get(self.url, headers=headers, timeout=30)
-            )
-            _LOGGER.debug(
-                "[SENSOR COORD] HTTP status: %s, headers: %s",
-                response.status_code,
-                response.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            _LOGGER.debug("[SENSOR COORD] JSON data: %s", data)
-            self.api_last_updated = datetime.now(timezone.utc)
-            _LOGGER.debug("[SENSOR COORD] Fetched new Buienalarm data at %s", self.api_last_updated.isoformat())
-            return data
-        except (requests.RequestException, ValueError) as error:
-            _LOGGER.error("[SENSOR COORD] Error updating data: %s", error)
-            raise UpdateFailed(f"Error updating Buienalarm data: {error}") from error
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -190,43 +32,16 @@ async def async_setup_entry(
     """
     Set up Buienalarm sensors from config entry.
 
-    This function creates a coordinator, fetches initial data,
-    and adds sensor entities.
+    The coordinator is created and refreshed in ``__init__.py``;
+    this function only adds the sensor entities.
     """
     _LOGGER.debug("[SENSOR SETUP] Setting up Buienalarm sensors for %s", config_entry.unique_id)
     _LOGGER.debug("[SENSOR SETUP] async_setup_entry called for %s", config_entry.entry_id)
 
-    latitude = config_entry.data.get("latitude")
-    longitude = config_entry.data.get("longitude")
-
-    _LOGGER.debug(
-        "[SENSOR SETUP] Coordinates from entry: lat=%s, lon=%s", latitude, longitude
-    )
-    coordinator = BuienalarmDataUpdateCoordinator(hass, latitude, longitude, config_entry)
-    _LOGGER.debug("[SENSOR SETUP] Coordinator created: %s", coordinator)
-
-    # Perform initial refresh to warm up data
-    try:
-        # Prefer waiting – the tests and most users expect initial data
-        # await coordinator.async_config_entry_first_refresh()
-
-        # Start refresh as background task (niet awaiten!)
-        task = hass.async_create_task(coordinator.async_config_entry_first_refresh())
-        config_entry.async_on_unload(task.cancel)
-        _LOGGER.debug(
-            "[SENSOR SETUP] Initial refresh completed: success=%s",
-            coordinator.last_update_success,
-        )
-    except UpdateFailed as err:
-        _LOGGER.error("[SENSOR SETUP] Initial data fetch failed: %s", err)
-        return False
-
-    """Store the coordinator in hass.data for later access."""
-    _LOGGER.debug("[SENSOR SETUP] Storing coordinator in hass.data for entry %s", config_entry.entry_id)
-    if DOMAIN not in hass.data:
-        _LOGGER.debug("[SENSOR SETUP] Initializing hass.data[%s]", DOMAIN)
-        # Persist the coordinator in hass.data
-        hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = coordinator
+    # Use the shared coordinator created in __init__.py, so that its local
+    # bin-boundary ticks drive these sensors as well
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    _LOGGER.debug("[SENSOR SETUP] Using shared coordinator: %s", coordinator)
 
     # old_sensors
     sensors1: list[SensorEntity] = [
@@ -234,39 +49,15 @@ async def async_setup_entry(
         for sensor_data in SENSORS
     ]
 
-    sensors2 = [
-        BuienalarmSensorEntity(coordinator, config_entry, description,
-                               location_id=config_entry.data.get("location_id", "unknown"),
-                               location_name=config_entry.data.get("location_name", "unknown"))
-        for description in SENSOR_DESCRIPTIONS
-    ]
-
-    sensors3: list[SensorEntity] = [
-        BuienalarmSensorEntity(coordinator, config_entry, description,
-                               location_id=config_entry.data.get("location_id", "unknown"),
-                               location_name=config_entry.data.get("location_name", "unknown"))
-        for description in SENSOR_DESCRIPTIONS
-    ]
-
-    sensors4 = [
-        BuienalarmSensor(coordinator, config_entry, description.name, description.native_unit_of_measurement,
-                         description.icon, description.device_class, description.state_class, description.key)
-        for description in SENSOR_DESCRIPTIONS
-    ]
-
-    sensors5: list[SensorEntity] = [
-        BuienalarmTestSensor(coordinator, config_entry, description)
-        for description in SENSOR_DESCRIPTIONS
-    ]
-
     _LOGGER.debug("[SENSOR SETUP] Adding %d sensors", len(sensors1))
     async_add_entities(sensors1, update_before_add=False)  # sensors van de oude setup *werkt*
-    # async_add_entities(sensors2, update_before_add=True)  # sensors van SENSOR_DESCRIPTIONS *raw Nowcast Message*
-    # async_add_entities(sensors3, update_before_add=True)  # sensors van SENSOR_DESCRIPTIONS met SensorEntity
-    # async_add_entities(sensors4, update_before_add=True)  # sensors van SENSOR_DESCRIPTIONS met BuienalarmSensor
-    # async_add_entities(sensors5, update_before_add=True)  # sensors van SENSOR_DESCRIPTIONS met BuienalarmTestSensor
     _LOGGER.debug("[SENSOR SETUP] %d sensors added", len(sensors1))
 
+    async_add_entities(
+        BuienalarmDiagnosticSensor(coordinator, config_entry, description)
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    )
+
     # await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     # ValueError: Config entry Schagen (1ba2a3d11e3e38b8e768ad5ceb4df8bf) for buienalarm.sensor has already been setup!
     config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
@@ -310,8 +101,6 @@ class BuienalarmTestSensor(BuienalarmEntity, SensorEntity):
 
 
 class BuienalarmSensor(BuienalarmEntity, SensorEntity):
-    _LOGGER.debug("[SENSOR SETUP] BuienalarmSensor created")
-
     _attr_has_entity_name = True
     _attr_should_poll = False
 
@@ -438,9 +227,108 @@ class BuienalarmSensor(BuienalarmEntity, SensorEntity):
             # Only include precipitation_data for one specific sensor
             if self._key == "precipitationrate_total":
                 attributes["precipitation_data"] = getattr(self, "data_points_as_list", [])
+            # De melding in alle talen die de API levert
+            if self._key == "nowcastmessage":
+                attributes["nowcastmessages"] = dict(self.coordinator.snapshot.nowcastmessages)
 
             attributes["attribution"] = ATTR_ATTRIBUTION
             return attributes
         except Exception as exc:
             _LOGGER.error("Failed to build extra_state_attributes: %s", exc)
             return {}
+
+
+@dataclass(frozen=True, kw_only=True)
+class BuienalarmDiagnosticSensorDescription(SensorEntityDescription):
+    """Describes a Buienalarm diagnostic sensor."""
+
+    value_fn: Callable[[BuienalarmDataUpdateCoordinator, datetime], StateType]
+
+
+def _data_age(coordinator: BuienalarmDataUpdateCoordinator, now: datetime) -> int | None:
+    if coordinator.issued is None:
+        return None
+    return max(0, int((now - coordinator.issued).total_seconds()))
+
+
+def _last_fetch_duration(coordinator: BuienalarmDataUpdateCoordinator, _now: datetime) -> float | None:
+    latency = coordinator.metrics.fetch_latency.last
+    return None if latency is None else round(latency * 1000, 1)
+
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: Final[tuple[BuienalarmDiagnosticSensorDescription, ...]] = (
+    BuienalarmDiagnosticSensorDescription(
+        key="data_age",
+        translation_key="data_age",
+        icon="mdi:clock-alert-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_data_age,
+    ),
+    BuienalarmDiagnosticSensorDescription(
+        key="cache_age",
+        translation_key="cache_age",
+        icon="mdi:cached",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, _now: coordinator.cache_age,
+    ),
+    BuienalarmDiagnosticSensorDescription(
+        key="last_fetch_duration",
+        translation_key="last_fetch_duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_last_fetch_duration,
+    ),
+    BuienalarmDiagnosticSensorDescription(
+        key="consecutive_failures",
+        translation_key="consecutive_failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, _now: coordinator.metrics.failure_streak,
+    ),
+)
+
+
+class BuienalarmDiagnosticSensor(BuienalarmEntity, SensorEntity):
+    """Freshness and fetch health of one entry, disabled by default.
+
+    Updated with every coordinator update and every local tick, so the
+    data age keeps counting between fetches without extra I/O.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    entity_description: BuienalarmDiagnosticSensorDescription
+
+    def __init__(
+        self,
+        coordinator: BuienalarmDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        description: BuienalarmDiagnosticSensorDescription,
+    ) -> None:
+        # Eerst de beschrijving: de naam komt via translation_key uit de vertalingen
+        self.entity_description = description
+        super().__init__(coordinator, config_entry, description.key)
+
+    @property
+    def available(self) -> bool:
+        """Stay available when fetches fail; that is what these sensors report."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current value."""
+        return self.entity_description.value_fn(self.coordinator, datetime.now(timezone.utc))
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """No forecast attributes on diagnostic sensors."""
+        return None
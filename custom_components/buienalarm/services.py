@@ -0,0 +1,116 @@
+"""Services of the Buienalarm integration."""
+# services.py
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_DAYS,
+    ATTR_ENTRY_ID,
+    ATTR_UPDATES,
+    DOMAIN,
+    SERVICE_GET_VERIFICATION,
+    SERVICE_PROFILE,
+)
+from .coordinator import BuienalarmDataUpdateCoordinator
+from .verification import ForecastVerifier
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+GET_VERIFICATION_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DAYS): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_UPDATES, default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+
+def _coordinators(hass: HomeAssistant, call: ServiceCall) -> dict[str, BuienalarmDataUpdateCoordinator]:
+    """Return the coordinators targeted by *call*."""
+    coordinators: dict[str, BuienalarmDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    if (entry_id := call.data.get(ATTR_ENTRY_ID)) is None:
+        return dict(coordinators)
+    if entry_id not in coordinators:
+        raise ServiceValidationError(f"Unknown Buienalarm entry: {entry_id}")
+    return {entry_id: coordinators[entry_id]}
+
+
+async def _async_get_verification(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the forecast scores per entry and lead time.
+
+    Without ``days`` the running scores since start-up are returned; with
+    ``days`` the archived forecasts of that period are scored from scratch.
+    Entries without an archive are reported as such, unless requested by id.
+    """
+    days: int | None = call.data.get(ATTR_DAYS)
+    response: dict[str, object] = {}
+    for entry_id, coordinator in _coordinators(hass, call).items():
+        if days is None:
+            response[entry_id] = coordinator.verifier.as_dict()
+            continue
+        if coordinator.archive is None:
+            if call.data.get(ATTR_ENTRY_ID) is not None:
+                raise ServiceValidationError("The forecast archive is disabled for this entry")
+            # Zonder entry_id: de andere entries gewoon scoren
+            response[entry_id] = {"error": "archive_disabled"}
+            continue
+        end = dt_util.utcnow()
+        forecasts = await coordinator.archive.async_query(
+            coordinator.archive_location, end - timedelta(days=days), end
+        )
+        verifier = ForecastVerifier(coordinator.verifier.leads, coordinator.verifier.threshold)
+        for forecast in forecasts:
+            verifier.update(forecast.index, forecast.issued)
+        response[entry_id] = verifier.as_dict()
+    return response
+
+
+async def _async_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Profile the next updates of each targeted entry; return the output files."""
+    response: dict[str, object] = {}
+    for entry_id, coordinator in _coordinators(hass, call).items():
+        if coordinator.profiler.active:
+            raise ServiceValidationError(f"Entry {entry_id} is already being profiled")
+        response[entry_id] = coordinator.profiler.start(call.data[ATTR_UPDATES])
+    return response
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Buienalarm services."""
+
+    async def _handle_get_verification(call: ServiceCall) -> ServiceResponse:
+        return await _async_get_verification(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_VERIFICATION,
+        _handle_get_verification,
+        schema=GET_VERIFICATION_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _handle_profile(call: ServiceCall) -> ServiceResponse:
+        return await _async_profile(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    _LOGGER.debug("[SERVICES] Registered %s.%s and %s.%s", DOMAIN, SERVICE_GET_VERIFICATION, DOMAIN, SERVICE_PROFILE)
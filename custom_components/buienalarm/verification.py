@@ -0,0 +1,119 @@
+"""Incremental verification of Buienalarm nowcasts per lead time."""
+# verification.py
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+from typing import Final
+
+from .core.forecast import BIN_SECONDS, ForecastIndex
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_LEADS: Final[tuple[int, ...]] = (30, 60, 90)  # minuten
+
+
+class LeadScore:
+    """Running contingency table and absolute error for one lead time."""
+
+    __slots__ = ("lead", "hits", "misses", "false_alarms", "correct_negatives", "abs_error", "count")
+
+    def __init__(self, lead: int) -> None:
+        self.lead: Final[int] = lead
+        self.hits = 0
+        self.misses = 0
+        self.false_alarms = 0
+        self.correct_negatives = 0
+        self.abs_error = 0.0
+        self.count = 0
+
+    def add(self, forecast: float, observed: float, threshold: float) -> None:
+        """Score one forecast against the observed rate."""
+        wet_forecast = forecast > threshold
+        wet_observed = observed > threshold
+        if wet_forecast and wet_observed:
+            self.hits += 1
+        elif wet_observed:
+            self.misses += 1
+        elif wet_forecast:
+            self.false_alarms += 1
+        else:
+            self.correct_negatives += 1
+        self.abs_error += abs(forecast - observed)
+        self.count += 1
+
+    def as_dict(self) -> dict[str, int | float | None]:
+        """Return counts and the derived scores (None without data)."""
+        hits, misses, false_alarms = self.hits, self.misses, self.false_alarms
+        return {
+            "count": self.count,
+            "hits": hits,
+            "misses": misses,
+            "false_alarms": false_alarms,
+            "correct_negatives": self.correct_negatives,
+            "mae": round(self.abs_error / self.count, 3) if self.count else None,
+            "pod": round(hits / (hits + misses), 3) if hits + misses else None,
+            "far": round(false_alarms / (hits + false_alarms), 3) if hits + false_alarms else None,
+            "csi": round(hits / (hits + misses + false_alarms), 3) if hits + misses + false_alarms else None,
+        }
+
+
+class ForecastVerifier:
+    """Score earlier forecasts as soon as their valid bin is observed.
+
+    For every fetch and every lead time the forecast for the bin at
+    ``issued + lead`` is queued.  The bins up to "now" in later fetches
+    are taken as observations; each observed bin is scored once against
+    the queued forecasts for it.  A queue never holds more than
+    ``lead / 5 min`` entries, so memory is constant per lead time.
+    """
+
+    def __init__(self, leads: Iterable[int] = DEFAULT_LEADS, threshold: float = 0.0) -> None:
+        self.threshold: Final[float] = threshold
+        self.scores: Final[dict[int, LeadScore]] = {lead: LeadScore(lead) for lead in leads}
+        self._pending: Final[dict[int, deque[tuple[int, float]]]] = {
+            lead: deque(maxlen=lead * 60 // BIN_SECONDS + 2) for lead in self.scores
+        }
+        self._last_observed: int | None = None
+
+    @property
+    def leads(self) -> tuple[int, ...]:
+        """Return the scored lead times in minutes."""
+        return tuple(self.scores)
+
+    def update(self, index: ForecastIndex, issued: float, now: float | None = None) -> int:
+        """Feed one fetched forecast; return the number of newly scored forecasts."""
+        now = issued if now is None else now
+        scored = self._observe(index, now)
+        for lead, pending in self._pending.items():
+            i = index.bin_at(issued + lead * 60)
+            if i is None:
+                continue
+            valid = index.timestamps[i]
+            # Bij meerdere fetches per bin telt de eerste (de langste lead)
+            if not pending or pending[-1][0] < valid:
+                pending.append((valid, index.rates[i]))
+        return scored
+
+    def _observe(self, index: ForecastIndex, now: float) -> int:
+        """Take the bins up to *now* as observations and score the queues."""
+        scored = 0
+        for ts, rate in zip(index.timestamps, index.rates):
+            if ts > now:
+                break
+            if self._last_observed is not None and ts <= self._last_observed:
+                continue
+            self._last_observed = ts
+            for lead, pending in self._pending.items():
+                while pending and pending[0][0] < ts:
+                    # Deze bin is nooit waargenomen (gat tussen fetches)
+                    pending.popleft()
+                if pending and pending[0][0] == ts:
+                    self.scores[lead].add(pending.popleft()[1], rate, self.threshold)
+                    scored += 1
+        return scored
+
+    def as_dict(self) -> dict[str, dict[str, int | float | None]]:
+        """Return the scores keyed by lead time in minutes."""
+        return {f"{lead}min": score.as_dict() for lead, score in self.scores.items()}
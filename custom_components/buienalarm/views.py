@@ -0,0 +1,130 @@
+"""HTTP views of the Buienalarm integration."""
+# views.py
+from __future__ import annotations
+
+import hashlib
+from http import HTTPStatus
+from typing import Final, NamedTuple
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN
+from .core.snapshot import ForecastSnapshot
+from .metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE: Final[str] = "application/json"
+
+# Eenmalig per snapshot gecomprimeerd, dus de hoogste stand
+GZIP_LEVEL: Final[int] = 9
+
+# De geregistreerde forecast-view, om bij het unloaden van een entry de cache te legen
+DATA_FORECAST_VIEW: Final[str] = f"{DOMAIN}_forecast_view"
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return True when *accept_encoding* allows gzip with a q-value above 0."""
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.lower()
+        if name in ("gzip", "x-gzip"):
+            # Expliciet genoemd gaat voor "*"
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+class CachedForecast(NamedTuple):
+    """Serialised and compressed body of one snapshot with its validators."""
+
+    snapshot: ForecastSnapshot
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+
+    @classmethod
+    def build(cls, snapshot: ForecastSnapshot) -> CachedForecast:
+        """Serialise and compress *snapshot* once."""
+        import gzip  # alleen nodig als het endpoint gebruikt wordt
+
+        body = json_bytes(snapshot.as_compact())
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        # Sterke ETag per representatie: de gzip-variant is een andere bytereeks
+        return cls(snapshot, body, gzip.compress(body, GZIP_LEVEL, mtime=0), f'"{digest}"', f'"{digest}-gzip"')
+
+
+class BuienalarmMetricsView(HomeAssistantView):
+    """Expose the fetch and update metrics of all entries to Prometheus."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics in the text exposition format."""
+        return web.Response(
+            body=render_prometheus().encode(),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
+
+
+class BuienalarmForecastView(HomeAssistantView):
+    """Serve the current snapshot of one entry as compact JSON.
+
+    The body is serialised and gzip-compressed once per fetch and then
+    served from memory; a matching ``If-None-Match`` gets a 304 without
+    a body.
+    """
+
+    url = f"/api/{DOMAIN}/forecast/{{entry_id}}"
+    name = f"api:{DOMAIN}:forecast"
+    requires_auth = True
+
+    def __init__(self) -> None:
+        self._cache: dict[str, CachedForecast] = {}
+
+    def evict(self, entry_id: str) -> None:
+        """Drop the cached body of an unloaded entry."""
+        self._cache.pop(entry_id, None)
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the compact snapshot, gzipped when the client accepts it."""
+        coordinator = request.app[KEY_HASS].data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None:
+            self._cache.pop(entry_id, None)
+            return self.json_message(f"Unknown Buienalarm entry: {entry_id}", HTTPStatus.NOT_FOUND)
+
+        cached = self._cache.get(entry_id)
+        if cached is None or cached.snapshot is not coordinator.snapshot:
+            cached = self._cache[entry_id] = CachedForecast.build(coordinator.snapshot)
+
+        gzipped = _accepts_gzip(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+        etag = cached.gzip_etag if gzipped else cached.etag
+        headers = {
+            hdrs.ETAG: etag,
+            hdrs.CACHE_CONTROL: "no-cache",
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, "")
+        if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        if gzipped:
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+        return web.Response(
+            body=cached.gzipped if gzipped else cached.body,
+            content_type=JSON_CONTENT_TYPE,
+            headers=headers,
+        )
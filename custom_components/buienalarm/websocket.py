@@ -0,0 +1,150 @@
+"""Websocket API of the Buienalarm integration."""
+# websocket.py
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, Final
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import ATTR_ENTRY_ID, DOMAIN, WS_PUSH_COOLDOWN, WS_SUBSCRIBE_FORECAST
+from .coordinator import BuienalarmDataUpdateCoordinator
+from .core.snapshot import ForecastSnapshot, compact_diff
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+# entry_id -> actieve subscriptions; de sleutel blijft tot de entry unloadt
+DATA_SUBSCRIPTIONS: Final[str] = f"{DOMAIN}_ws_subscriptions"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_forecast)
+
+
+class ForecastSubscription:
+    """Push the forecast of one entry to one websocket subscription.
+
+    The first message holds the compact snapshot, later messages only the
+    bins that changed since the last message sent.  Updates that arrive
+    within ``WS_PUSH_COOLDOWN`` of a push are coalesced into one diff
+    against the last snapshot sent, so a slow client gets at most one
+    pending message per cooldown instead of one per coordinator update.
+    Local ticks do not change the snapshot and send nothing.  When the
+    entry unloads the subscription is closed with an error message.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        coordinator: BuienalarmDataUpdateCoordinator,
+        active: set[ForecastSubscription],
+    ) -> None:
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._coordinator = coordinator
+        self._active = active
+        self._sent: ForecastSnapshot = coordinator.snapshot
+        self._pushed_at = float("-inf")
+        self._unsub_listener: CALLBACK_TYPE | None = None
+        self._unsub_push: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Send the current snapshot and start following the coordinator."""
+        self._send("snapshot", self._sent.as_compact())
+        self._unsub_listener = self._coordinator.async_add_listener(self._async_handle_update)
+        self._active.add(self)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the coordinator and drop a pending push."""
+        self._active.discard(self)
+        if self._unsub_listener is not None:
+            self._unsub_listener()
+            self._unsub_listener = None
+        if self._unsub_push is not None:
+            self._unsub_push()
+            self._unsub_push = None
+
+    @callback
+    def async_close(self) -> None:
+        """Stop and tell the client that the entry is gone."""
+        self.async_stop()
+        self._connection.subscriptions.pop(self._msg_id, None)
+        self._connection.send_error(self._msg_id, websocket_api.ERR_NOT_FOUND, "Buienalarm entry unloaded")
+
+    @callback
+    def _async_handle_update(self) -> None:
+        if self._coordinator.snapshot is self._sent or self._unsub_push is not None:
+            return
+        delay = self._pushed_at + WS_PUSH_COOLDOWN - time.monotonic()
+        if delay > 0:
+            self._unsub_push = async_call_later(self._hass, delay, self._async_push)
+            return
+        self._async_push()
+
+    @callback
+    def _async_push(self, _now: datetime | None = None) -> None:
+        self._unsub_push = None
+        snapshot = self._coordinator.snapshot
+        if snapshot is self._sent:
+            return
+        diff = compact_diff(self._sent, snapshot)
+        self._sent = snapshot
+        self._pushed_at = time.monotonic()
+        self._send("diff", diff)
+
+    def _send(self, kind: str, data: dict[str, object]) -> None:
+        self._connection.send_message(websocket_api.event_message(self._msg_id, {"type": kind, **data}))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE_FORECAST,
+        vol.Required(ATTR_ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_subscribe_forecast(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the forecast of one entry: a snapshot first, then diffs."""
+    entry_id: str = msg[ATTR_ENTRY_ID]
+    coordinator: BuienalarmDataUpdateCoordinator | None = hass.data.get(DOMAIN, {}).get(entry_id)
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown Buienalarm entry: {entry_id}")
+        return
+
+    subscriptions: dict[str, set[ForecastSubscription]] = hass.data.setdefault(DATA_SUBSCRIPTIONS, {})
+    if (active := subscriptions.get(entry_id)) is None:
+        # Eén unload-callback per geladen entry, niet per subscription
+        active = subscriptions[entry_id] = set()
+        coordinator.config_entry.async_on_unload(partial(_async_close_subscriptions, hass, entry_id))
+
+    subscription = ForecastSubscription(hass, connection, msg["id"], coordinator, active)
+    connection.subscriptions[msg["id"]] = subscription.async_stop
+    connection.send_result(msg["id"])
+    subscription.async_start()
+    _LOGGER.debug("[WS] Forecast subscription %s for entry %s", msg["id"], entry_id)
+
+
+@callback
+def _async_close_subscriptions(hass: HomeAssistant, entry_id: str) -> None:
+    """Close the subscriptions of an unloading entry."""
+    active = list(hass.data.get(DATA_SUBSCRIPTIONS, {}).pop(entry_id, ()))
+    for subscription in active:
+        subscription.async_close()
+    _LOGGER.debug("[WS] Closed %d forecast subscription(s) of entry %s", len(active), entry_id)
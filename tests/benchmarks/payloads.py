@@ -0,0 +1,65 @@
+"""Synthetic nowcast payloads for the benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+from synthetic import T0, build_payload
+
+NOW = T0 + 60  # in de eerste bin
+
+
+def _payload(rates: list[float]) -> dict[str, Any]:
+    return build_payload(
+        rates,
+        nowcastmessage={
+            "nl": "Regen vanaf {%d}" % (T0 + 3 * BIN_SECONDS),
+            "en": "Rain from {%d}" % (T0 + 3 * BIN_SECONDS),
+            "de": "Regen ab {%d}" % (T0 + 3 * BIN_SECONDS),
+        },
+    )
+
+
+def dry(bins: int = 25) -> dict[str, Any]:
+    """Two hours without precipitation."""
+    return _payload([0.0] * bins)
+
+
+def rain_now(bins: int = 25) -> dict[str, Any]:
+    """Raining from the first bin, easing off."""
+    return _payload([round(max(0.0, 4.0 - i * 0.2), 2) for i in range(bins)])
+
+
+def intermittent(bins: int = 25, seed: int = 0) -> dict[str, Any]:
+    """Short showers alternating with dry spells."""
+    rng = random.Random(seed)
+    return _payload([round(rng.uniform(0.1, 5.0), 2) if rng.random() < 0.4 else 0.0 for _ in range(bins)])
+
+
+def long_horizon(bins: int = 288, seed: int = 0) -> dict[str, Any]:
+    """A full day of intermittent showers."""
+    return intermittent(bins, seed)
+
+
+def malformed(bins: int = 25, seed: int = 0) -> dict[str, Any]:
+    """Intermittent rain with broken, missing and unsorted points."""
+    payload = intermittent(bins, seed)
+    data: list[Any] = payload["data"]
+    for i in range(0, bins, 5):
+        data[i] = dict(data[i], precipitationrate="n/a")
+    for i in range(2, bins, 7):
+        data[i] = dict(data[i], timestamp=None)
+    data.insert(bins // 2, "not a point")
+    data[1], data[3] = data[3], data[1]
+    return payload
+
+
+PAYLOADS: dict[str, dict[str, Any]] = {
+    "dry": dry(),
+    "rain_now": rain_now(),
+    "intermittent": intermittent(),
+    "long_horizon": long_horizon(),
+    "malformed": malformed(),
+}
@@ -0,0 +1,69 @@
+"""Run the micro-benchmarks against the checked-in baseline.
+
+    python tests/benchmarks/run.py                   # compare, fail on >20% slower mean
+    python tests/benchmarks/run.py --threshold 10    # stricter
+    python tests/benchmarks/run.py --save            # replace baseline.json
+
+``baseline.json`` is a run saved by pytest-benchmark (without the raw
+timings) and is passed to ``--benchmark-compare``.  Its ``machine_info`` says where it was made;
+timings only compare on similar hardware, so to judge a change on another
+machine, ``--save`` on the base commit first and compare on the branch.
+The suite runs without the test conftest, so Home Assistant is only
+needed for the processor benchmark, which is skipped without it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).parent
+ROOT = HERE.parent.parent
+BASELINE = HERE / "baseline.json"
+
+
+def main() -> int:
+    """Run pytest with the benchmark options and return its exit code."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed mean regression in percent")
+    parser.add_argument("-k", dest="keyword", help="only run benchmarks matching this expression")
+    args = parser.parse_args()
+
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        str(HERE / "test_bench_forecast.py"),
+        "--noconftest",
+        "--benchmark-only",
+        "--benchmark-columns=min,mean,stddev,rounds",
+        "--benchmark-sort=name",
+    ]
+    if args.keyword:
+        command += ["-k", args.keyword]
+    # Zonder conftest: tests/ zelf op het pad voor de gedeelde payload-builder
+    env = {**os.environ, "BUIENALARM_BENCHMARK": "1", "PYTHONPATH": os.pathsep.join((str(ROOT), str(ROOT / "tests")))}
+    if args.save:
+        # pytest-benchmark bewaart per machine-id; alleen het ene bestand gaat naar baseline.json
+        with tempfile.TemporaryDirectory() as storage:
+            command += [f"--benchmark-storage=file://{storage}", "--benchmark-save=baseline"]
+            if code := subprocess.call(command, cwd=ROOT, env=env):
+                return code
+            shutil.move(next(Path(storage).glob("*/*.json")), BASELINE)
+        print(f"Saved {BASELINE}")
+        return 0
+    if not BASELINE.is_file():
+        print(f"No baseline at {BASELINE}; run with --save first", file=sys.stderr)
+        return 2
+    command += [f"--benchmark-compare={BASELINE}", f"--benchmark-compare-fail=mean:{args.threshold:g}%"]
+    return subprocess.call(command, cwd=ROOT, env=env)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Micro-benchmarks for the forecast hot path (pytest-benchmark).
+
+Skipped in normal test runs unless ``BUIENALARM_BENCHMARK`` is set, and
+when pytest-benchmark is not installed.  Use ``run.py`` in this directory
+to compare against the checked-in ``baseline.json`` or to replace it.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import timezone
+from typing import Any
+
+import pytest
+
+from custom_components.buienalarm.core import analytics
+from custom_components.buienalarm.core.forecast import ForecastIndex
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+from payloads import NOW, PAYLOADS
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("BUIENALARM_BENCHMARK"), reason="run tests/benchmarks/run.py or set BUIENALARM_BENCHMARK=1"
+)
+
+pytest.importorskip("pytest_benchmark")
+
+KINDS = list(PAYLOADS)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_index(benchmark: Any, kind: str) -> None:
+    """Parse a payload into the forecast index."""
+    index = benchmark(ForecastIndex.from_payload, PAYLOADS[kind])
+    assert index or kind == "dry"
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_snapshot(benchmark: Any, kind: str) -> None:
+    """Build index, segmentation and the full state timeline."""
+    snapshot = benchmark(ForecastSnapshot.from_payload, PAYLOADS[kind], timezone.utc)
+    assert len(snapshot.timeline) == len(snapshot.index)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_state_lookup(benchmark: Any, kind: str) -> None:
+    """Read all sensor values for "now" from a built snapshot."""
+    snapshot = ForecastSnapshot.from_payload(PAYLOADS[kind], timezone.utc)
+    benchmark(snapshot.state_at, NOW)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        analytics.current_precipitation,
+        analytics.rain_periods,
+        analytics.precipitation_duration,
+        analytics.next_precipitation_at,
+    ],
+    ids=lambda func: func.__name__,
+)
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_analytics(benchmark: Any, kind: str, func: Any) -> None:
+    """Evaluate one analytics function directly on the index."""
+    index = ForecastIndex.from_payload(PAYLOADS[kind])
+    benchmark(func, index, NOW)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_total_rate(benchmark: Any, kind: str) -> None:
+    """Average rate over the next two hours."""
+    index = ForecastIndex.from_payload(PAYLOADS[kind])
+    benchmark(analytics.average_precipitation_rate, index, NOW, 7200)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_nowcastmessage(benchmark: Any, kind: str) -> None:
+    """Render the nowcast message template."""
+    benchmark(analytics.render_nowcastmessage, PAYLOADS[kind]["nowcastmessage"]["nl"], timezone.utc)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bench_processor(benchmark: Any, kind: str) -> None:
+    """Run ``BuienalarmDataProcessor.process`` on the raw payload."""
+    # De processor gebruikt homeassistant.util.dt; de rest van de suite niet
+    processor = pytest.importorskip("custom_components.buienalarm.processor")
+    BuienalarmDataProcessor = processor.BuienalarmDataProcessor
+    result = benchmark(lambda: BuienalarmDataProcessor(PAYLOADS[kind]).process())
+    assert "precipitation_forecast" in result
@@ -0,0 +1,142 @@
+"""Load test: N config entries against the local nowcast stub.
+
+Skipped unless ``BUIENALARM_LOAD`` lists the entry counts to run, e.g.::
+
+    BUIENALARM_LOAD=10,100,500 pytest tests/benchmarks/test_load.py
+
+Every run writes ``load-<N>.json`` to ``BUIENALARM_LOAD_REPORT`` (default
+``tests/benchmarks/reports``) so that runs of different versions can be
+compared.  CPU time includes the stub server, which runs in-process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import (
+    CONF_API_ENDPOINT,
+    CONF_ARCHIVE_RETENTION,
+    DOMAIN,
+    VERSION,
+)
+from stub_server import NowcastStub
+
+ENTRY_COUNTS = [int(n) for n in os.environ.get("BUIENALARM_LOAD", "").split(",") if n.strip()]
+CYCLES = int(os.environ.get("BUIENALARM_LOAD_CYCLES", "5"))
+REPORT_DIR = Path(os.environ.get("BUIENALARM_LOAD_REPORT", Path(__file__).parent / "reports"))
+
+pytestmark = pytest.mark.skipif(not ENTRY_COUNTS, reason="set BUIENALARM_LOAD=10,100,... to run")
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values) or [0.0]
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _measure_lag(samples: list[float], interval: float = 0.01) -> None:
+    """Record how late a sleep of *interval* seconds wakes up."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+@pytest.mark.parametrize("entries", ENTRY_COUNTS)
+async def test_load(hass: HomeAssistant, nowcast_stub: NowcastStub, entries: int) -> None:
+    """Set up *entries* entries, run update cycles and write the report."""
+    executor_jobs = 0
+    original_executor = hass.async_add_executor_job
+
+    def _count_executor(target: Any, *args: Any) -> asyncio.Future[Any]:
+        nonlocal executor_jobs
+        executor_jobs += 1
+        return original_executor(target, *args)
+
+    lag: list[float] = []
+    lag_task = asyncio.create_task(_measure_lag(lag))
+    tracemalloc.start()
+
+    config_entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Load {i}",
+            unique_id=f"load_{i}",
+            data={
+                "latitude": round(50.8 + i * 0.001, 4),
+                "longitude": round(3.4 + i * 0.001, 4),
+                CONF_API_ENDPOINT: nowcast_stub.endpoint,
+            },
+            options={CONF_ARCHIVE_RETENTION: 0},
+        )
+        for i in range(entries)
+    ]
+
+    with patch.object(hass, "async_add_executor_job", _count_executor):
+        started = time.perf_counter()
+        for entry in config_entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        setup_seconds = time.perf_counter() - started
+        memory_after_setup = tracemalloc.get_traced_memory()[0]
+        setup_requests = nowcast_stub.requests
+
+        coordinators = list(hass.data[DOMAIN].values())
+        cycle_cpu: list[float] = []
+        cycle_wall: list[float] = []
+        for _ in range(CYCLES):
+            cpu, wall = time.process_time(), time.perf_counter()
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+            await hass.async_block_till_done()
+            cycle_cpu.append((time.process_time() - cpu) * 1000)
+            cycle_wall.append((time.perf_counter() - wall) * 1000)
+
+    memory_current, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lag_task.cancel()
+
+    report = {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "entries": entries,
+        "entities": len(hass.states.async_all()),
+        "cycles": CYCLES,
+        "setup_seconds": round(setup_seconds, 3),
+        "cycle_cpu_ms": {"mean": round(sum(cycle_cpu) / len(cycle_cpu), 3), "max": round(max(cycle_cpu), 3)},
+        "cycle_wall_ms": {"mean": round(sum(cycle_wall) / len(cycle_wall), 3), "max": round(max(cycle_wall), 3)},
+        "cpu_per_entry_update_ms": round(sum(cycle_cpu) / len(cycle_cpu) / entries, 4),
+        "loop_lag_ms": {
+            "p50": round(_percentile(lag, 50), 3),
+            "p99": round(_percentile(lag, 99), 3),
+            "max": round(max(lag, default=0.0), 3),
+        },
+        "executor_jobs": executor_jobs,
+        "requests": {
+            "setup": setup_requests,
+            "total": nowcast_stub.requests,
+            "statuses": {str(status): count for status, count in nowcast_stub.statuses.items()},
+        },
+        "memory_bytes": {"after_setup": memory_after_setup, "current": memory_current, "peak": memory_peak},
+    }
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    (REPORT_DIR / f"load-{entries}.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    assert len(coordinators) == entries
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+    assert nowcast_stub.requests >= entries * (CYCLES + 1)
+
+    for entry in config_entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
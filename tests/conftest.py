@@ -2,7 +2,7 @@ import sys
 import os
 import json
 from pathlib import Path
-from typing import Final
+from typing import Callable, Final
 
 import pytest
 from aiohttp import ClientTimeout
@@ -15,6 +15,9 @@ pytest_plugins = ["pytest_homeassistant_custom_component"]
 
 from homeassistant.const import Platform
 
+from stub_server import NowcastStub
+from synthetic import build_payload
+
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations automatically for all tests."""
@@ -33,6 +36,14 @@ def mock_buienalarm_data() -> dict:
         "precipitationrate_total": 2.3,
     }
 
+@pytest.fixture
+async def nowcast_stub():
+    """Run the local nowcast stub server for one test."""
+    stub = NowcastStub()
+    await stub.start()
+    yield stub
+    await stub.stop()
+
 _FIXTURE: Final[Path] = Path(__file__).parent / "mock_data" / "api_response.json"
 
 @pytest.fixture(scope="session")
@@ -40,6 +51,11 @@ def nowcast_payload() -> dict:
     """Return the full Buienalarm JSON fixture as a dict."""
     return json.loads(_FIXTURE.read_text(encoding="utf-8"))
 
+@pytest.fixture(scope="session")
+def make_payload() -> Callable[..., dict]:
+    """Return the builder for synthetic payloads: one 5-minute bin per rate from T0."""
+    return build_payload
+
 @pytest.fixture(scope="session")
 def expected_sensor_values(nowcast_payload) -> dict[str, object]:
     """Flatten the payload into a dict of key → expected state."""
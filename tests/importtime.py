@@ -0,0 +1,152 @@
+"""Measure the import time of the integration with ``python -X importtime``.
+
+    python tests/importtime.py            # table of the slowest own modules
+    python tests/importtime.py --all      # include third-party modules
+
+Only the *self* time of the integration's own modules is attributed to
+it; Home Assistant and aiohttp are imported by the core anyway.
+
+Each run is one fresh interpreter that imports the modules Home Assistant
+loads for a config entry and records every import statement executed by
+the integration's own modules, including those of modules that were
+already imported by someone else.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = "custom_components.buienalarm"
+
+# Wat Home Assistant laadt voor een entry; __init__ zelf importeert niets meer
+MODULES: tuple[str, ...] = (
+    PACKAGE,
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.coordinator",
+    f"{PACKAGE}.services",
+    f"{PACKAGE}.views",
+    f"{PACKAGE}.websocket",
+    f"{PACKAGE}.binary_sensor",
+    f"{PACKAGE}.calendar",
+    f"{PACKAGE}.sensor",
+)
+
+# Moeten pas geïmporteerd worden op het pad dat ze gebruikt
+LAZY_MODULES: tuple[str, ...] = ("requests", "sqlite3", "cProfile", "gzip")
+
+# Draait in de subprocess: noteert elke absolute import vanuit een eigen module op stdout
+_PROBE = f"""
+import builtins, json, sys
+_import = builtins.__import__
+_seen = set()
+
+def _record(name, globals=None, locals=None, fromlist=(), level=0):
+    importer = (globals or {{}}).get("__name__", "")
+    if level == 0 and (importer == {PACKAGE!r} or importer.startswith({PACKAGE + "."!r})):
+        _seen.add(name)
+    return _import(name, globals, locals, fromlist, level)
+
+builtins.__import__ = _record
+import {", ".join(MODULES)}
+builtins.__import__ = _import
+json.dump(sorted(_seen), sys.stdout)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class ImportTimes:
+    """Self and cumulative import time (µs) per module, and our imports, of one run."""
+
+    self_us: dict[str, int]
+    cumulative_us: dict[str, int]
+    roots: tuple[str, ...]
+    imports: frozenset[str] = frozenset()
+
+    @property
+    def own_self_us(self) -> int:
+        """Total self time of the integration's own modules."""
+        return sum(us for name, us in self.self_us.items() if name == PACKAGE or name.startswith(f"{PACKAGE}."))
+
+    def imported_by_package(self, name: str) -> bool:
+        """Return True when one of our modules imports *name* (or a submodule) at load."""
+        return any(imported == name or imported.startswith(f"{name}.") for imported in self.imports)
+
+    @property
+    def total_us(self) -> int:
+        """Cumulative time of importing our modules, dependencies included."""
+        return sum(self.cumulative_us[name] for name in self.roots)
+
+
+def parse(stderr: str, imports: frozenset[str] = frozenset()) -> ImportTimes:
+    """Parse the ``-X importtime`` report."""
+    self_us: dict[str, int] = {}
+    cumulative_us: dict[str, int] = {}
+    roots: list[str] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # kopregel
+        top_level = len(name) - len(name.lstrip()) == 1
+        name = name.strip()
+        self_us[name] = int(own)
+        cumulative_us[name] = int(cumulative)
+        # Eigen modules op het bovenste niveau: samen de hele import, afhankelijkheden inbegrepen
+        if top_level and (name == PACKAGE or name.startswith(f"{PACKAGE}.")):
+            roots.append(name)
+    return ImportTimes(self_us, cumulative_us, tuple(roots), imports)
+
+
+def measure(runs: int = 3) -> ImportTimes:
+    """Import the package in fresh interpreters; return the fastest run."""
+    best: ImportTimes | None = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times = parse(result.stderr, frozenset(json.loads(result.stdout)))
+        if best is None or times.own_self_us < best.own_self_us:
+            best = times
+    assert best is not None
+    return best
+
+
+def main() -> int:
+    """Print the slowest modules of the fastest run."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="include third-party modules")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to list")
+    args = parser.parse_args()
+
+    times = measure()
+    rows = sorted(
+        (
+            (us, name)
+            for name, us in times.self_us.items()
+            if args.all or name.startswith(PACKAGE)
+        ),
+        reverse=True,
+    )
+    for us, name in rows[: args.top]:
+        print(f"{us / 1000:8.2f} ms  {name}")
+    print(f"own modules (self): {times.own_self_us / 1000:.2f} ms")
+    print(f"package (cumulative): {times.total_us / 1000:.2f} ms")
+    loaded = [name for name in LAZY_MODULES if times.imported_by_package(name)]
+    if loaded:
+        print(f"eagerly imported: {', '.join(loaded)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
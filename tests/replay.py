@@ -0,0 +1,186 @@
+"""Replay recorded or generated nowcasts through the integration on a virtual clock.
+
+Used by ``test_replay.py`` and the benchmarks.  The real coordinator and
+all entity platforms are set up; only ``BuienalarmApiClient`` is patched
+to return the payload that was current at the virtual time.  A day of
+fetches runs in a few seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import tracemalloc
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory, real_perf_counter
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.buienalarm.const import CONF_ARCHIVE_RETENTION, DOMAIN
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+
+FORECAST_BINS = 25  # twee uur vooruit, zoals de API
+
+
+def generate_payloads(
+    start: int,
+    hours: int = 24,
+    seed: int = 0,
+    fetch_interval: int = BIN_SECONDS,
+) -> list[dict[str, Any]]:
+    """Return one payload per *fetch_interval* with showers from a seeded random walk."""
+    rng = random.Random(seed)
+    bins = hours * 3600 // BIN_SECONDS + FORECAST_BINS
+    truth: list[float] = []
+    rate = 0.0
+    for _ in range(bins):
+        if rate == 0.0:
+            rate = round(rng.uniform(0.1, 2.0), 2) if rng.random() < 0.04 else 0.0
+        else:
+            rate = 0.0 if rng.random() < 0.15 else round(max(0.05, rate * rng.uniform(0.6, 1.6)), 2)
+        truth.append(rate)
+
+    payloads = []
+    for fetch in range(0, hours * 3600, fetch_interval):
+        first = fetch // BIN_SECONDS
+        payloads.append(
+            {
+                "data": [
+                    {
+                        "precipitationrate": truth[i],
+                        "precipitationtype": "rain",
+                        "timestamp": start + i * BIN_SECONDS,
+                    }
+                    for i in range(first, first + FORECAST_BINS)
+                ],
+                "nowcastmessage": {
+                    "nl": "Neerslag verwacht" if any(truth[first:first + FORECAST_BINS]) else "Geen neerslag",
+                },
+            }
+        )
+    return payloads
+
+
+def load_payloads(directory: Path) -> list[dict[str, Any]]:
+    """Return the recorded payloads (``*.json``) in *directory*, in file name order."""
+    return [json.loads(path.read_text(encoding="utf-8")) for path in sorted(directory.glob("*.json"))]
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of one replay."""
+
+    fetches: int = 0
+    steps: int = 0
+    update_latency_ms: list[float] = field(default_factory=list)
+    state_writes: Counter[str] = field(default_factory=Counter)
+    memory_growth: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report in JSON-serialisable form."""
+        return {
+            "fetches": self.fetches,
+            "steps": self.steps,
+            "update_latency_ms": {
+                "p50": round(_percentile(self.update_latency_ms, 50), 3),
+                "p95": round(_percentile(self.update_latency_ms, 95), 3),
+                "p99": round(_percentile(self.update_latency_ms, 99), 3),
+                "max": round(max(self.update_latency_ms, default=0.0), 3),
+            },
+            "state_writes": dict(sorted(self.state_writes.items())),
+            "memory_growth": self.memory_growth,
+        }
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    payloads: Sequence[dict[str, Any]],
+    *,
+    step: timedelta = timedelta(minutes=1),
+    options: dict[str, Any] | None = None,
+) -> ReplayReport:
+    """Run *payloads* through one config entry and return the report.
+
+    The virtual clock starts at the first bin of the first payload and is
+    advanced by *step* until the last payload's forecast has run out.  At
+    every moment the API returns the most recent payload whose first bin
+    is not in the future.
+    """
+    fetch_times = [payload["data"][0]["timestamp"] for payload in payloads]
+    end = payloads[-1]["data"][-1]["timestamp"] + BIN_SECONDS
+    report = ReplayReport()
+    fetched: list[float] = []
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        now = datetime.now(timezone.utc).timestamp()
+        report.fetches += 1
+        fetched.append(now)
+        return {
+            "timeseries": payloads[max(0, bisect_right(fetch_times, now) - 1)],
+            "retrieval_time": datetime.now(timezone.utc),
+            "cache_age": 0,
+        }
+
+    original_write = Entity.async_write_ha_state
+
+    def _count_write(entity: Entity) -> None:
+        report.state_writes[entity.entity_id] += 1
+        original_write(entity)
+
+    freezer.move_to(datetime.fromtimestamp(fetch_times[0] + 1, tz=timezone.utc))
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Replay",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0, **(options or {})},
+    )
+    entry.add_to_hass(hass)
+
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+        patch.object(Entity, "async_write_ha_state", _count_write),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        tracemalloc.start()
+        baseline: int | None = None
+        now = datetime.now(timezone.utc)
+        while now.timestamp() < end:
+            now += step
+            freezer.move_to(now)
+            before = len(fetched)
+            started = real_perf_counter()
+            async_fire_time_changed(hass, now)
+            await hass.async_block_till_done()
+            if len(fetched) > before:
+                report.update_latency_ms.append((real_perf_counter() - started) * 1000)
+            report.steps += 1
+            if baseline is None and report.fetches >= 12:
+                # Na een uur warmdraaien: caches en registries zijn gevuld
+                baseline = tracemalloc.get_traced_memory()[0]
+        report.memory_growth = tracemalloc.get_traced_memory()[0] - (baseline or 0)
+        tracemalloc.stop()
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return report
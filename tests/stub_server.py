@@ -0,0 +1,123 @@
+"""Local stand-in for the infoplaza nowcast endpoint.
+
+``NowcastStub`` serves ``/v4/nowcast/ba/timeseries/{lat}/{lon}`` from an
+aiohttp server on 127.0.0.1.  Latency, jitter, random errors, 403/429
+bursts, the ``Age``/``ETag`` headers and the payload size are set through
+``StubConfig`` and may be changed while the server runs.  Point the
+integration at it with ``stub.endpoint`` (``BuienalarmApiClient(endpoint=...)``
+or the ``api_endpoint`` key in the entry data).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+
+PATH = "/v4/nowcast/ba/timeseries/{lat}/{lon}"
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server."""
+
+    latency: float = 0.0  # seconden
+    jitter: float = 0.0  # extra 0..jitter seconden
+    error_rate: float = 0.0  # kans op een 500
+    burst_status: int = 429  # 403 of 429
+    burst_every: int = 0  # elke N requests een burst, 0 = uit
+    burst_length: int = 0
+    age: int = 0  # Age-header in seconden
+    bins: int = 25  # grootte van de payload
+    seed: int = 0
+    payload: dict[str, Any] | None = None  # vaste payload in plaats van gegenereerd
+
+
+@dataclass
+class NowcastStub:
+    """The running stub server and its request statistics."""
+
+    config: StubConfig = field(default_factory=StubConfig)
+    requests: int = 0
+    statuses: Counter[int] = field(default_factory=Counter)
+    locations: Counter[tuple[str, str]] = field(default_factory=Counter)
+    endpoint: str = ""
+    _runner: web.AppRunner | None = None
+
+    def payload(self, lat: str, lon: str) -> dict[str, Any]:
+        """Return the payload for a location; stable within a 5-minute bin."""
+        if self.config.payload is not None:
+            return self.config.payload
+        start = int(time.time()) // BIN_SECONDS * BIN_SECONDS
+        rng = random.Random(f"{self.config.seed}:{lat}:{lon}:{start}")
+        rates = [round(rng.uniform(0.1, 3.0), 2) if rng.random() < 0.2 else 0 for _ in range(self.config.bins)]
+        return {
+            "data": [
+                {
+                    "precipitationrate": rate,
+                    "precipitationtype": "rain",
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(start + i * BIN_SECONDS)),
+                    "timestamp": start + i * BIN_SECONDS,
+                }
+                for i, rate in enumerate(rates)
+            ],
+            "nowcastmessage": {
+                "de": "Kein Niederschlag",
+                "en": "No precipitation",
+                "nl": "Geen neerslag",
+            },
+        }
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        config = self.config
+        self.requests += 1
+        number = self.requests
+        lat, lon = request.match_info["lat"], request.match_info["lon"]
+        self.locations[(lat, lon)] += 1
+
+        delay = config.latency + random.uniform(0, config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if config.burst_every and (number - 1) % config.burst_every < config.burst_length:
+            headers = {"Retry-After": "60"} if config.burst_status == 429 else {}
+            return self._respond(web.Response(status=config.burst_status, headers=headers))
+        if config.error_rate and random.random() < config.error_rate:
+            return self._respond(web.Response(status=500))
+
+        body = json.dumps(self.payload(lat, lon), separators=(",", ":")).encode()
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        headers = {"Age": str(config.age), "ETag": etag, "Cache-Control": "max-age=300"}
+        if request.headers.get("If-None-Match") == etag:
+            return self._respond(web.Response(status=304, headers=headers))
+        return self._respond(web.Response(body=body, content_type="application/json", headers=headers))
+
+    def _respond(self, response: web.Response) -> web.Response:
+        self.statuses[response.status] += 1
+        return response
+
+    async def start(self) -> None:
+        """Start serving on a free port of 127.0.0.1."""
+        app = web.Application()
+        app.router.add_get(PATH, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.endpoint = f"http://127.0.0.1:{port}" + PATH.replace("{lat}", "{}").replace("{lon}", "{}")
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,31 @@
+"""Synthetic nowcast payloads shared by the tests and the benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+
+T0 = 1751592000  # 2025-07-04 01:20 UTC, begin van de eerste bin
+
+
+def build_payload(
+    rates: Sequence[float],
+    start: int = T0,
+    nowcastmessage: Mapping[str, str] | None = None,
+) -> dict[str, Any]:
+    """Return an API payload with one 5-minute rain bin per rate from *start*."""
+    payload: dict[str, Any] = {
+        "data": [
+            {
+                "precipitationrate": rate,
+                "precipitationtype": "rain",
+                "timestamp": start + i * BIN_SECONDS,
+            }
+            for i, rate in enumerate(rates)
+        ]
+    }
+    if nowcastmessage is not None:
+        payload["nowcastmessage"] = dict(nowcastmessage)
+    return payload
@@ -0,0 +1,47 @@
+"""Exercise the real HTTP path of the API client against the local stub."""
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.buienalarm.api import BuienalarmApiClient
+from custom_components.buienalarm.exceptions import ApiError
+from stub_server import NowcastStub
+
+
+async def test_fetch_reads_payload_and_age(hass: HomeAssistant, nowcast_stub: NowcastStub) -> None:
+    """The client parses the JSON and reports the Age header as cache age."""
+    nowcast_stub.config.age = 42
+    nowcast_stub.config.bins = 30
+    async with aiohttp.ClientSession() as session:
+        client = BuienalarmApiClient(52.1, 5.1, session, hass, endpoint=nowcast_stub.endpoint)
+        result = await client.async_get_data()
+
+    assert result["cache_age"] == 42
+    assert len(result["timeseries"]["data"]) == 30
+    assert nowcast_stub.locations[("52.1", "5.1")] == 1
+
+
+async def test_rate_limit_burst_raises_api_error(hass: HomeAssistant, nowcast_stub: NowcastStub) -> None:
+    """A 429 burst surfaces as ApiError and the client recovers afterwards."""
+    nowcast_stub.config.burst_every = 10
+    nowcast_stub.config.burst_length = 2
+    async with aiohttp.ClientSession() as session:
+        client = BuienalarmApiClient(52.1, 5.1, session, hass, endpoint=nowcast_stub.endpoint)
+        for _ in range(2):
+            with pytest.raises(ApiError):
+                await client.async_get_data()
+        assert (await client.async_get_data())["timeseries"]["data"]
+
+    assert nowcast_stub.statuses == {429: 2, 200: 1}
+
+
+async def test_etag_revalidation(nowcast_stub: NowcastStub) -> None:
+    """An unchanged payload is answered with 304 on If-None-Match."""
+    nowcast_stub.config.payload = nowcast_stub.payload("52.1", "5.1")
+    url = nowcast_stub.endpoint.format(52.1, 5.1)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as first:
+            etag = first.headers["ETag"]
+        async with session.get(url, headers={"If-None-Match": etag}) as second:
+            assert second.status == 304
@@ -0,0 +1,171 @@
+"""Tests for the Buienalarm forecast archive."""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.buienalarm.archive import (
+    DATA_ARCHIVE,
+    ArchiveRecorder,
+    ForecastArchive,
+    decode,
+    encode,
+)
+from custom_components.buienalarm.core.forecast import BIN_SECONDS, ForecastIndex
+
+T0 = 1751592000
+
+
+def _index(start: int, rates: list[float]) -> ForecastIndex:
+    return ForecastIndex.from_payload(
+        {
+            "data": [
+                {
+                    "precipitationrate": rate,
+                    "precipitationtype": "snow" if rate > 2 else "rain",
+                    "timestamp": start + i * BIN_SECONDS,
+                }
+                for i, rate in enumerate(rates)
+            ]
+        }
+    )
+
+
+def test_encode_roundtrip() -> None:
+    """Packed columns decode to the same index."""
+    index = _index(T0, [0, 0.15, 1.25, 3.5, 0])
+    valid_from, valid_to, *columns = encode(index)
+
+    assert valid_to == T0 + 5 * BIN_SECONDS
+    restored = decode(valid_from, *columns)
+    assert restored.timestamps == index.timestamps
+    assert restored.rates == index.rates
+    assert restored.types == index.types
+
+
+def test_archive_write_query_purge(tmp_path: Path) -> None:
+    """Forecasts are keyed by (location, issued) and found by valid time."""
+    archive = ForecastArchive(str(tmp_path / "archive.db"))
+    try:
+        assert archive.write_batch(
+            [
+                ("52.0,5.0", T0, _index(T0, [0, 1.0, 0])),
+                ("52.0,5.0", T0 + 3600, _index(T0 + 3600, [2.0, 0])),
+                ("51.0,4.0", T0, _index(T0, [0.5])),
+                # Zelfde uitgiftetijd: vervangt de eerdere rij
+                ("52.0,5.0", T0, _index(T0, [0, 1.5, 0])),
+            ]
+        ) == 4
+
+        found = archive.query("52.0,5.0", T0, T0 + 600)
+        assert [item.issued for item in found] == [T0]
+        assert found[0].index.rates == (0.0, 1.5, 0.0)
+        assert [item.issued for item in archive.query("52.0,5.0", T0, T0 + 7200)] == [T0, T0 + 3600]
+        assert archive.query("52.0,5.0", T0 + 7200, T0 + 9000) == []
+
+        assert archive.purge([("52.0,5.0", T0 + 1)]) == 1
+        archive.compact()
+        assert [item.issued for item in archive.query("52.0,5.0", T0, T0 + 7200)] == [T0 + 3600]
+        assert len(archive.query("51.0,4.0", T0, T0 + 300)) == 1
+    finally:
+        archive.close()
+
+
+class _TrackingArchive(ForecastArchive):
+    """Archive that records how many calls use the connection at once."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.active = 0
+        self.overlap = 0
+
+    def _track(self, func, *args):
+        self.active += 1
+        self.overlap = max(self.overlap, self.active)
+        try:
+            time.sleep(0.05)
+            return func(*args)
+        finally:
+            self.active -= 1
+
+    def write_batch(self, records):
+        return self._track(super().write_batch, records)
+
+    def purge(self, cutoffs):
+        return self._track(super().purge, cutoffs)
+
+    def compact(self):
+        return self._track(super().compact)
+
+    def close(self):
+        return self._track(super().close)
+
+
+async def test_recorder_serialises_flush_and_purge(hass: HomeAssistant, tmp_path: Path) -> None:
+    """A flush, the daily maintenance and a query never share the connection at once."""
+    archive = _TrackingArchive(str(tmp_path / "archive.db"))
+    recorder = ArchiveRecorder(hass, archive)
+    recorder.async_register("52.0,5.0", timedelta(days=1))
+    now = datetime.fromtimestamp(T0, tz=timezone.utc)
+    for hour in range(3):
+        recorder.async_add("52.0,5.0", now - timedelta(days=2 - hour), _index(T0 + hour * 3600, [0.5, 1.0]))
+
+    maintenance = hass.async_create_task(recorder._async_maintenance(now))
+    await asyncio.sleep(0)
+    recorder.async_add("52.0,5.0", now, _index(T0, [2.0, 0]))
+    await asyncio.gather(recorder.async_flush(), maintenance)
+    forecasts = await recorder.async_query("52.0,5.0", now - timedelta(hours=1), now + timedelta(hours=4))
+
+    assert archive.overlap == 1
+    assert [forecast.issued for forecast in forecasts] == [T0 - 86400, T0]
+    await recorder.async_release("52.0,5.0")
+
+
+async def test_release_closes_after_inflight_flush(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Releasing the last location waits for a running flush, writes the rest and closes."""
+    path = str(tmp_path / "archive.db")
+    archive = _TrackingArchive(path)
+    recorder = hass.data[DATA_ARCHIVE] = ArchiveRecorder(hass, archive)
+    recorder.async_register("52.0,5.0", timedelta(days=1))
+    now = datetime.fromtimestamp(T0, tz=timezone.utc)
+
+    recorder.async_add("52.0,5.0", now, _index(T0, [1.0, 0]))
+    flush = hass.async_create_task(recorder.async_flush())
+    await asyncio.sleep(0)
+    recorder.async_add("52.0,5.0", now + timedelta(hours=1), _index(T0 + 3600, [2.0, 0]))
+    await asyncio.gather(recorder.async_release("52.0,5.0"), flush)
+
+    assert archive.overlap == 1
+    assert DATA_ARCHIVE not in hass.data
+    with pytest.raises(RuntimeError):
+        await recorder.async_query("52.0,5.0", now, now + timedelta(hours=2))
+    check = ForecastArchive(path)
+    try:
+        assert [item.issued for item in check.query("52.0,5.0", T0, T0 + 7200)] == [T0, T0 + 3600]
+    finally:
+        check.close()
+
+
+async def test_write_error_is_logged(hass: HomeAssistant, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """A database error while flushing is logged with its traceback, not raised."""
+    archive = ForecastArchive(str(tmp_path / "archive.db"))
+    recorder = ArchiveRecorder(hass, archive)
+    recorder.async_register("52.0,5.0", timedelta(days=1))
+    recorder.async_add("52.0,5.0", datetime.fromtimestamp(T0, tz=timezone.utc), _index(T0, [1.0]))
+
+    def _fail(_records):
+        raise sqlite3.OperationalError("database is locked")
+
+    archive.write_batch = _fail
+    with caplog.at_level(logging.ERROR):
+        await recorder.async_flush()
+
+    (record,) = [record for record in caplog.records if "Writing 1 forecast(s) failed" in record.getMessage()]
+    assert record.exc_info is not None
+    await recorder.async_release("52.0,5.0")
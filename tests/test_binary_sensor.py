@@ -0,0 +1,62 @@
+"""Tests for the Buienalarm "rain within N minutes" binary sensors."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.binary_sensor import (
+    BuienalarmRainSoonBinarySensor,
+    parse_windows,
+)
+from custom_components.buienalarm.const import DOMAIN
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+
+T0 = 1751592000
+
+
+def _coordinator(rates: list[float]) -> MagicMock:
+    payload = {
+        "data": [
+            {"precipitationrate": rate, "precipitationtype": "rain", "timestamp": T0 + i * BIN_SECONDS}
+            for i, rate in enumerate(rates)
+        ]
+    }
+    coordinator = MagicMock()
+    coordinator.data = payload
+    coordinator.last_update_success = True
+    coordinator.snapshot = ForecastSnapshot.from_payload(payload)
+    return coordinator
+
+
+def test_parse_windows() -> None:
+    """Windows are parsed, deduplicated and sorted; junk is ignored."""
+    assert parse_windows("60, 15,30,15") == [15, 30, 60]
+    assert parse_windows("abc,0,-5") == []
+
+
+def test_rain_within_window_flips_once(freezer: FrozenDateTimeFactory) -> None:
+    """The state is written only when the window boolean changes."""
+    freezer.move_to(datetime.fromtimestamp(T0 + 60, tz=timezone.utc))
+    coordinator = _coordinator([0, 0, 0, 0, 2.0, 0, 0, 0])
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+
+    soon = BuienalarmRainSoonBinarySensor(coordinator, entry, 15, 0.0)
+    later = BuienalarmRainSoonBinarySensor(coordinator, entry, 30, 0.0)
+    assert soon.is_on is False
+    assert later.is_on is True
+    assert soon.unique_id.endswith("_rain_within_15")
+    assert soon.translation_key == "rain_within"
+    assert soon.translation_placeholders == {"minutes": "15"}
+
+    with patch.object(BuienalarmRainSoonBinarySensor, "async_write_ha_state") as write:
+        soon._handle_coordinator_update()
+        assert not write.called
+
+        freezer.move_to(datetime.fromtimestamp(T0 + 2 * BIN_SECONDS, tz=timezone.utc))
+        soon._handle_coordinator_update()
+        soon._handle_coordinator_update()
+        assert write.call_count == 1
+        assert soon.is_on is True
@@ -0,0 +1,86 @@
+"""Tests for the table-driven precipitation classification."""
+
+from datetime import timezone
+
+import pytest
+
+from custom_components.buienalarm.core.analytics import (
+    current_precipitation_rate_desc,
+    current_precipitation_type,
+)
+from custom_components.buienalarm.core.classify import (
+    DEFAULT_THRESHOLDS,
+    PrecipitationClassifier,
+    describe,
+    parse_thresholds,
+    type_name,
+    validate_thresholds,
+)
+from custom_components.buienalarm.core.forecast import BIN_SECONDS, ForecastIndex
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+
+T0 = 1751592000
+
+# De oude if/elif-keten als referentie
+_LEGACY: dict[str, list[tuple[float, str]]] = {
+    "rain": [(15.0, "Heel zware regen"), (7.5, "Zware regen"), (2.0, "Matige regen"), (1.0, "Lichte regen"), (0.0, "Motregen")],
+    "snow": [(15.0, "Heel zware sneeuw"), (7.5, "Zware sneeuw"), (2.0, "Matige sneeuw"), (1.0, "Lichte sneeuw"), (0.0, "Motsneeuw")],
+    "mix of rain and snow": [
+        (15.0, "Heel zware regen en sneeuw"),
+        (7.5, "Zware regen en sneeuw"),
+        (2.0, "Matige regen en sneeuw"),
+        (1.0, "Lichte regen en sneeuw"),
+        (0.0, "Natte sneeuw"),
+    ],
+}
+
+
+def _legacy_desc(rate: float, ptype: str) -> str:
+    for threshold, category in _LEGACY.get(ptype, _LEGACY["rain"]):
+        if rate > threshold:
+            return category
+    return "Geen neerslag"
+
+
+@pytest.mark.parametrize("ptype", ["rain", "snow", "mix of rain and snow", "mix", "freezing rain", ""])
+def test_matches_legacy_chain(ptype: str) -> None:
+    """Bisecting the thresholds gives the same Dutch descriptions as before."""
+    rates = (-1.0, 0.0, 0.01, 0.5, 1.0, 1.01, 2.0, 2.5, 7.5, 7.6, 15.0, 15.1, 80.0)
+    index = ForecastIndex(
+        tuple(T0 + i * BIN_SECONDS for i in range(len(rates))), rates, (ptype,) * len(rates)
+    )
+    codes = PrecipitationClassifier().classify(index)
+    for i, rate in enumerate(rates):
+        now = T0 + i * BIN_SECONDS + 1
+        assert current_precipitation_rate_desc(index, now, codes) == _legacy_desc(rate, ptype)
+        assert current_precipitation_rate_desc(index, now) == _legacy_desc(rate, ptype)
+        expected_type = "Geen neerslag" if rate <= 0 else type_name(ptype)
+        assert current_precipitation_type(index, now, codes) == expected_type
+
+
+def test_configured_thresholds_and_languages() -> None:
+    """Custom thresholds shift the classes; labels exist per language."""
+    classifier = PrecipitationClassifier(parse_thresholds("0.5,1,2,4"))
+    code = classifier.code(3.0, "snow")
+    assert describe(code) == "Zware sneeuw"
+    assert describe(code, "en") == "Heavy snow"
+    assert describe(code, "de") == "Starker Schneefall"
+    assert describe(code, "fr") == "Zware sneeuw"
+    assert type_name("freezing rain", "en") == "Freezing rain"
+    assert type_name("hail") == "hail"
+
+    snapshot = ForecastSnapshot.from_payload(
+        {"data": [{"timestamp": T0, "precipitationrate": 3.0, "precipitationtype": "rain"}]},
+        timezone.utc,
+        classifier=classifier,
+    )
+    assert snapshot.codes == (classifier.code(3.0, "rain"),)
+    assert snapshot.timeline[0]["precipitationrate_now_desc"] == "Zware regen"
+
+
+@pytest.mark.parametrize("value", ["", "1,2,3", "2,1,7.5,15", "0,1,2,3", "1,2,2,3", "a,b,c,d", "1,2,nan,15", None])
+def test_invalid_thresholds_fall_back(value: object) -> None:
+    """Anything but four ascending positive values gives the defaults."""
+    assert parse_thresholds(value) == DEFAULT_THRESHOLDS
+    with pytest.raises(ValueError):
+        validate_thresholds(value)
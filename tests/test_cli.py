@@ -0,0 +1,130 @@
+"""Tests for the offline batch CLI."""
+
+import asyncio
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+from custom_components.buienalarm.cli import _read_locations, _read_ndjson, main, summarise
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+from synthetic import T0
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_summarise(make_payload) -> None:
+    """A summary holds the same analytics the sensors expose."""
+    summary = summarise(make_payload([0, 1.2, 3.6, 0, 0, 0]), "utrecht", windows=(15,))
+
+    assert summary["source"] == "utrecht"
+    assert summary["now"] == T0
+    assert summary["bins"] == 6
+    assert summary["next_precipitation"] == T0 + BIN_SECONDS
+    assert summary["minutes_until_precipitation"] == 5
+    assert summary["precipitation_duration"] == 10
+    assert summary["peak_rate"] == 3.6
+    assert summary["avg_15min"] == 19.2
+    assert summary["periods"] == [
+        {
+            "start": "2025-07-04T01:25:00+00:00",
+            "stop": "2025-07-04T01:35:00+00:00",
+            "duration": 10,
+            "precipitationrate": 2.4,
+        }
+    ]
+
+
+def test_summarise_matches_sensor_state(make_payload) -> None:
+    """A summary holds the values the sensors show, also inside a later bin."""
+    payload = make_payload([0.5, 0.5, 0, 1.2, 3.6, 0, 0])
+    snapshot = ForecastSnapshot.from_payload(payload)
+
+    later = T0 + BIN_SECONDS + 100
+    for now, state in ((None, snapshot.timeline[0]), (later, snapshot.state_at(later))):
+        summary = summarise(payload, "utrecht", now, windows=(60, 120))
+        assert summary["precipitation_duration"] == state["precipitation_duration"]
+        assert summary["avg_60min"] == state["precipitationrate_hour"]
+        assert summary["avg_120min"] == state["precipitationrate_total"]
+        assert summary["periods"] == state["precipitation_periods"]
+        assert summary["minutes_until_precipitation"] == 0
+
+
+def test_process_and_export(tmp_path, make_payload) -> None:
+    """Payload directories become NDJSON summaries and then CSV rows."""
+    payloads = tmp_path / "payloads"
+    payloads.mkdir()
+    for name, rates in (("dry", [0, 0, 0]), ("wet", [0.5, 0.5, 0])):
+        (payloads / f"{name}.json").write_text(json.dumps(make_payload(rates)))
+    (payloads / "broken.json").write_text("{")
+
+    summaries = tmp_path / "summaries.ndjson"
+    assert main(["process", str(payloads), "-o", str(summaries), "--workers", "1"]) == 1
+
+    rows = [json.loads(line) for line in summaries.read_text().splitlines()]
+    assert [row["source"] for row in rows] == ["broken", "dry", "wet"]
+    assert "error" in rows[0]
+    assert rows[1]["next_precipitation"] is None
+    assert rows[2]["minutes_until_precipitation"] == 0
+
+    exported = tmp_path / "summaries.csv"
+    assert main(["export", str(summaries), "-o", str(exported)]) == 0
+
+    with exported.open(newline="") as file:
+        table = list(csv.DictReader(file))
+    assert [row["source"] for row in table] == ["broken", "dry", "wet"]
+    assert table[2]["periods"] == "1"
+    assert table[2]["first_period_start"] == "2025-07-04T01:25:00+00:00"
+
+
+def test_read_locations_skips_malformed_lines(tmp_path, capsys) -> None:
+    """Malformed lines are reported on stderr; the other locations are kept."""
+    path = tmp_path / "locations.txt"
+    path.write_text("# lat,lon\n52.1,5.1\nutrecht\n\n51.9;4.5  # rotterdam\n52.0,oost\n")
+
+    assert _read_locations(str(path)) == [(52.1, 5.1), (51.9, 4.5)]
+    errors = capsys.readouterr().err.splitlines()
+    assert errors == [
+        f"{path}:3: skipping malformed location 'utrecht'",
+        f"{path}:6: skipping malformed location '52.0,oost'",
+    ]
+
+
+def test_stdin_stays_open(monkeypatch) -> None:
+    """Reading ``-`` consumes stdin without closing it."""
+    stdin = io.StringIO('52.1,5.1\n{"source": "utrecht"}\n')
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    assert _read_locations("-") == [(52.1, 5.1)]
+    assert not stdin.closed
+    stdin.seek(0)
+    stdin.readline()
+    assert list(_read_ndjson(["-"])) == [{"source": "utrecht"}]
+    assert not stdin.closed
+
+
+async def test_fetch_without_homeassistant(tmp_path, nowcast_stub) -> None:
+    """``fetch`` downloads the payloads with Home Assistant not importable."""
+    locations = tmp_path / "locations.txt"
+    locations.write_text("52.1,5.1\n51.9,4.5\n")
+    output = tmp_path / "payloads"
+    code = (
+        "import sys; sys.modules['homeassistant'] = None; "
+        "from custom_components.buienalarm.cli import main; sys.exit(main(sys.argv[1:]))"
+    )
+
+    # Als subprocess, zodat de event loop de stub-server blijft bedienen
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", code, "fetch", str(locations),
+        "-o", str(output), "--endpoint", nowcast_stub.endpoint,
+        cwd=ROOT, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+
+    assert proc.returncode == 0, stderr.decode()
+    files = sorted(output.glob("*.json"))
+    assert [path.name.rsplit("_", 1)[0] for path in files] == ["51.9000_4.5000", "52.1000_5.1000"]
+    assert all(json.loads(path.read_text())["data"] for path in files)
+    assert sum(nowcast_stub.locations.values()) == 2
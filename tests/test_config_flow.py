@@ -0,0 +1,38 @@
+"""Tests for the Buienalarm options flow."""
+
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import CONF_INTENSITY_THRESHOLDS, DOMAIN
+
+OPTIONS = {
+    CONF_NAME: "Thuis",
+    CONF_LATITUDE: 52.1,
+    CONF_LONGITUDE: 5.1,
+    "notification_limit": 0,
+    "refresh_interval": 300,
+}
+
+
+async def test_options_flow_validates_thresholds(hass: HomeAssistant) -> None:
+    """Invalid intensity thresholds keep the form open with a field error."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_LATITUDE: 52.1, CONF_LONGITUDE: 5.1})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["step_id"] == "init"
+
+    for value in ("2,1,7.5,15", "0,1,2,3", "1,2,3", "licht"):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {**OPTIONS, CONF_INTENSITY_THRESHOLDS: value}
+        )
+        assert result["type"] is FlowResultType.FORM
+        assert result["errors"] == {CONF_INTENSITY_THRESHOLDS: "invalid_thresholds"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**OPTIONS, CONF_INTENSITY_THRESHOLDS: "0.5,1,2,4"}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_INTENSITY_THRESHOLDS] == "0.5,1,2,4"
@@ -17,14 +17,19 @@ from custom_components.buienalarm.const import (
     DEFAULT_NAME,
     SCAN_INTERVAL,
     DATA_REFRESH_INTERVAL,
+    BINARY_SENSOR,
+    CALENDAR,
     SENSOR,
     PLATFORMS,
     SENSORS,
 )
+from custom_components.buienalarm.cli import NOWCAST_ENDPOINT
 
 def test_api_constants():
     """Test the API-related constants."""
     assert API_ENDPOINT == "https://imn-rust-lb.infoplaza.io/v4/nowcast/ba/timeseries/{}/{}" 
+    # De CLI draait zonder Home Assistant en heeft daarom een eigen kopie
+    assert NOWCAST_ENDPOINT == API_ENDPOINT
     
     assert API_TIMEOUT == 30
     assert API_TIMEZONE == "Europe/Amsterdam"
@@ -47,7 +52,9 @@ def test_refresh_constants():
 def test_platform_constants():
     """Test the platform-related constants."""
     assert SENSOR == "sensor"
-    assert PLATFORMS == ["sensor"]
+    assert BINARY_SENSOR == "binary_sensor"
+    assert CALENDAR == "calendar"
+    assert PLATFORMS == ["binary_sensor", "calendar", "sensor"]
 
 def test_sensors_structure():
     """Test the structure and content of the SENSORS list."""
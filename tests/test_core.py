@@ -0,0 +1,60 @@
+"""Tests for the Home Assistant independent forecast core."""
+
+import ast
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from custom_components.buienalarm.core.forecast import data_points
+
+ROOT = Path(__file__).parent.parent
+CORE = ROOT / "custom_components" / "buienalarm" / "core"
+
+
+def test_core_does_not_import_homeassistant() -> None:
+    """The core package stays usable without Home Assistant."""
+    for path in CORE.glob("*.py"):
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                names = [node.module or ""]
+            else:
+                continue
+            assert not any(name.split(".")[0] == "homeassistant" for name in names), path.name
+
+
+def test_core_imports_without_homeassistant() -> None:
+    """Importing the core through the package works with Home Assistant blocked."""
+    code = (
+        "import sys\n"
+        "sys.modules['homeassistant'] = None\n"
+        "sys.modules['aiohttp'] = None\n"
+        "import custom_components.buienalarm.core.forecast\n"
+        "import custom_components.buienalarm.cli\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_data_points() -> None:
+    """Times are parsed as aware datetimes; junk items are skipped."""
+    points = data_points(
+        {
+            "data": [
+                {"precipitationrate": 0.4, "precipitationtype": "rain", "timestamp": 1, "time": "2025-07-04T12:00:00+02:00"},
+                {"precipitationrate": 0, "timestamp": 2, "time": "2025-07-04T10:05:00"},
+                {"precipitationrate": 0, "timestamp": 3, "time": "not a time"},
+                42,
+            ]
+        }
+    )
+    assert [point["timestamp"] for point in points] == [1, 2, 3]
+    assert points[0]["time"] == datetime(2025, 7, 4, 10, 0, tzinfo=timezone.utc)
+    assert points[1]["time"] == datetime(2025, 7, 4, 10, 5, tzinfo=timezone.utc)
+    assert points[2]["time"] == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert points[1]["precipitationtype"] is None
+    assert data_points([]) == []
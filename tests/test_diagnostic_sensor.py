@@ -0,0 +1,62 @@
+"""Tests for the Buienalarm data freshness diagnostic sensors."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import EntityCategory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import DOMAIN
+from custom_components.buienalarm.metrics import EntryMetrics
+from custom_components.buienalarm.sensor import (
+    DIAGNOSTIC_SENSOR_DESCRIPTIONS,
+    BuienalarmDiagnosticSensor,
+)
+
+T0 = datetime(2025, 7, 4, 12, 0, tzinfo=timezone.utc)
+
+
+def _sensors(coordinator: MagicMock) -> dict[str, BuienalarmDiagnosticSensor]:
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    return {
+        description.key: BuienalarmDiagnosticSensor(coordinator, entry, description)
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    }
+
+
+def test_diagnostic_sensors(freezer: FrozenDateTimeFactory) -> None:
+    """Values come from the coordinator and metrics; the data age keeps counting."""
+    freezer.move_to(T0)
+    coordinator = MagicMock()
+    coordinator.issued = T0 - timedelta(seconds=40)
+    coordinator.cache_age = 40
+    coordinator.metrics = EntryMetrics()
+    coordinator.metrics.fetch_succeeded(0.1234, 0.001, 9000, 40)
+    coordinator.metrics.fetch_failed("timeout")
+    sensors = _sensors(coordinator)
+
+    assert all(sensor.entity_category is EntityCategory.DIAGNOSTIC for sensor in sensors.values())
+    assert not any(sensor.entity_registry_enabled_default for sensor in sensors.values())
+    assert sensors["data_age"].native_value == 40
+    assert sensors["cache_age"].native_value == 40
+    assert sensors["last_fetch_duration"].native_value == 123.4
+    assert sensors["consecutive_failures"].native_value == 1
+
+    # Zelfde snapshot, vijf minuten later: alleen de leeftijd verandert
+    freezer.tick(timedelta(minutes=5))
+    coordinator.last_update_success = False
+    assert sensors["data_age"].native_value == 340
+    assert sensors["data_age"].available
+
+
+def test_diagnostic_sensors_without_data() -> None:
+    """Before the first fetch the values are unknown."""
+    coordinator = MagicMock()
+    coordinator.issued = None
+    coordinator.cache_age = None
+    coordinator.metrics = EntryMetrics()
+    sensors = _sensors(coordinator)
+    assert sensors["data_age"].native_value is None
+    assert sensors["last_fetch_duration"].native_value is None
+    assert sensors["consecutive_failures"].native_value == 0
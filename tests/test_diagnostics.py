@@ -0,0 +1,62 @@
+"""Tests for the Buienalarm diagnostics."""
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import CONF_ARCHIVE_RETENTION, DOMAIN
+from custom_components.buienalarm.diagnostics import async_get_config_entry_diagnostics
+from replay import generate_payloads
+
+T0 = 1751587200
+
+
+async def test_diagnostics(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Diagnostics redact the location and report the update metrics."""
+    payload = generate_payloads(T0, hours=1, seed=4)[0]
+    freezer.move_to(datetime.fromtimestamp(T0 + 1, tz=timezone.utc))
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return {"timeseries": payload, "retrieval_time": datetime.now(timezone.utc), "cache_age": 30}
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Diag",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+    assert result["entry"]["data"]["latitude"] == "**REDACTED**"
+    assert result["coordinator"]["last_update_success"] is True
+    assert result["coordinator"]["cache_age"] == 30
+    assert result["coordinator"]["forecast_bins"] == len(payload["data"])
+    metrics = result["metrics"]
+    assert metrics["processing_time_s"]["count"] == 1
+    assert metrics["state_writes"]["count"] >= 1
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert metrics["poll_interval"] == coordinator.update_interval.total_seconds()
+    assert result["spans"] == {}
+
+    # Alleen entities die echt schrijven tellen, geen andere listeners
+    entities = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+    coordinator.async_update_listeners()
+    writes = coordinator.metrics.state_writes.last
+    unsubs = [coordinator.async_add_listener(lambda: None) for _ in range(5)]
+    coordinator.async_update_listeners()
+    assert coordinator.metrics.state_writes.last == writes
+    assert 0 < writes <= entities
+    for unsub in unsubs:
+        unsub()
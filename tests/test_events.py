@@ -0,0 +1,78 @@
+"""Tests for the Buienalarm rain events."""
+
+from datetime import datetime, timedelta, timezone
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.buienalarm.const import (
+    EVENT_RAIN_EXPECTED,
+    EVENT_RAIN_STARTED,
+    EVENT_RAIN_STOPPED,
+)
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+from custom_components.buienalarm.events import RainEventScheduler
+from synthetic import T0
+
+
+async def _move_to(hass: HomeAssistant, freezer: FrozenDateTimeFactory, ts: float) -> None:
+    point = datetime.fromtimestamp(ts, tz=timezone.utc)
+    freezer.move_to(point)
+    async_fire_time_changed(hass, point)
+    await hass.async_block_till_done()
+
+
+async def test_events_fire_once_at_forecast_times(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, make_payload
+) -> None:
+    """Expected, started and stopped fire at their times, exactly once."""
+    freezer.move_to(datetime.fromtimestamp(T0 + 60, tz=timezone.utc))
+    expected = async_capture_events(hass, EVENT_RAIN_EXPECTED)
+    started = async_capture_events(hass, EVENT_RAIN_STARTED)
+    stopped = async_capture_events(hass, EVENT_RAIN_STOPPED)
+
+    scheduler = RainEventScheduler(hass, "entry", "Test", timedelta(minutes=10))
+    snapshot = ForecastSnapshot.from_payload(make_payload([0, 0, 0, 1.0, 2.0, 1.0, 0, 0]))
+    scheduler.async_schedule(snapshot)
+
+    await _move_to(hass, freezer, T0 + 3 * BIN_SECONDS - 600)
+    assert len(expected) == 1
+    assert expected[0].data["duration"] == 15
+
+    # Een nieuwe fetch met dezelfde verwachting vuurt niets opnieuw
+    scheduler.async_schedule(snapshot)
+    await hass.async_block_till_done()
+    assert len(expected) == 1
+
+    await _move_to(hass, freezer, T0 + 3 * BIN_SECONDS)
+    assert len(started) == 1
+
+    await _move_to(hass, freezer, T0 + 6 * BIN_SECONDS)
+    assert len(stopped) == 1
+    assert len(expected) == 1 and len(started) == 1
+    scheduler.async_cancel()
+
+
+async def test_rain_stopped_when_forecast_turns_dry(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, make_payload
+) -> None:
+    """A new dry forecast ends an ongoing rain period right away."""
+    freezer.move_to(datetime.fromtimestamp(T0 + 60, tz=timezone.utc))
+    started = async_capture_events(hass, EVENT_RAIN_STARTED)
+    stopped = async_capture_events(hass, EVENT_RAIN_STOPPED)
+
+    scheduler = RainEventScheduler(hass, "entry", "Test", timedelta(minutes=10))
+    scheduler.async_schedule(ForecastSnapshot.from_payload(make_payload([1.0, 1.0, 1.0, 0])))
+    await hass.async_block_till_done()
+    # Opstarten midden in een bui: geen "started" achteraf
+    assert not started
+
+    scheduler.async_schedule(ForecastSnapshot.from_payload(make_payload([0, 0, 0, 0])))
+    await hass.async_block_till_done()
+    assert len(stopped) == 1
+    scheduler.async_cancel()
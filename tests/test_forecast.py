@@ -0,0 +1,63 @@
+"""Tests for the Buienalarm forecast index."""
+
+from custom_components.buienalarm.core.analytics import current_bin, current_precipitation
+from custom_components.buienalarm.core.forecast import BIN_SECONDS, ForecastIndex
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+from synthetic import T0
+
+
+def test_from_payload_fixture(nowcast_payload) -> None:
+    """The recorded API response is indexed completely."""
+    index = ForecastIndex.from_payload(nowcast_payload)
+
+    assert len(index) == len(nowcast_payload["data"])
+    assert index.start == nowcast_payload["data"][0]["timestamp"]
+    assert index.end == nowcast_payload["data"][-1]["timestamp"] + BIN_SECONDS
+
+
+def test_from_payload_skips_malformed_points(make_payload) -> None:
+    """Points without timestamp are dropped, bad rates count as dry."""
+    payload = make_payload([0.0, 1.5])
+    payload["data"].insert(0, "garbage")
+    payload["data"].append({"precipitationrate": 2.0})
+    payload["data"].append({"precipitationrate": "n/a", "timestamp": T0 + 2 * BIN_SECONDS})
+
+    index = ForecastIndex.from_payload(payload)
+
+    assert index.timestamps == (T0, T0 + BIN_SECONDS, T0 + 2 * BIN_SECONDS)
+    assert index.rates == (0.0, 1.5, 0.0)
+
+
+def test_from_payload_invalid_root() -> None:
+    """A non-dict payload yields an empty index."""
+    assert not ForecastIndex.from_payload([])
+    assert ForecastIndex.from_payload({"data": None}).next_boundary(T0) is None
+
+
+def test_bin_lookup_and_boundaries(make_payload) -> None:
+    """Bins are half-open and the last boundary is the end of the forecast."""
+    index = ForecastIndex.from_payload(make_payload([0.0, 1.0, 0.0]))
+
+    assert index.bin_at(T0 - 1) is None
+    assert index.bin_at(T0) == 0
+    assert index.bin_at(T0 + BIN_SECONDS + 10) == 1
+    assert index.bin_at(T0 + 3 * BIN_SECONDS) is None
+
+    assert index.next_boundary(T0 - 1) == T0
+    assert index.next_boundary(T0) == T0 + BIN_SECONDS
+    assert index.next_boundary(T0 + 2 * BIN_SECONDS + 1) == T0 + 3 * BIN_SECONDS
+    assert index.next_boundary(T0 + 3 * BIN_SECONDS) is None
+
+
+def test_exact_boundary_belongs_to_the_next_bin(make_payload) -> None:
+    """Index, analytics and timeline agree on a time exactly on a boundary."""
+    snapshot = ForecastSnapshot.from_payload(make_payload([0.0, 1.0, 0.0]))
+    index = snapshot.index
+    boundary = T0 + BIN_SECONDS
+
+    assert index.bin_at(boundary) == current_bin(index, boundary) == 1
+    assert current_precipitation(index, boundary) == 1.0
+    assert snapshot.state_at(boundary) is snapshot.timeline[1]
+    assert snapshot.state_at(boundary - 1) is snapshot.timeline[0]
+    assert snapshot.evaluated_at(boundary) == boundary + 1
+    assert current_bin(index, index.end) is None
@@ -0,0 +1,42 @@
+"""Tests for the localised texts of the forecast core."""
+
+from datetime import timezone
+
+import pytest
+
+from custom_components.buienalarm.core.i18n import LANGUAGES, MESSAGES, resolve_language, text
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+from synthetic import T0
+
+
+def test_tables_are_complete() -> None:
+    """Every language has every text with the same placeholders."""
+    keys = set(MESSAGES["nl"])
+    for language in LANGUAGES:
+        assert set(MESSAGES[language]) == keys
+        for key in keys:
+            assert text(key, language, duration=5, time="1:30", rate=1.25, limit=2)
+
+
+@pytest.mark.parametrize(
+    ("language", "resolved"), [("en", "en"), ("en-GB", "en"), ("de-CH", "de"), ("NL", "nl"), ("fr", "nl"), (None, "nl")]
+)
+def test_resolve_language(language: str | None, resolved: str) -> None:
+    """Home Assistant languages map onto the supported ones."""
+    assert resolve_language(language) == resolved
+
+
+def test_timeline_in_instance_language(make_payload) -> None:
+    """The timeline holds the texts in the snapshot language."""
+    rates = [0, 1.5, 1.5, 0, 0]
+    states = {
+        language: ForecastSnapshot.from_payload(make_payload(rates), timezone.utc, language=language).timeline
+        for language in ("nl", "en", "de")
+    }
+    assert states["nl"][0]["mycastmessage"] == "Neerslag begint om 1:25 en duurt 10 minuten"
+    assert states["en"][0]["mycastmessage"] == "Precipitation starts at 1:25 and lasts 10 minutes"
+    assert states["de"][0]["mycastmessage"] == "Niederschlag beginnt um 1:25 und dauert 10 Minuten"
+    assert states["en"][1]["precipitationrate_now_desc"] == "Light rain"
+    assert states["de"][1]["precipitationtype_now"] == "Regen"
+    assert states["en"][3]["precipitationtype_now"] == "No precipitation"
+    assert ForecastSnapshot.empty().state_at(T0)["mycastmessage"] == "Geen data"
@@ -0,0 +1,29 @@
+"""Import-time budget of the integration (``python -X importtime``)."""
+
+import pytest
+
+# De subprocess importeert de integratie zoals Home Assistant dat doet
+pytest.importorskip("homeassistant")
+
+from importtime import LAZY_MODULES, measure  # noqa: E402
+
+# Self-tijd van de eigen modules samen (Home Assistant en aiohttp tellen niet mee), met ruime marge
+IMPORT_BUDGET_MS = 50
+
+
+@pytest.fixture(scope="module")
+def import_times():
+    """Import times of the fastest of three cold imports in fresh interpreters."""
+    return measure()
+
+
+def test_import_budget(import_times) -> None:
+    """The integration's own modules stay within the import budget."""
+    own_ms = import_times.own_self_us / 1000
+    assert own_ms < IMPORT_BUDGET_MS, f"own modules took {own_ms:.1f} ms to import"
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_optional_modules_are_lazy(import_times, module: str) -> None:
+    """Optional dependencies are imported on the path that uses them, not at load."""
+    assert not import_times.imported_by_package(module)
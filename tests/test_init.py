@@ -28,7 +28,7 @@ def config_data() -> dict[str, float | str]:
 
 
 @pytest.mark.asyncio
-@patch("custom_components.buienalarm.BuienalarmDataUpdateCoordinator")
+@patch("custom_components.buienalarm.coordinator.BuienalarmDataUpdateCoordinator")
 async def test_async_setup_entry_success(
     mock_coordinator: AsyncMock, hass: HomeAssistant, config_data: dict[str, float | str]
 ) -> None:
@@ -51,7 +51,7 @@ async def test_async_setup_entry_success(
 
 
 @pytest.mark.asyncio
-@patch("custom_components.buienalarm.BuienalarmDataUpdateCoordinator")
+@patch("custom_components.buienalarm.coordinator.BuienalarmDataUpdateCoordinator")
 async def test_async_setup_entry_failure(
     mock_coordinator: AsyncMock, hass: HomeAssistant, config_data: dict[str, float | str]
 ) -> None:
@@ -68,8 +68,8 @@ async def test_async_setup_entry_failure(
 
 
 @pytest.mark.asyncio
-@patch("custom_components.buienalarm.BuienalarmDataUpdateCoordinator")
-@patch("custom_components.buienalarm.PLATFORMS", ["sensor"])  # test dynamic platforms
+@patch("custom_components.buienalarm.coordinator.BuienalarmDataUpdateCoordinator")
+@patch("custom_components.buienalarm.const.PLATFORMS", ["sensor"])  # test dynamic platforms
 async def test_async_unload_entry(
     mock_coordinator: AsyncMock, hass: HomeAssistant, config_data: dict[str, float | str]
 ) -> None:
@@ -119,7 +119,7 @@ async def test_async_reload_entry(
 
 
 @pytest.mark.asyncio
-@patch("custom_components.buienalarm.BuienalarmDataUpdateCoordinator")
+@patch("custom_components.buienalarm.coordinator.BuienalarmDataUpdateCoordinator")
 async def test_async_setup_entry_exception(
     mock_coordinator: AsyncMock, hass: HomeAssistant, config_data: dict[str, float | str]
 ) -> None:
@@ -0,0 +1,91 @@
+"""Memory and resource leak checks for setting up and unloading entries."""
+
+import asyncio
+import gc
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import CONF_ARCHIVE_RETENTION, DOMAIN
+from replay import generate_payloads
+
+T0 = 1751587200
+CYCLES = 10
+WARMUP = 3
+# Toegestane groei per cyclus/update; registries en caches zijn na de warmup gevuld
+MAX_BYTES_PER_CYCLE = 16 * 1024
+MAX_BYTES_PER_UPDATE = 4 * 1024
+
+
+def _resources(hass: HomeAssistant) -> tuple[int, int, int]:
+    """Return the number of bus listeners, pending timers and running tasks."""
+    timers = sum(1 for handle in hass.loop._scheduled if not handle.cancelled())
+    return sum(hass.bus.async_listeners().values()), timers, len(asyncio.all_tasks())
+
+
+def _retained() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+async def test_setup_unload_does_not_leak(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Repeated setup/unload leaves no listeners, timers, tasks or memory behind."""
+    payload = generate_payloads(T0, hours=1, seed=2)[0]
+    freezer.move_to(datetime.fromtimestamp(T0 + 1, tz=timezone.utc))
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return {"timeseries": payload, "retrieval_time": datetime.now(timezone.utc), "cache_age": 0}
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Leak",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0},
+    )
+    entry.add_to_hass(hass)
+
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+    ):
+        tracemalloc.start()
+        try:
+            baseline = 0
+            reference: tuple[int, int, int] | None = None
+            for cycle in range(CYCLES):
+                assert await hass.config_entries.async_setup(entry.entry_id)
+                await hass.async_block_till_done()
+                assert await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_block_till_done()
+                # De eerste setup laadt de platforms zelf; daarna moet alles terug naar dit niveau
+                if reference is None:
+                    reference = _resources(hass)
+                assert _resources(hass) == reference, f"cycle {cycle}"
+                if cycle == WARMUP - 1:
+                    baseline = _retained()
+            per_cycle = (_retained() - baseline) / (CYCLES - WARMUP)
+            assert DOMAIN not in hass.data or not hass.data[DOMAIN]
+
+            # Geheugen per update van een geladen entry
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            for _ in range(WARMUP):
+                await coordinator.async_refresh()
+            start = _retained()
+            for _ in range(20):
+                await coordinator.async_refresh()
+                await hass.async_block_till_done()
+            per_update = (_retained() - start) / 20
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+        finally:
+            tracemalloc.stop()
+
+    assert per_cycle < MAX_BYTES_PER_CYCLE, f"{per_cycle:.0f} bytes retained per setup/unload"
+    assert per_update < MAX_BYTES_PER_UPDATE, f"{per_update:.0f} bytes retained per update"
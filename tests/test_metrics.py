@@ -0,0 +1,66 @@
+"""Tests for the bounded metrics registry."""
+
+from custom_components.buienalarm.metrics import (
+    EntryMetrics,
+    Histogram,
+    MetricsRegistry,
+    render_prometheus,
+)
+
+
+def test_histogram_buckets_and_window() -> None:
+    """Samples land in the first bucket whose bound they do not exceed."""
+    histogram = Histogram((1, 5), window=3)
+    for value in (0.5, 1, 3, 10, 4):
+        histogram.observe(value)
+    assert histogram.counts == [2, 2, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 18.5
+    # Alleen de laatste drie samples blijven in het venster
+    assert histogram.recent() == [3, 10, 4]
+    result = histogram.as_dict()
+    assert result["buckets"] == {"le_1": 2, "le_5": 2, "le_inf": 1}
+    assert result["p50"] == 4
+    assert result["max"] == 10
+
+
+def test_empty_histogram_has_no_percentiles() -> None:
+    """Without samples only the counters are reported."""
+    assert "p50" not in Histogram((1,)).as_dict()
+
+
+def test_entry_metrics_fetches() -> None:
+    """Failures reset on success; cache hits count responses with an Age."""
+    metrics = EntryMetrics()
+    metrics.fetch_failed(429)
+    metrics.fetch_failed("timeout")
+    assert metrics.failure_streak == 2
+    metrics.fetch_succeeded(0.2, 0.001, 9000, 0)
+    metrics.fetch_succeeded(0.3, 0.001, 9000, 40)
+    result = metrics.as_dict()
+    assert result["fetches"] == 4
+    assert result["failures"] == 2
+    assert result["failure_streak"] == 0
+    assert result["statuses"] == {"429": 1, "timeout": 1, "200": 2}
+    assert result["upstream_cache_hit_ratio"] == 0.5
+    assert result["payload_size_bytes"]["count"] == 2
+
+
+def test_render_prometheus() -> None:
+    """The exposition has cumulative buckets and one series per entry."""
+    registry = MetricsRegistry()
+    metrics = registry.register("abc")
+    metrics.fetch_succeeded(0.2, 0.001, 9000, 0)
+    metrics.fetch_failed(503)
+    metrics.skipped_writes = 3
+    text = render_prometheus(registry)
+    assert text.endswith("\n")
+    assert 'buienalarm_requests_total{entry_id="abc",status="503"} 1' in text
+    assert 'buienalarm_skipped_writes_total{entry_id="abc"} 3' in text
+    assert 'buienalarm_fetch_duration_seconds_bucket{entry_id="abc",le="0.1"} 0' in text
+    assert 'buienalarm_fetch_duration_seconds_bucket{entry_id="abc",le="0.25"} 1' in text
+    assert 'buienalarm_fetch_duration_seconds_bucket{entry_id="abc",le="+Inf"} 1' in text
+    assert "# TYPE buienalarm_payload_bytes histogram" in text
+
+    registry.unregister("abc", metrics)
+    assert 'entry_id="abc"' not in render_prometheus(registry)
@@ -0,0 +1,87 @@
+"""Tests for the Buienalarm notification engine."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import CONF_ARCHIVE_RETENTION, DOMAIN
+from custom_components.buienalarm.core.snapshot import ForecastSnapshot
+from custom_components.buienalarm.notification import NotificationEngine
+from synthetic import T0
+
+NOW = datetime.fromtimestamp(T0 + 60, tz=timezone.utc)
+
+
+async def test_notification_hysteresis_and_cooldown(hass: HomeAssistant, make_payload) -> None:
+    """One notification is created, kept near the limit and dismissed below it."""
+    engine = NotificationEngine(hass, "entry", "Test", limit=2)
+
+    with (
+        patch("custom_components.buienalarm.notification.persistent_notification.async_create") as create,
+        patch("custom_components.buienalarm.notification.persistent_notification.async_dismiss") as dismiss,
+    ):
+        engine.async_evaluate(ForecastSnapshot.from_payload(make_payload([0, 1.0, 1.5])), NOW)
+        assert not create.called
+
+        engine.async_evaluate(ForecastSnapshot.from_payload(make_payload([0, 1.0, 3.0])), NOW)
+        assert create.call_count == 1
+        assert create.call_args.kwargs["notification_id"] == "buienalarm_entry"
+
+        # Zelfde tekst: geen nieuwe melding
+        engine.async_evaluate(ForecastSnapshot.from_payload(make_payload([0, 1.0, 3.0])), NOW)
+        assert create.call_count == 1
+
+        # Net onder de limiet, maar boven de hysterese: blijft staan
+        engine.async_evaluate(ForecastSnapshot.from_payload(make_payload([0, 1.8, 0])), NOW)
+        assert not dismiss.called
+        assert create.call_count == 2
+
+        engine.async_evaluate(ForecastSnapshot.from_payload(make_payload([0, 1.0, 0])), NOW)
+        assert dismiss.call_count == 1
+        assert not engine.active
+
+        # Binnen de cooldown geen nieuwe melding
+        wet_later = ForecastSnapshot.from_payload(make_payload([0] * 8 + [5.0]))
+        engine.async_evaluate(wet_later, NOW + timedelta(minutes=5))
+        assert create.call_count == 2
+
+        engine.async_evaluate(wet_later, NOW + timedelta(minutes=31))
+        assert create.call_count == 3
+
+
+async def test_default_entry_creates_no_notification(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, make_payload
+) -> None:
+    """Without a configured limit heavy rain does not create a notification."""
+    freezer.move_to(NOW)
+    payload = make_payload([8.0] * 24)
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return {"timeseries": payload, "retrieval_time": datetime.now(timezone.utc), "cache_age": 0}
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Default",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+        patch("custom_components.buienalarm.notification.persistent_notification.async_create") as create,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        assert coordinator.snapshot.index.rates[0] == 8.0
+        assert coordinator.notifications is None
+        assert not create.called
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
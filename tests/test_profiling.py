@@ -0,0 +1,85 @@
+"""Tests for the timing span recorder and the update profiler."""
+
+import asyncio
+import cProfile
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import DOMAIN
+from custom_components.buienalarm.coordinator import BuienalarmDataUpdateCoordinator
+from custom_components.buienalarm.metrics import REGISTRY
+from custom_components.buienalarm.profiling import SpanRecorder, UpdateProfiler
+
+
+def test_disabled_recorder_is_noop() -> None:
+    """A disabled recorder hands out the shared no-op span and stores nothing."""
+    spans = SpanRecorder(size=4)
+    first = spans.span("update.fetch")
+    assert first is spans.span("snapshot.build")
+    with first:
+        pass
+    assert spans.spans() == []
+    assert spans.summary() == {}
+
+
+def test_ring_buffer_keeps_newest() -> None:
+    """The oldest spans are overwritten once the buffer is full."""
+    spans = SpanRecorder(size=3, enabled=True)
+    for i in range(5):
+        spans.record(f"s{i}", i * 1_000_000, (i + 1) * 1_000_000 + i * 1_000_000)
+    assert [name for name, _start, _duration in spans.spans()] == ["s2", "s3", "s4"]
+    assert spans.summary()["s4"] == {"count": 1, "mean_ms": 5.0, "max_ms": 5.0}
+
+
+def test_span_context_records_duration() -> None:
+    """Timing a block stores one span with a non-negative duration."""
+    spans = SpanRecorder(enabled=True)
+    with spans.span("entity.writes"):
+        pass
+    ((name, _start, duration),) = spans.spans()
+    assert name == "entity.writes"
+    assert duration >= 0
+
+
+async def test_profiler_skips_update_while_other_profiler_active(hass: HomeAssistant) -> None:
+    """An update is not profiled, and does not fail, while another profiler runs."""
+    profiler = UpdateProfiler(hass, "entry")
+    profiler.start(1)
+
+    # Python 3.12+ weigert een tweede actieve profiler met een ValueError
+    with patch.object(cProfile.Profile, "enable", side_effect=ValueError("Another profiling tool is already active")):
+        profiler.begin()
+        profiler.end()
+
+    # De overgeslagen update telt niet mee
+    assert profiler.active
+    profiler.begin()
+    profiler.end()
+    assert not profiler.active
+
+
+async def test_profiled_update_ends_in_fetch_path_only(hass: HomeAssistant) -> None:
+    """A cancelled fetch disables the profile; a tick never ends a profiled update."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"latitude": 52.1, "longitude": 5.1})
+    entry.add_to_hass(hass)
+    api = MagicMock(base_url="https://example.invalid", latitude=52.1, longitude=5.1)
+    api.async_get_data = AsyncMock(side_effect=asyncio.CancelledError)
+    coordinator = BuienalarmDataUpdateCoordinator(hass, api, DeviceInfo(), entry)
+    coordinator.profiler.start(2)
+
+    with patch.object(cProfile.Profile, "enable"), patch.object(cProfile.Profile, "disable") as disable:
+        with pytest.raises(asyncio.CancelledError):
+            await coordinator._async_update_data()
+        assert disable.call_count == 1
+
+        # Een tick tijdens een meting schrijft states maar sluit de meting niet
+        coordinator.profiler.begin()
+        coordinator.async_update_listeners()
+        assert disable.call_count == 1
+        assert coordinator.profiler.active
+
+    REGISTRY.unregister(entry.entry_id, coordinator.metrics)
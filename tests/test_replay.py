@@ -0,0 +1,31 @@
+"""Replay a generated day of nowcasts through the integration."""
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+from replay import async_replay, generate_payloads
+
+T0 = 1751587200  # 2025-07-04 00:00 UTC
+
+
+async def test_replay_day(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A full day runs offline; writes stay bounded by bins, not by ticks."""
+    payloads = generate_payloads(T0, hours=24, seed=1)
+    report = await async_replay(hass, freezer, payloads)
+    result = report.as_dict()
+
+    # Eén fetch per 5 minuten, plus de eerste refresh bij het opzetten
+    assert 288 <= result["fetches"] <= 300
+    assert result["update_latency_ms"]["p50"] <= result["update_latency_ms"]["p99"]
+
+    writes = result["state_writes"]
+    assert writes
+    # Sensors schrijven hooguit één keer per fetch en per bin-tick
+    assert max(
+        count for entity_id, count in writes.items() if entity_id.startswith("sensor.")
+    ) <= 2 * result["fetches"] + 2
+    # Binaire sensors schrijven alleen als de waarde omslaat
+    assert all(
+        count < result["fetches"] // 4 for entity_id, count in writes.items() if entity_id.startswith("binary_sensor.")
+    )
+    assert result["memory_growth"] < 5 * 1024 * 1024
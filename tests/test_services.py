@@ -0,0 +1,47 @@
+"""Tests for the Buienalarm services."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.buienalarm.const import (
+    ATTR_DAYS,
+    ATTR_ENTRY_ID,
+    DOMAIN,
+    SERVICE_GET_VERIFICATION,
+)
+from custom_components.buienalarm.services import async_setup_services
+from custom_components.buienalarm.verification import ForecastVerifier
+
+
+def _coordinator(archived: bool) -> MagicMock:
+    coordinator = MagicMock()
+    coordinator.verifier = ForecastVerifier()
+    coordinator.archive_location = "52.1000,5.1000"
+    coordinator.archive = None
+    if archived:
+        coordinator.archive = MagicMock(async_query=AsyncMock(return_value=[]))
+    return coordinator
+
+
+async def test_verification_days_skips_entries_without_archive(hass: HomeAssistant) -> None:
+    """Without entry_id an entry without archive is reported; by id it is an error."""
+    hass.data[DOMAIN] = {"archived": _coordinator(True), "plain": _coordinator(False)}
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_VERIFICATION, {ATTR_DAYS: 1}, blocking=True, return_response=True
+    )
+    assert response["plain"] == {"error": "archive_disabled"}
+    assert response["archived"]["30min"]["count"] == 0
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_VERIFICATION,
+            {ATTR_DAYS: 1, ATTR_ENTRY_ID: "plain"},
+            blocking=True,
+            return_response=True,
+        )
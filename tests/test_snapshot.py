@@ -0,0 +1,119 @@
+"""Tests for the precomputed Buienalarm state timeline."""
+
+from datetime import timezone
+
+from custom_components.buienalarm.core.analytics import (
+    compile_nowcastmessage,
+    minutes_until,
+    render_nowcastmessage,
+)
+from custom_components.buienalarm.core.forecast import BIN_SECONDS
+from custom_components.buienalarm.core.snapshot import (
+    NEXT_PRECIPITATION_AT,
+    ForecastSnapshot,
+    compact_diff,
+    compute_state,
+)
+from synthetic import T0
+
+MESSAGE = {"nl": "Regen vanaf {%d}" % (T0 + 2 * BIN_SECONDS)}
+
+
+def test_timeline_matches_direct_evaluation(make_payload) -> None:
+    """Every timeline entry equals a live evaluation inside its bin."""
+    rates = [0, 0, 1.2, 3.5, 0, 0, 0.4, 0.4, 0, 0, 0, 0]
+    snapshot = ForecastSnapshot.from_payload(make_payload(rates, nowcastmessage=MESSAGE), timezone.utc)
+
+    assert len(snapshot.timeline) == len(rates)
+    for i in range(len(rates)):
+        for offset in (1, 150, 299):
+            now = T0 + i * BIN_SECONDS + offset
+            state = dict(snapshot.state_at(now))
+            live = compute_state(snapshot.index, snapshot.nowcastmessage, now, timezone.utc)
+            # Het tijdstip van "nu" verschilt; de minuten niet
+            assert minutes_until(state.pop(NEXT_PRECIPITATION_AT), now) == minutes_until(
+                live.pop(NEXT_PRECIPITATION_AT), now
+            )
+            assert state == live
+
+
+def test_value_at_counts_down_within_a_bin(make_payload) -> None:
+    """``next_precipitation`` is resolved in minutes at read time."""
+    snapshot = ForecastSnapshot.from_payload(make_payload([0, 0, 0, 2.0, 0], nowcastmessage=MESSAGE), timezone.utc)
+
+    assert snapshot.value_at("next_precipitation", T0 + 60) == 14
+    assert snapshot.value_at("next_precipitation", T0 + 240) == 11
+    assert snapshot.value_at("next_precipitation", T0 + 3 * BIN_SECONDS + 30) == 0
+    assert snapshot.value_at("precipitation_periods", T0 + 60) == 1
+    assert snapshot.value_at("nowcastmessage", T0 + 60) == "Regen vanaf 1:30"
+
+
+def test_outside_forecast_is_evaluated_on_demand(make_payload) -> None:
+    """Times after the horizon fall back to a live evaluation."""
+    snapshot = ForecastSnapshot.from_payload(make_payload([1.0, 1.0]), timezone.utc)
+    after = T0 + 10 * BIN_SECONDS
+
+    assert snapshot.value_at("precipitationrate_now", after) == 0.0
+    assert snapshot.value_at("next_precipitation", after) is None
+    assert ForecastSnapshot.empty().value_at("mycastmessage", after) == "Geen data"
+
+
+def test_periods_between_uses_the_interval_index(make_payload) -> None:
+    """Only the periods overlapping the queried range are returned."""
+    rates = [0, 1.0, 1.0, 0, 0, 2.0, 0, 0, 0.5, 0]
+    snapshot = ForecastSnapshot.from_payload(make_payload(rates), timezone.utc)
+    first, second, third = snapshot.periods
+
+    assert snapshot.periods_between(T0, T0 + 10 * BIN_SECONDS) == (first, second, third)
+    assert snapshot.periods_between(T0 + 3 * BIN_SECONDS, T0 + 5 * BIN_SECONDS) == ()
+    assert snapshot.periods_between(T0 + 2 * BIN_SECONDS, T0 + 6 * BIN_SECONDS) == (first, second)
+    assert snapshot.periods_between(first.stop, second.start + 1) == (second,)
+
+
+def test_compact_diff(make_payload) -> None:
+    """A diff holds only new or changed bins plus the new window."""
+    old = ForecastSnapshot.from_payload(make_payload([0, 0, 1.2, 3.5]))
+    shifted = make_payload([0, 1.2, 2.0, 0.4])
+    for item in shifted["data"]:
+        item["timestamp"] += BIN_SECONDS
+    new = ForecastSnapshot.from_payload(shifted)
+
+    assert old.as_compact()["bins"][2] == [T0 + 2 * BIN_SECONDS, 1.2, "rain"]
+    diff = compact_diff(old, new)
+    assert diff["start"] == T0 + BIN_SECONDS
+    assert diff["horizon"] == T0 + 5 * BIN_SECONDS
+    assert diff["bins"] == [
+        [T0 + 3 * BIN_SECONDS, 2.0, "rain"],
+        [T0 + 4 * BIN_SECONDS, 0.4, "rain"],
+    ]
+    assert "nowcast" not in diff
+    assert compact_diff(new, new)["bins"] == []
+
+
+def test_nowcastmessage_languages(make_payload) -> None:
+    """Every language is rendered once; the HA language picks the message."""
+    payload = make_payload([0, 0, 1.0], nowcastmessage=MESSAGE)
+    payload["nowcastmessage"]["en"] = "Rain from {%d}" % (T0 + 2 * BIN_SECONDS)
+    payload["nowcastmessage"]["de"] = "Regen ab {%d}" % (T0 + 2 * BIN_SECONDS)
+
+    snapshot = ForecastSnapshot.from_payload(payload, timezone.utc, language="en-GB")
+    assert snapshot.nowcastmessages == {"nl": "Regen vanaf 1:30", "en": "Rain from 1:30", "de": "Regen ab 1:30"}
+    assert snapshot.nowcastmessage == "Rain from 1:30"
+    assert snapshot.timeline[0]["nowcastmessage"] == "Rain from 1:30"
+
+    # Onbekende taal valt terug op Nederlands
+    assert ForecastSnapshot.from_payload(payload, timezone.utc, language="fr").nowcastmessage == "Regen vanaf 1:30"
+
+
+def test_compiled_nowcastmessage() -> None:
+    """Templates are split once into text and epoch placeholders."""
+    assert compile_nowcastmessage("Regen van {60} tot {120}.") == ("Regen van ", 60, " tot ", 120, ".")
+    assert compile_nowcastmessage("{0}") == (0,)
+    assert render_nowcastmessage("Droog", timezone.utc) == "Droog"
+    assert render_nowcastmessage("", timezone.utc) is None
+
+    hits = compile_nowcastmessage.cache_info().hits
+    render_nowcastmessage("Tot {7200} droog", timezone.utc)
+    render_nowcastmessage("Tot {7200} droog", timezone.utc)
+    assert render_nowcastmessage("Tot {7200} droog", timezone.utc) == "Tot 2:00 droog"
+    assert compile_nowcastmessage.cache_info().hits == hits
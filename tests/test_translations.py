@@ -0,0 +1,24 @@
+"""Tests for the translated entity names."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.buienalarm.binary_sensor import BuienalarmRainSoonBinarySensor
+from custom_components.buienalarm.calendar import BuienalarmCalendar
+from custom_components.buienalarm.sensor import DIAGNOSTIC_SENSOR_DESCRIPTIONS
+
+TRANSLATIONS = Path(__file__).parent.parent / "custom_components" / "buienalarm" / "translations"
+
+
+@pytest.mark.parametrize("language", ["nl", "en", "de"])
+def test_entity_names_are_translated(language: str) -> None:
+    """Every translation key of the entities has a name in every language."""
+    entity = json.loads((TRANSLATIONS / f"{language}.json").read_text(encoding="utf-8"))["entity"]
+
+    for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS:
+        assert entity["sensor"][description.translation_key]["name"]
+    rain_within = entity["binary_sensor"][BuienalarmRainSoonBinarySensor._attr_translation_key]["name"]
+    assert "{minutes}" in rain_within
+    assert entity["calendar"][BuienalarmCalendar._attr_translation_key]["name"]
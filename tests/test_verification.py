@@ -0,0 +1,74 @@
+"""Tests for the incremental Buienalarm forecast verification."""
+
+from custom_components.buienalarm.core.forecast import BIN_SECONDS, ForecastIndex
+from custom_components.buienalarm.verification import ForecastVerifier
+
+T0 = 1751592000
+# Waargenomen neerslag per bin; twee buien
+TRUTH = [0.0] * 20 + [1.0] * 6 + [0.0] * 10 + [2.5] * 4 + [0.0] * 20
+
+
+def _fetch(k: int, forecast: list[float]) -> ForecastIndex:
+    """Fetch *k*: bin ``k`` is "now", followed by two hours of forecast."""
+    return ForecastIndex.from_payload(
+        {
+            "data": [
+                {"precipitationrate": forecast[i], "precipitationtype": "rain", "timestamp": T0 + i * BIN_SECONDS}
+                for i in range(k, min(k + 25, len(forecast)))
+            ]
+        }
+    )
+
+
+def _run(verifier: ForecastVerifier, forecast: list[float]) -> None:
+    for k in range(len(TRUTH)):
+        index = _fetch(k, forecast)
+        # De bins tot "nu" zijn de waarneming; de rest is de verwachting
+        observed = _fetch(k, TRUTH)
+        merged = ForecastIndex(
+            index.timestamps,
+            (observed.rates[0],) + index.rates[1:],
+            index.types,
+        )
+        verifier.update(merged, T0 + k * BIN_SECONDS + 10)
+
+
+def test_perfect_forecast_scores_only_hits() -> None:
+    """A forecast equal to the observations has no misses and zero error."""
+    verifier = ForecastVerifier()
+    _run(verifier, TRUTH)
+    scores = verifier.as_dict()
+
+    assert set(scores) == {"30min", "60min", "90min"}
+    for score in scores.values():
+        assert score["count"] > 0
+        assert score["misses"] == 0 and score["false_alarms"] == 0
+        assert score["mae"] == 0.0
+        assert score["pod"] == 1.0
+    # Elke waargenomen bin wordt per lead hooguit één keer gescoord
+    assert scores["30min"]["count"] >= scores["90min"]["count"]
+
+
+def test_dry_forecast_misses_every_shower() -> None:
+    """Forecasting no rain turns every wet observation into a miss."""
+    verifier = ForecastVerifier(leads=(30,))
+    _run(verifier, [0.0] * len(TRUTH))
+    score = verifier.as_dict()["30min"]
+
+    assert score["hits"] == 0 and score["misses"] == 10
+    assert score["pod"] == 0.0 and score["far"] is None
+    assert score["mae"] > 0
+
+
+def test_leads_rebuild_an_empty_verifier() -> None:
+    """A verifier built from ``leads`` scores the same lead times from scratch."""
+    verifier = ForecastVerifier((60, 15, 30), threshold=0.2)
+    _run(verifier, TRUTH)
+
+    rebuilt = ForecastVerifier(verifier.leads, verifier.threshold)
+    assert rebuilt.leads == (60, 15, 30)
+    assert {name: score["count"] for name, score in rebuilt.as_dict().items()} == {
+        "60min": 0,
+        "15min": 0,
+        "30min": 0,
+    }
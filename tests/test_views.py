@@ -0,0 +1,140 @@
+"""Tests for the Buienalarm HTTP views."""
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.buienalarm.const import CONF_ARCHIVE_RETENTION, DOMAIN
+from custom_components.buienalarm.views import DATA_FORECAST_VIEW, _accepts_gzip
+from replay import generate_payloads
+
+T0 = 1751587200
+
+
+async def test_metrics_view(
+    hass: HomeAssistant, hass_client: Any, hass_client_no_auth: Any, freezer: FrozenDateTimeFactory
+) -> None:
+    """The metrics endpoint serves the exposition format and requires auth."""
+    payload = generate_payloads(T0, hours=1, seed=5)[0]
+    freezer.move_to(datetime.fromtimestamp(T0 + 1, tz=timezone.utc))
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return {"timeseries": payload, "retrieval_time": datetime.now(timezone.utc), "cache_age": 0}
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Metrics",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    anonymous = await hass_client_no_auth()
+    assert (await anonymous.get("/api/buienalarm/metrics")).status == 401
+
+    client = await hass_client()
+    resp = await client.get("/api/buienalarm/metrics")
+    assert resp.status == 200
+    assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = await resp.text()
+    assert f'buienalarm_snapshot_build_duration_seconds_count{{entry_id="{entry.entry_id}"}} 1' in text
+    assert "# TYPE buienalarm_skipped_writes_total counter" in text
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    text = await (await client.get("/api/buienalarm/metrics")).text()
+    assert entry.entry_id not in text
+
+
+async def test_forecast_view(hass: HomeAssistant, hass_client: Any, freezer: FrozenDateTimeFactory) -> None:
+    """The forecast endpoint serves cached gzipped JSON and honours If-None-Match."""
+    payloads = generate_payloads(T0, hours=1, seed=5)
+    current = {"payload": payloads[0]}
+    freezer.move_to(datetime.fromtimestamp(T0 + 1, tz=timezone.utc))
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return {"timeseries": current["payload"], "retrieval_time": datetime.now(timezone.utc), "cache_age": 0}
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Forecast",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        client = await hass_client()
+        url = f"/api/buienalarm/forecast/{entry.entry_id}"
+        assert (await client.get("/api/buienalarm/forecast/missing")).status == 404
+
+        resp = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert resp.status == 200
+        assert resp.headers["Content-Encoding"] == "gzip"
+        etag = resp.headers["ETag"]
+        data = await resp.json()
+        assert len(data["bins"]) == len(coordinator.snapshot.index)
+
+        plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in plain.headers
+        assert plain.headers["ETag"] != etag
+        assert await plain.json() == data
+
+        refused = await client.get(url, headers={"Accept-Encoding": "gzip;q=0, identity"})
+        assert "Content-Encoding" not in refused.headers
+        assert refused.headers["ETag"] == plain.headers["ETag"]
+
+        resp = await client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert resp.status == 304
+
+        current["payload"] = payloads[1]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        resp = await client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert resp.status == 200
+        assert resp.headers["ETag"] != etag
+
+    forecast_view = hass.data[DATA_FORECAST_VIEW]
+    assert entry.entry_id in forecast_view._cache
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.entry_id not in forecast_view._cache
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, identity", False),
+        ("identity", False),
+        ("", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("x-gzip", True),
+        ("GZIP;Q=0.5", True),
+    ],
+)
+def test_accepts_gzip(header: str, expected: bool) -> None:
+    """Accept-Encoding is parsed with q-values; q=0 refuses gzip."""
+    assert _accepts_gzip(header) is expected
@@ -0,0 +1,105 @@
+"""Tests for the Buienalarm websocket API."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.buienalarm.const import CONF_ARCHIVE_RETENTION, DOMAIN, WS_PUSH_COOLDOWN
+from custom_components.buienalarm.core.forecast import ForecastIndex
+from custom_components.buienalarm.websocket import DATA_SUBSCRIPTIONS
+from replay import generate_payloads
+
+T0 = 1751587200
+
+
+async def test_subscribe_forecast(
+    hass: HomeAssistant, hass_ws_client: Any, freezer: FrozenDateTimeFactory
+) -> None:
+    """A subscriber gets the snapshot, then coalesced diffs; nothing after unsubscribing or unloading."""
+    payloads = generate_payloads(T0, hours=1, seed=9)
+    current = {"payload": payloads[0]}
+    freezer.move_to(datetime.fromtimestamp(T0 + 1, tz=timezone.utc))
+
+    async def _get_data(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        return {"timeseries": current["payload"], "retrieval_time": datetime.now(timezone.utc), "cache_age": 0}
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Websocket",
+        data={"latitude": 52.1, "longitude": 5.1},
+        options={CONF_ARCHIVE_RETENTION: 0},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_initial_data", return_value={}),
+        patch("custom_components.buienalarm.api.BuienalarmApiClient.async_get_data", side_effect=_get_data),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        client = await hass_ws_client(hass)
+        await client.send_json({"id": 1, "type": "buienalarm/subscribe_forecast", "entry_id": "missing"})
+        msg = await client.receive_json()
+        assert not msg["success"]
+        assert msg["error"]["code"] == "not_found"
+
+        await client.send_json({"id": 2, "type": "buienalarm/subscribe_forecast", "entry_id": entry.entry_id})
+        assert (await client.receive_json())["success"]
+        event = (await client.receive_json())["event"]
+        assert event["type"] == "snapshot"
+        assert len(event["bins"]) == len(coordinator.snapshot.index)
+        assert event["horizon"] == coordinator.snapshot.index.end
+
+        # Eerste diff direct, de twee volgende updates samengevoegd na de cooldown
+        for payload in payloads[1:4]:
+            current["payload"] = payload
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+        event = (await client.receive_json())["event"]
+        assert event["type"] == "diff"
+        assert event["start"] == ForecastIndex.from_payload(payloads[1]).start
+
+        freezer.tick(timedelta(seconds=WS_PUSH_COOLDOWN + 1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        event = (await client.receive_json())["event"]
+        assert event["type"] == "diff"
+        assert event["start"] == coordinator.snapshot.index.start
+        assert event["horizon"] == coordinator.snapshot.index.end
+
+        listeners = len(coordinator._listeners)
+        await client.send_json({"id": 3, "type": "unsubscribe_events", "subscription": 2})
+        assert (await client.receive_json())["success"]
+        assert len(coordinator._listeners) == listeners - 1
+
+        # Een actieve subscription wordt gesloten als de entry unloadt, met een lopende push
+        await client.send_json({"id": 4, "type": "buienalarm/subscribe_forecast", "entry_id": entry.entry_id})
+        assert (await client.receive_json())["success"]
+        assert (await client.receive_json())["event"]["type"] == "snapshot"
+        for payload in payloads[4:6]:
+            current["payload"] = payload
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        assert (await client.receive_json())["event"]["type"] == "diff"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert msg["id"] == 4
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
+    assert entry.entry_id not in hass.data[DATA_SUBSCRIPTIONS]
+
+    # De cooldown-timer is geannuleerd: er komt niets meer
+    freezer.tick(timedelta(seconds=WS_PUSH_COOLDOWN + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    await client.send_json({"id": 5, "type": "ping"})
+    assert (await client.receive_json())["type"] == "pong"